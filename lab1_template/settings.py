@@ -1,8 +1,9 @@
 import os
 
-from dotenv import load_dotenv
+import bootstrap
 
-load_dotenv()
+# Imports python-dotenv only when there is a .env file to read
+bootstrap.load_env()
 
 DATABASES = {
     "default": {
@@ -12,6 +13,9 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": "localhost",
         "PORT": "5432",
+        # Persistent connections, checked before reuse
+        "CONN_MAX_AGE": int(os.getenv("CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     },
 }
 
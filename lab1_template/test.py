@@ -1,13 +1,10 @@
 # Django specific settings
 import inspect
-import os
 
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
+import bootstrap
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-
-application = get_wsgi_application()
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
 
 # Your application specific imports
 from datetime import date
@@ -0,0 +1,13 @@
+"""Application configuration of the crud app."""
+
+from django.apps import AppConfig
+
+
+class CrudConfig(AppConfig):
+    """Connect the crud signal receivers when the app is ready."""
+
+    name = "crud"
+
+    def ready(self) -> None:
+        """Connect the signal receivers that keep the autocomplete snapshots up to date."""
+        from crud import signals  # noqa: F401, PLC0415
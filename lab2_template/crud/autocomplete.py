@@ -0,0 +1,169 @@
+"""Prefix autocomplete over the names of crud instructors and learners.
+
+``complete("yan l", Instructor)`` returns the ids of the first instructors, in name order, whose
+"first last" name starts with the prefix. Names are compared case- and accent-insensitively.
+
+By default the answer comes from a ``NameIndex``, a sorted in-process snapshot of the model's
+normalized names searched with ``bisect``, which takes microseconds. The snapshot is loaded on
+the first lookup, then kept current by the receivers in ``signals.py`` and reloaded once it is
+older than ``MAX_AGE`` seconds, which picks up bulk loads and writes of other processes. The
+``database`` backend sends every lookup to the database instead, where the
+``varchar_pattern_ops`` index on ``first_name`` serves the ``LIKE 'prefix%'`` scan. It matches
+case-sensitively, as typed. The backend is chosen with the ``NAME_AUTOCOMPLETE`` setting::
+
+    NAME_AUTOCOMPLETE = {"BACKEND": "memory", "MAX_AGE": 300}
+    NAME_AUTOCOMPLETE = {"BACKEND": "database"}
+"""
+
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .models import Instructor, Learner, User
+
+DEFAULT_LIMIT = 10
+DEFAULT_MAX_AGE = 300
+LAST_CHAR = chr(0x10FFFF)
+
+
+def normalize(text: str) -> str:
+    """Return ``text`` casefolded, without accents and with single spaces between words.
+
+    A trailing space is kept, so that ``"yan "`` only completes to names with more words.
+
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    bare = "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    words = " ".join(bare.split())
+    return f"{words} " if words and bare[-1].isspace() else words
+
+
+def name_key(first_name: str, last_name: str) -> str:
+    """Return the normalized ``first last`` name a user is completed by."""
+    return normalize(f"{first_name} {last_name}").rstrip()
+
+
+class NameIndex:
+    """Sorted snapshot of the normalized names of one ``User`` subclass."""
+
+    def __init__(self, model: type[User], *, max_age: float = DEFAULT_MAX_AGE) -> None:
+        """Index the users of ``model``, reloading the snapshot after ``max_age`` seconds."""
+        self.model = model
+        self.max_age = max_age
+        # (name key, primary key) pairs in sorted order, and the key of every indexed user.
+        self._entries: list[tuple[str, int]] = []
+        self._keys: dict[int, str] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Return whether a snapshot is in memory."""
+        return self._loaded_at is not None
+
+    def load(self) -> None:
+        """Replace the snapshot with the names currently in the database."""
+        rows = self.model.objects.values_list("pk", "first_name", "last_name").order_by()
+        keys = {pk: name_key(first_name, last_name) for pk, first_name, last_name in rows}
+        entries = sorted((key, pk) for pk, key in keys.items())
+        with self._lock:
+            self._entries, self._keys = entries, keys
+            self._loaded_at = time.monotonic()
+
+    def clear(self) -> None:
+        """Drop the snapshot, the next lookup loads a new one."""
+        with self._lock:
+            self._entries, self._keys = [], {}
+            self._loaded_at = None
+
+    def _discard(self, pk: int) -> None:
+        key = self._keys.pop(pk, None)
+        if key is not None:
+            del self._entries[bisect_left(self._entries, (key, pk))]
+
+    def update(self, user: User) -> None:
+        """Index the current name of a saved user of this model, or of a parent row of one.
+
+        Nothing happens before the first snapshot is loaded, it will contain the change.
+
+        """
+        if not self.loaded or not (isinstance(user, self.model) or user.pk in self._keys):
+            return
+        with self._lock:
+            self._discard(user.pk)
+            key = name_key(user.first_name, user.last_name)
+            self._keys[user.pk] = key
+            insort(self._entries, (key, user.pk))
+
+    def discard(self, pk: int) -> None:
+        """Remove a deleted user from the snapshot."""
+        with self._lock:
+            self._discard(pk)
+
+    def complete(self, prefix: str, limit: int = DEFAULT_LIMIT) -> list[int]:
+        """Return the ids of the first ``limit`` users, in name order, matching ``prefix``.
+
+        Returns:
+            list[int]: Primary keys of ``model`` rows.
+
+        """
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age:
+            self.load()
+        key = normalize(prefix)
+        with self._lock:
+            # Every key starting with the prefix sorts before the prefix followed by LAST_CHAR.
+            start = bisect_left(self._entries, (key,))
+            stop = bisect_left(self._entries, (key + LAST_CHAR,), lo=start)
+            return [pk for _, pk in self._entries[start : min(stop, start + limit)]]
+
+    def __len__(self) -> int:
+        """Return the number of indexed users."""
+        return len(self._entries)
+
+
+def complete_from_db(prefix: str, model: type[User], limit: int = DEFAULT_LIMIT) -> list[int]:
+    """Return the ids of the first ``limit`` users, in name order, matching ``prefix`` as typed.
+
+    The first word is matched against the start of ``first_name``. After a space, the first
+    name must be equal to it and the rest is matched against the start of ``last_name``.
+
+    Returns:
+        list[int]: Primary keys of ``model`` rows.
+
+    """
+    first_name, space, last_name = prefix.lstrip().partition(" ")
+    if space:
+        users = model.objects.filter(first_name=first_name, last_name__startswith=last_name)
+    else:
+        users = model.objects.filter(first_name__startswith=first_name)
+    pks = users.order_by("first_name", "last_name", "pk").values_list("pk", flat=True)
+    return list(pks[:limit])
+
+
+name_indexes = {model: NameIndex(model) for model in (Instructor, Learner)}
+
+
+def complete(prefix: str, model: type[User], *, limit: int = DEFAULT_LIMIT) -> list[int]:
+    """Return the ids of the first ``limit`` ``model`` users whose name starts with ``prefix``.
+
+    Returns:
+        list[int]: Primary keys of ``model`` rows, in name order.
+
+    Raises:
+        ImproperlyConfigured: When ``NAME_AUTOCOMPLETE`` names an unknown backend.
+
+    """
+    config = getattr(settings, "NAME_AUTOCOMPLETE", {})
+    backend = config.get("BACKEND", "memory")
+    if backend == "database":
+        return complete_from_db(prefix, model, limit)
+    if backend != "memory":
+        msg = f"Unknown NAME_AUTOCOMPLETE backend {backend!r}, use 'memory' or 'database'."
+        raise ImproperlyConfigured(msg)
+    index = name_indexes[model]
+    index.max_age = config.get("MAX_AGE", DEFAULT_MAX_AGE)
+    return index.complete(prefix, limit)
@@ -0,0 +1,152 @@
+"""COPY based bulk ingest for the crud models.
+
+``copy_load`` streams model instances into their tables with PostgreSQL's ``COPY FROM STDIN``,
+which skips the per-parameter marshalling of ``INSERT`` statements. Every chunk of rows is
+encoded into a spooled buffer, kept in memory up to ``spool_size`` bytes and on disk beyond,
+and copied in its own transaction. Other databases, such as SQLite, get the same rows through
+chunked ``executemany`` calls, so the API can be tested locally.
+
+``COPY`` cannot return generated keys, so multi-table inherited models such as ``Learner`` and
+``Instructor`` must be given explicit primary keys. The sequences are moved past the loaded keys
+afterwards.
+"""
+
+import tempfile
+from collections.abc import Iterable, Iterator
+
+from django.db import connections, router, transaction
+from django.db.models import Field, Model
+
+from .seeding import chunked, reset_sequences
+
+DEFAULT_CHUNK_SIZE = 50000
+DEFAULT_SPOOL_SIZE = 64 * 1024 * 1024
+
+# Characters with a meaning in the COPY text format, and how they are escaped.
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_text(value: object) -> str:
+    r"""Encode one value in the COPY text format, ``\N`` stands for NULL."""
+    if value is None:
+        return "\\N"
+    return str(value).translate(COPY_ESCAPES)
+
+
+def _table_rows(
+    fields: list[Field],
+    objs: list[Model],
+    using: str,
+) -> Iterator[list[object]]:
+    """Yield the database values of ``fields`` for every object."""
+    connection = connections[using]
+    for obj in objs:
+        yield [field.get_db_prep_save(getattr(obj, field.attname), connection) for field in fields]
+
+
+def _copy_chunk(
+    table: str,
+    fields: list[Field],
+    objs: list[Model],
+    *,
+    using: str,
+    spool_size: int,
+) -> None:
+    """Insert one chunk of rows into ``table``, with COPY on PostgreSQL."""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in fields)
+    rows = _table_rows(fields, objs, using)
+    with connection.cursor() as cursor:
+        if connection.vendor != "postgresql":
+            placeholders = ", ".join(["%s"] * len(fields))
+            sql = f"INSERT INTO {quote(table)} ({columns}) VALUES ({placeholders})"  # noqa: S608
+            cursor.executemany(sql, list(rows))
+            return
+        with tempfile.SpooledTemporaryFile(max_size=spool_size, mode="w+") as buffer:
+            for row in rows:
+                buffer.write("\t".join(map(_copy_text, row)))
+                buffer.write("\n")
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {quote(table)} ({columns}) FROM STDIN", buffer)
+
+
+def _share_parent_keys(tables: list[type[Model]], objs: list[Model]) -> None:
+    """Give the root row and every parent link of ``objs`` the child's primary key."""
+    for obj in objs:
+        pk = obj.pk
+        setattr(obj, tables[0]._meta.pk.attname, pk)  # noqa: SLF001
+        for table_model in tables[1:]:
+            for link in table_model._meta.parents.values():  # noqa: SLF001
+                setattr(obj, link.attname, pk)
+
+
+def _copy_tables(
+    tables: list[type[Model]],
+    objs: list[Model],
+    *,
+    with_keys: bool,
+    using: str,
+    spool_size: int,
+) -> None:
+    """Copy ``objs`` into every table of ``tables``, with or without the primary key column."""
+    for table_model in tables:
+        table_opts = table_model._meta  # noqa: SLF001
+        fields = [
+            field
+            for field in table_opts.local_concrete_fields
+            if with_keys or not field.primary_key
+        ]
+        _copy_chunk(table_opts.db_table, fields, objs, using=using, spool_size=spool_size)
+
+
+def copy_load(
+    model: type[Model],
+    objs: Iterable[Model],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    spool_size: int = DEFAULT_SPOOL_SIZE,
+    using: str | None = None,
+) -> int:
+    """Stream ``objs`` into ``model``'s tables, ``chunk_size`` rows per COPY and transaction.
+
+    Objects without a primary key get one from the database, except for multi-table inherited
+    models, which need explicit keys shared by the parent and child rows. A chunk mixing both
+    kinds of objects is copied in two parts, with and without the key column. When keys are
+    given, the model's sequence is reset once every chunk is in.
+
+    Returns:
+        int: The number of objects inserted.
+
+    Raises:
+        ValueError: When an object of a multi-table inherited model has no primary key.
+
+    """
+    using = using or router.db_for_write(model)
+    opts = model._meta  # noqa: SLF001
+    # Root first, each table only gets the columns it stores itself.
+    tables = [*reversed(opts.get_parent_list()), model]
+    total = 0
+    explicit_keys = False
+    for chunk in chunked(objs, chunk_size):
+        keyed = [obj for obj in chunk if obj.pk is not None]
+        unkeyed = [obj for obj in chunk if obj.pk is None]
+        if unkeyed and opts.parents:
+            msg = f"{opts.label} objects need explicit primary keys to be loaded with COPY."
+            raise ValueError(msg)
+        explicit_keys |= bool(keyed)
+        if opts.parents:
+            _share_parent_keys(tables, chunk)
+        with transaction.atomic(using=using):
+            for part, with_keys in ((keyed, True), (unkeyed, False)):
+                if part:
+                    _copy_tables(
+                        tables, part, with_keys=with_keys, using=using, spool_size=spool_size,
+                    )
+        for obj in chunk:
+            obj._state.adding = False  # noqa: SLF001
+            obj._state.db = using  # noqa: SLF001
+        total += len(chunk)
+    if explicit_keys:
+        reset_sequences(tables[0], using=using)
+    return total
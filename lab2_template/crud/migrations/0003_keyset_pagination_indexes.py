@@ -0,0 +1,29 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crud', '0002_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='crud_user_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='crud_user_dob_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['last_name', 'first_name', 'id'], name='crud_user_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['dob', 'id'], name='crud_user_dob_id_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crud', '0005_copy_users_to_people'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='enrollment',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='crud.course'),
+        ),
+    ]
@@ -1,13 +1,88 @@
 """Models for the application."""
 
+from collections.abc import Iterator
 from typing import ClassVar
 
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from django.db.models.query import ModelIterable
 from django.utils.timezone import now
 
+from .pagination import BY_DOB, DEFAULT_PAGE_SIZE, KeysetPage, KeysetPaginator
+
 # Define your models from here:
 
 
+class SubclassIterable(ModelIterable):
+    """Yield every row as the most specific subclass its joined child rows make it."""
+
+    def __iter__(self) -> Iterator[models.Model]:
+        accessors = self.queryset.subclass_accessors()
+        for obj in super().__iter__():
+            yield downcast(obj, accessors)
+
+
+def downcast(obj: models.Model, accessors: list[str]) -> models.Model:
+    """Return the first child object of ``obj`` loaded by ``select_related``, or ``obj``.
+
+    Returns:
+        models.Model: An instance of a subclass, with the parent's fields already set.
+
+    """
+    for accessor in accessors:
+        try:
+            return getattr(obj, accessor)
+        except ObjectDoesNotExist:
+            continue
+    return obj
+
+
+# User queryset
+class UserQuerySet(models.QuerySet):
+    """Queries shared by users, instructors and learners."""
+
+    def keyset_page(
+        self,
+        cursor: str | None = None,
+        *,
+        ordering: tuple[str, ...] = BY_DOB,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> KeysetPage:
+        """Return the page after ``cursor`` in ``ordering``, the first page without one.
+
+        Returns:
+            KeysetPage: The rows of the page and the cursor of the next one.
+
+        """
+        return KeysetPaginator(self, ordering, page_size).page(cursor)
+
+    def subclass_accessors(self) -> list[str]:
+        """Return the accessors of the child tables of multi-table inherited subclasses.
+
+        Returns:
+            list[str]: Such as ``["instructor", "learner"]`` for users.
+
+        """
+        opts = self.model._meta  # noqa: SLF001
+        return [rel.get_accessor_name() for rel in opts.related_objects if rel.parent_link]
+
+    def select_subclasses(self) -> "UserQuerySet":
+        """Return the rows as ``Instructor`` and ``Learner`` objects where they are one.
+
+        Every child table is LEFT JOINed in the same query, so the number of joins is fixed by
+        the subclasses, not the rows, and ``iterator(chunk_size=...)`` streams as usual. Users
+        that are neither stay ``User`` objects, an instructor that is also a learner comes back
+        as an instructor.
+
+        Returns:
+            UserQuerySet: The users, downcast to their subclasses.
+
+        """
+        queryset = self.select_related(*self.subclass_accessors())
+        queryset._iterable_class = SubclassIterable  # noqa: SLF001
+        return queryset
+
+
 # User model
 class User(models.Model):
     """Represents a user with first name, last name, and date of birth.
@@ -27,6 +102,23 @@ class User(models.Model):
     last_name = models.CharField(null=False, max_length=30, default="doe")
     dob = models.DateField(null=True)
 
+    objects = UserQuerySet.as_manager()
+
+    class Meta:
+        """Index the name and birth date lookups."""
+
+        # Pattern ops let PostgreSQL use the index for equality and for startswith lookups
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["first_name"],
+                name="crud_user_first_name_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            # The trailing id makes the keyset pagination orderings fully indexed
+            models.Index(fields=["last_name", "first_name", "id"], name="crud_user_name_id_idx"),
+            models.Index(fields=["dob", "id"], name="crud_user_dob_id_idx"),
+        ]
+
     # Create a toString method for object string representation
     def __str__(self) -> str:
         """Return a string representation of the object, combining the first and last name.
@@ -108,6 +200,13 @@ class Learner(User):
     # Social link URL field
     social_link = models.URLField(max_length=200)
 
+    class Meta:
+        """Index the occupation filter."""
+
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["occupation"], name="crud_learner_occupation_idx"),
+        ]
+
     # Create a toString method for object string representation
     def __str__(self) -> str:
         """Return a string representation of the object.
@@ -149,6 +248,18 @@ class Course(models.Model):
     # Many-To-Many relationship with Learner
     learners = models.ManyToManyField(Learner, through="Enrollment")
 
+    class Meta:
+        """Index the course name lookups."""
+
+        # name__contains is served by a trigram index created in the migration on PostgreSQL
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["name"],
+                name="crud_course_name_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
     # Create a toString method for object string representation
     def __str__(self) -> str:
         """Return a string representation of the object, including its name and description.
@@ -160,6 +271,20 @@ class Course(models.Model):
         return f"Name: {self.name}, Description: {self.description}"
 
 
+# Lesson queryset
+class LessonQuerySet(models.QuerySet):
+    """Queries over lessons."""
+
+    def for_display(self) -> "LessonQuerySet":
+        """Join the course name ``__str__`` prints and defer every other column, content too.
+
+        Returns:
+            LessonQuerySet: The lessons with the columns of ``__str__`` loaded.
+
+        """
+        return self.select_related("course").only("title", "course__name")
+
+
 # Lesson
 class Lesson(models.Model):
     """Represent a lesson within a course.
@@ -179,6 +304,8 @@ class Lesson(models.Model):
     course = models.ForeignKey(Course, null=True, on_delete=models.CASCADE)
     content = models.TextField()
 
+    objects = LessonQuerySet.as_manager()
+
     def __str__(self) -> str:
         """Return a string representation of the lesson, showing its title and course.
 
@@ -189,6 +316,27 @@ class Lesson(models.Model):
         return f"Lesson: {self.title}, Course: {self.course.name if self.course else 'None'}"
 
 
+# Enrollment queryset
+class EnrollmentQuerySet(models.QuerySet):
+    """Queries over enrollments."""
+
+    def for_display(self) -> "EnrollmentQuerySet":
+        """Join the learner and course names ``__str__`` prints and defer every other column.
+
+        Without it, printing N enrollments costs 2N+1 queries. Reading a deferred field loads it
+        with a query of its own, so use this for display only.
+
+        Returns:
+            EnrollmentQuerySet: The enrollments with the columns of ``__str__`` loaded.
+
+        """
+        return self.select_related("learner", "course").only(
+            "date_enrolled",
+            "learner__first_name",
+            "course__name",
+        )
+
+
 # Enrollment model as a lookup table with additional enrollment info
 class Enrollment(models.Model):
     """Represents the enrollment of a learner in a course.
@@ -209,12 +357,23 @@ class Enrollment(models.Model):
     # Add a learner foreign key
     learner = models.ForeignKey(Learner, on_delete=models.CASCADE)
     # Add a course foreign key
-    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    # The (course, date_enrolled) index leads with the course and serves the foreign key
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, db_index=False)
     # Enrollment date
     date_enrolled = models.DateField(default=now)
     # Enrollment mode
     mode = models.CharField(max_length=5, choices=COURSE_MODES, default=AUDIT)
 
+    objects = EnrollmentQuerySet.as_manager()
+
+    class Meta:
+        """Index the enrollments of a course by date, and by date alone."""
+
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["course", "date_enrolled"], name="crud_enroll_course_date_idx"),
+            models.Index(fields=["date_enrolled"], name="crud_enroll_date_idx"),
+        ]
+
     def __str__(self) -> str:
         """Return a string representation of the enrollment, showing learner and course details.
 
@@ -226,3 +385,7 @@ class Enrollment(models.Model):
             f"Enrollment: {self.learner.first_name} enrolled in {self.course.name} on "
             f"{self.date_enrolled}."
         )
+
+
+# The single-table Person snapshot is defined in people.py, imported here so the app registers it
+from .people import InstructorPerson, LearnerPerson, Person, PersonKindManager  # noqa: E402, F401
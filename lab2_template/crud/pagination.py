@@ -0,0 +1,136 @@
+"""Keyset (seek) pagination for the crud querysets.
+
+An OFFSET query reads and throws away every row before the page, so page 10,000 costs 10,000
+pages of work. A keyset page instead starts right after the last row of the previous page,
+``WHERE (dob, id) > (last_dob, last_id) ORDER BY dob, id``, which an index on the ordering
+columns answers at the same cost for every page. The position is handed out as an opaque
+cursor token.
+
+The ordering must end with a unique column, such as ``id``, so every row has one position.
+Rows with NULL in an ordering column have no position in the order and are left out.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q, QuerySet
+
+DEFAULT_PAGE_SIZE = 20
+
+# Orderings backed by the ``*_user_dob_id_idx`` and ``*_user_name_id_idx`` indexes.
+BY_DOB = ("dob", "id")
+YOUNGEST_FIRST = ("-dob", "-id")
+BY_NAME = ("last_name", "first_name", "id")
+
+
+class InvalidCursorError(ValueError):
+    """The cursor token is malformed or was issued for another ordering."""
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    """One page of rows and the cursor of the page after it, ``None`` on the last page."""
+
+    items: list[Model]
+    next_cursor: str | None
+
+    @property
+    def has_next(self) -> bool:
+        """Return whether more rows follow this page."""
+        return self.next_cursor is not None
+
+
+class KeysetPaginator:
+    """Page through ``queryset`` in ``ordering``, ``page_size`` rows at a time.
+
+    ``ordering`` lists field names, each optionally prefixed with ``-`` for descending order.
+
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        ordering: tuple[str, ...] = BY_DOB,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> None:
+        """Page ``queryset`` without the rows that have NULL in an ordering column."""
+        self.ordering = ordering
+        self.page_size = page_size
+        self.fields = [name.removeprefix("-") for name in ordering]
+        self.queryset = queryset.filter(
+            **{f"{name}__isnull": False for name in self.fields},
+        ).order_by(*ordering)
+
+    def cursor_for(self, item: Model) -> str:
+        """Return the token of the position right after ``item``."""
+        values = [getattr(item, name) for name in self.fields]
+        payload = json.dumps([list(self.ordering), values], cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def _decode(self, cursor: str) -> list[Any]:
+        """Return the ordering values stored in a cursor token.
+
+        Returns:
+            list[Any]: One value per ordering field, converted to the field's Python type.
+
+        Raises:
+            InvalidCursorError: When the token does not decode to values of this ordering.
+
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            ordering, values = json.loads(base64.urlsafe_b64decode(padded))
+        except (binascii.Error, ValueError, TypeError) as error:
+            msg = "Malformed pagination cursor."
+            raise InvalidCursorError(msg) from error
+        if ordering != list(self.ordering) or len(values) != len(self.fields):
+            msg = f"The cursor was not issued for the ordering {self.ordering}."
+            raise InvalidCursorError(msg)
+        opts = self.queryset.model._meta  # noqa: SLF001
+        return [
+            opts.get_field(name).to_python(value)
+            for name, value in zip(self.fields, values, strict=True)
+        ]
+
+    def _after(self, values: list[Any]) -> Q:
+        """Return the condition selecting the rows after ``values`` in the ordering.
+
+        The row comparison is expanded into ``a > x OR (a = x AND b > y) OR ...``. A redundant
+        ``a >= x`` bound on the leading column lets the database start an index range scan at
+        the cursor.
+
+        Returns:
+            Q: The seek condition.
+
+        """
+        clauses = []
+        equal: dict[str, Any] = {}
+        for name, field, value in zip(self.ordering, self.fields, values, strict=True):
+            comparison = "lt" if name.startswith("-") else "gt"
+            clauses.append(Q(**equal, **{f"{field}__{comparison}": value}))
+            equal[field] = value
+        leading = "lte" if self.ordering[0].startswith("-") else "gte"
+        return Q(**{f"{self.fields[0]}__{leading}": values[0]}) & reduce(or_, clauses)
+
+    def page(self, cursor: str | None = None) -> KeysetPage:
+        """Return the first page, or the page after the position of ``cursor``.
+
+        Returns:
+            KeysetPage: Up to ``page_size`` rows, with the cursor of the next page.
+
+        """
+        queryset = self.queryset
+        if cursor is not None:
+            queryset = queryset.filter(self._after(self._decode(cursor)))
+        # One extra row tells whether another page follows.
+        items = list(queryset[: self.page_size + 1])
+        if len(items) <= self.page_size:
+            return KeysetPage(items, None)
+        items = items[: self.page_size]
+        return KeysetPage(items, self.cursor_for(items[-1]))
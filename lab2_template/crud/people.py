@@ -0,0 +1,209 @@
+"""The single-table ``Person`` snapshot of the user hierarchy, and the copy that fills it.
+
+``Person`` stores users, instructors and learners in one wide table with a ``kind`` column, read
+and written through the ``InstructorPerson`` and ``LearnerPerson`` proxies. It is a snapshot for
+comparing the two layouts in ``benchmarks/bench_layouts.py``, not a storage mode of the app: the
+foreign keys of courses and enrollments point at ``Instructor`` and ``Learner``, and no write
+to those models is copied into it. It only holds the users of the last ``copy_people`` call.
+
+``copy_people`` rebuilds the ``Person`` table from ``User``, ``Instructor`` and ``Learner`` with
+one ``INSERT ... SELECT`` that LEFT JOINs the child tables, so no row passes through Python.
+Every person keeps its user's id. The kind is ``instructor`` for users with an instructor row,
+else ``learner`` for users with a learner row, else ``user``. An instructor that is also a
+learner keeps its learner columns as well.
+"""
+
+from typing import ClassVar
+
+from django.db import connections, models, router, transaction
+
+from .models import Instructor, Learner, User, UserQuerySet
+from .seeding import reset_sequences
+
+COPIED_FIELDS = ("first_name", "last_name", "dob")
+INSTRUCTOR_FIELDS = ("full_time", "total_learners")
+LEARNER_FIELDS = ("occupation", "social_link")
+
+
+# Person model
+class Person(models.Model):
+    """Single-table snapshot of users, instructors and learners.
+
+    Every person is one row of one table and ``kind`` tells which columns apply, so reads need
+    no join and writes touch one table and its indexes. Filled by ``copy_people()`` below, and
+    first by ``0005_copy_users_to_people``.
+
+    Attributes
+    ----------
+    kind : str
+        Whether the person is a plain user, an instructor or a learner.
+    full_time, total_learners : bool, int
+        The instructor columns, NULL for other kinds.
+    occupation, social_link : str
+        The learner columns, empty for other kinds.
+
+    """
+
+    USER = "user"
+    INSTRUCTOR = "instructor"
+    LEARNER = "learner"
+    KIND_CHOICES: ClassVar[list[tuple[str, str]]] = [
+        (USER, "User"),
+        (INSTRUCTOR, "Instructor"),
+        (LEARNER, "Learner"),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default=USER)
+    first_name = models.CharField(null=False, max_length=30, default="john")
+    last_name = models.CharField(null=False, max_length=30, default="doe")
+    dob = models.DateField(null=True)
+    # Instructor columns
+    full_time = models.BooleanField(null=True)
+    total_learners = models.IntegerField(null=True)
+    # Learner columns
+    occupation = models.CharField(max_length=20, choices=Learner.OCCUPATION_CHOICES, blank=True)
+    social_link = models.URLField(max_length=200, blank=True)
+
+    objects = UserQuerySet.as_manager()
+
+    # The kind given to new objects of the class, set by the proxies.
+    default_kind = USER
+
+    class Meta:
+        """Index the lookups of the proxies and the user lookups they replace."""
+
+        indexes: ClassVar[list[models.Index]] = [
+            # The proxies filter on kind, so it leads the first name index
+            models.Index(
+                fields=["kind", "first_name"],
+                name="crud_person_kind_name_idx",
+                opclasses=["varchar_pattern_ops", "varchar_pattern_ops"],
+            ),
+            models.Index(fields=["last_name", "first_name", "id"], name="crud_person_name_id_idx"),
+            models.Index(fields=["dob", "id"], name="crud_person_dob_id_idx"),
+            models.Index(fields=["occupation"], name="crud_person_occupation_idx"),
+        ]
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        """Give new objects the class's kind, rows from the database pass their own."""
+        if not args:
+            kwargs.setdefault("kind", self.default_kind)
+        super().__init__(*args, **kwargs)
+
+    def __str__(self) -> str:
+        """Return the full name of the person.
+
+        Returns:
+            str: The name in the format 'first_name last_name'.
+
+        """
+        return self.first_name + " " + self.last_name
+
+    @classmethod
+    def from_db(cls, db: str | None, field_names: list[str], values: list) -> "Person":
+        """Load rows read through ``Person`` as the proxy of their kind, when it is loaded.
+
+        Returns:
+            Person: A ``Person``, ``InstructorPerson`` or ``LearnerPerson``.
+
+        """
+        if cls is Person and "kind" in field_names:
+            kind = values[field_names.index("kind")]
+            proxy = {cls.INSTRUCTOR: InstructorPerson, cls.LEARNER: LearnerPerson}.get(kind, cls)
+            return super(Person, proxy).from_db(db, field_names, values)
+        return super().from_db(db, field_names, values)
+
+
+# Person manager
+class PersonKindManager(models.Manager.from_queryset(UserQuerySet)):
+    """Manager of the people of one kind, the proxy models' counterpart of a child table."""
+
+    def __init__(self, kind: str) -> None:
+        """Manage the ``Person`` rows of ``kind``."""
+        super().__init__()
+        self.kind = kind
+
+    def get_queryset(self) -> UserQuerySet:
+        """Return the people of this manager's kind.
+
+        Returns:
+            UserQuerySet: The ``Person`` rows filtered by kind.
+
+        """
+        return super().get_queryset().filter(kind=self.kind)
+
+
+# Instructor proxy
+class InstructorPerson(Person):
+    """An instructor stored in the single ``Person`` table."""
+
+    default_kind = Person.INSTRUCTOR
+
+    objects = PersonKindManager(Person.INSTRUCTOR)
+
+    class Meta:
+        """Read and write the ``Person`` table."""
+
+        proxy = True
+
+    __str__ = Instructor.__str__
+
+
+# Learner proxy
+class LearnerPerson(Person):
+    """A learner stored in the single ``Person`` table."""
+
+    default_kind = Person.LEARNER
+
+    objects = PersonKindManager(Person.LEARNER)
+
+    class Meta:
+        """Read and write the ``Person`` table."""
+
+        proxy = True
+
+    __str__ = Learner.__str__
+
+
+def copy_people(*, using: str | None = None) -> int:
+    """Replace every ``Person`` row with a copy of the users in the multi-table layout.
+
+    Returns:
+        int: The number of people copied.
+
+    """
+    using = using or router.db_for_write(Person)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+
+    def column(model: type, name: str) -> str:
+        return f"{quote(model._meta.db_table)}.{quote(model._meta.get_field(name).column)}"  # noqa: SLF001
+
+    def table(model: type) -> str:
+        return quote(model._meta.db_table)  # noqa: SLF001
+
+    fields = ["id", "kind", *COPIED_FIELDS, *INSTRUCTOR_FIELDS, *LEARNER_FIELDS]
+    user_id = column(User, "id")
+    instructor_id, learner_id = column(Instructor, "user_ptr"), column(Learner, "user_ptr")
+    kind = (
+        f"CASE WHEN {instructor_id} IS NOT NULL THEN %s "
+        f"WHEN {learner_id} IS NOT NULL THEN %s ELSE %s END"
+    )
+    select = [
+        user_id,
+        kind,
+        *(column(User, name) for name in COPIED_FIELDS),
+        *(column(Instructor, name) for name in INSTRUCTOR_FIELDS),
+        *(f"COALESCE({column(Learner, name)}, '')" for name in LEARNER_FIELDS),
+    ]
+    sql = (
+        f"INSERT INTO {table(Person)} ({', '.join(quote(name) for name in fields)}) "  # noqa: S608
+        f"SELECT {', '.join(select)} FROM {table(User)} "
+        f"LEFT JOIN {table(Instructor)} ON {instructor_id} = {user_id} "
+        f"LEFT JOIN {table(Learner)} ON {learner_id} = {user_id}"
+    )
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table(Person)}")  # noqa: S608
+        cursor.execute(sql, [Person.INSTRUCTOR, Person.LEARNER, Person.USER])
+        copied = cursor.rowcount
+    reset_sequences(Person, using=using)
+    return copied
@@ -0,0 +1,25 @@
+"""Signal receivers for the crud models."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import name_indexes
+from .models import Instructor, Learner, User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Instructor)
+@receiver(post_save, sender=Learner)
+def index_saved_name(instance: User, using: str, **kwargs: object) -> None:  # noqa: ARG001
+    """Update the autocomplete snapshots holding a saved user, once the save is committed."""
+    for index in name_indexes.values():
+        transaction.on_commit(lambda index=index: index.update(instance), using=using)
+
+
+@receiver(post_delete, sender=Instructor)
+@receiver(post_delete, sender=Learner)
+def unindex_deleted_name(instance: User, using: str, **kwargs: object) -> None:  # noqa: ARG001
+    """Remove a deleted instructor or learner from its autocomplete snapshot once committed."""
+    index, pk = name_indexes[type(instance)], instance.pk
+    transaction.on_commit(lambda: index.discard(pk), using=using)
@@ -0,0 +1,210 @@
+"""Tests for the crud app."""
+
+# ruff: noqa: PT009
+
+from datetime import date
+
+import querylog
+from crud.autocomplete import complete, name_indexes
+from crud.models import (
+    Course,
+    Enrollment,
+    Instructor,
+    Learner,
+    Lesson,
+    User,
+)
+from crud.people import InstructorPerson, LearnerPerson, Person, copy_people
+from crud.reset import reset_tables
+from crud.sync import SyncCounts, sync
+from django.db import connection
+from django.test import TestCase, override_settings
+
+
+class QueryLogTests(TestCase):
+    """The query log records every statement under its script and phase."""
+
+    def test_report_groups_by_script_and_phase(self) -> None:
+        """Aggregate per script, phase and fingerprint, and flag repeated SELECTs."""
+        log = querylog.QueryLog("write.py")
+        with connection.execute_wrapper(log):
+            Course.objects.count()
+            with querylog.phase("lookups"):
+                for name in ("a", "b", "c"):
+                    Course.objects.filter(name=name).first()
+            with querylog.task("read_courses.py"):
+                Course.objects.count()
+        report = log.report()
+        self.assertEqual(report["queries"], 5)
+        self.assertEqual(
+            {
+                script: {phase: stats["queries"] for phase, stats in data["phases"].items()}
+                for script, data in report["scripts"].items()
+            },
+            {"write.py": {"main": 1, "lookups": 3}, "read_courses.py": {"main": 1}},
+        )
+        self.assertEqual([item["count"] for item in report["repeated"]], [3])
+
+
+class DisplayQueryTests(TestCase):
+    """Printing enrollments and lessons loaded ``for_display`` issues no extra queries."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create two courses, each with a lesson and two enrolled learners."""
+        for number in range(2):
+            course = Course.objects.create(name=f"Course {number}", description="")
+            Lesson.objects.create(title=f"Lesson {number}", course=course, content="")
+            for name in ("James", "Mary"):
+                learner = Learner.objects.create(
+                    first_name=name,
+                    social_link="https://www.example.com/",
+                )
+                Enrollment.objects.create(learner=learner, course=course)
+        Lesson.objects.create(title="Unassigned", content="")
+
+    def test_enrollments_print_in_one_query(self) -> None:
+        """Print every enrollment with the query that loads them."""
+        expected = [str(enrollment) for enrollment in Enrollment.objects.all()]
+        with self.assertNumQueries(1):
+            printed = [str(enrollment) for enrollment in Enrollment.objects.for_display()]
+        self.assertEqual(sorted(printed), sorted(expected))
+
+    def test_lessons_print_in_one_query(self) -> None:
+        """Print every lesson, with or without a course, with the query that loads them."""
+        expected = [str(lesson) for lesson in Lesson.objects.all()]
+        with self.assertNumQueries(1):
+            printed = [str(lesson) for lesson in Lesson.objects.for_display()]
+        self.assertEqual(sorted(printed), sorted(expected))
+
+
+class SubclassQueryTests(TestCase):
+    """Users load as instructors and learners in a single query."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create a plain user, an instructor and two learners."""
+        User.objects.create(first_name="John")
+        Instructor.objects.create(first_name="Yan", total_learners=0)
+        for name in ("James", "Mary"):
+            Learner.objects.create(first_name=name, social_link="https://www.example.com/")
+
+    def test_rows_are_downcast_in_one_query(self) -> None:
+        """Return each user as its subclass, with the parent and child fields loaded."""
+        expected = [
+            str(User.objects.get(first_name="John")),
+            str(Instructor.objects.get()),
+            *(str(learner) for learner in Learner.objects.order_by("pk")),
+        ]
+        with self.assertNumQueries(1):
+            users = list(User.objects.select_subclasses().order_by("pk"))
+            printed = [str(user) for user in users]
+        self.assertEqual([type(user) for user in users], [User, Instructor, Learner, Learner])
+        self.assertEqual(printed, expected)
+
+    def test_chunked_iteration(self) -> None:
+        """Stream the downcast users in chunks."""
+        users = User.objects.select_subclasses().order_by("pk")
+        with self.assertNumQueries(1):
+            names = [(type(user), user.first_name) for user in users.iterator(chunk_size=2)]
+        self.assertEqual(
+            names,
+            [(User, "John"), (Instructor, "Yan"), (Learner, "James"), (Learner, "Mary")],
+        )
+
+
+class SingleTablePersonTests(TestCase):
+    """The single-table layout holds the same people as the multi-table one."""
+
+    def test_copy_keeps_ids_and_kinds(self) -> None:
+        """Copy every user with its id, and load the rows as the proxies of their kinds."""
+        User.objects.create(first_name="John")
+        Instructor.objects.create(first_name="Yan", total_learners=3)
+        Learner.objects.create(first_name="James", social_link="https://www.example.com/")
+        self.assertEqual(copy_people(), 3)
+        with self.assertNumQueries(1):
+            people = {person.pk: str(person) for person in Person.objects.all()}
+        expected = {user.pk: str(user) for user in User.objects.select_subclasses()}
+        self.assertEqual(people, expected)
+        self.assertEqual(
+            [type(person) for person in Person.objects.order_by("pk")],
+            [Person, InstructorPerson, LearnerPerson],
+        )
+        self.assertEqual(LearnerPerson.objects.create(first_name="Mary").kind, Person.LEARNER)
+
+
+class NameAutocompleteTests(TestCase):
+    """Autocomplete finds names by prefix and follows committed changes."""
+
+    def setUp(self) -> None:
+        """Create instructors Yan Luo, Yang Li and Joy Doe and learner José Álvarez."""
+        self.yan, self.yang, self.joy = (
+            Instructor.objects.create(first_name=first, last_name=last, total_learners=0)
+            for first, last in (("Yan", "Luo"), ("Yang", "Li"), ("Joy", "Doe"))
+        )
+        self.jose = Learner.objects.create(
+            first_name="José",
+            last_name="Álvarez",
+            social_link="https://www.example.com/",
+        )
+        self.addCleanup(lambda: [index.clear() for index in name_indexes.values()])
+
+    def test_prefixes_ignore_case_and_accents(self) -> None:
+        """Match normalized "first last" prefixes, in name order, up to the limit."""
+        self.assertEqual(complete("y", Instructor), [self.yan.pk, self.yang.pk])
+        self.assertEqual(complete("YAN ", Instructor), [self.yan.pk])
+        self.assertEqual(complete("y", Instructor, limit=1), [self.yan.pk])
+        self.assertEqual(complete("jose alv", Learner), [self.jose.pk])
+
+    def test_snapshot_follows_committed_changes(self) -> None:
+        """Reindex renamed users, also through their parent row, and drop deleted ones."""
+        self.assertEqual(complete("y", Instructor), [self.yan.pk, self.yang.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.yan.first_name = "Ian"
+            self.yan.save()
+            user = User.objects.get(pk=self.joy.pk)
+            user.first_name = "Yara"
+            user.save()
+            self.yang.delete()
+        self.assertEqual(complete("y", Instructor), [self.joy.pk])
+        self.assertEqual(complete("ian", Instructor), [self.yan.pk])
+
+    def test_reset_drops_the_snapshots(self) -> None:
+        """Forget the names of the rows a reset deleted, whose ids will be reused."""
+        self.assertEqual(complete("y", Instructor), [self.yan.pk, self.yang.pk])
+        reset_tables()
+        self.assertEqual(complete("y", Instructor), [])
+
+    @override_settings(NAME_AUTOCOMPLETE={"BACKEND": "database"})
+    def test_database_backend(self) -> None:
+        """Match the first name, then the last name after a space."""
+        self.assertEqual(complete("Ya", Instructor), [self.yan.pk, self.yang.pk])
+        self.assertEqual(complete("Yang L", Instructor), [self.yang.pk])
+
+
+class SyncTests(TestCase):
+    """Sync upserts learners by natural key and deletes the ones gone from the source."""
+
+    def learners(self, occupation: str) -> list[Learner]:
+        """Return fresh source learners James and Mary with the given occupation."""
+        return [
+            Learner(
+                first_name=name,
+                last_name="Smith",
+                dob=date(1990, 1, 1),
+                occupation=occupation,
+                social_link="https://www.example.com/",
+            )
+            for name in ("James", "Mary")
+        ]
+
+    def test_sync_counts(self) -> None:
+        """Insert, then skip unchanged rows, update changed ones and delete missing ones."""
+        self.assertEqual(sync(Learner, self.learners("student")), SyncCounts(inserted=2))
+        self.assertEqual(sync(Learner, self.learners("student")), SyncCounts(unchanged=2))
+        changed = sync(Learner, self.learners("developer")[:1])
+        self.assertEqual(changed, SyncCounts(updated=1, deleted=1))
+        self.assertEqual(
+            list(Learner.objects.values_list("first_name", "occupation")),
+            [("James", "developer")],
+        )
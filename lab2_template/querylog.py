@@ -0,0 +1,286 @@
+"""SQL query instrumentation for the lab scripts.
+
+Every statement that goes through Django's ``connection.execute_wrapper`` hook is recorded
+with its fingerprint, duration, row count and the script line that issued it. Set the
+``QUERYLOG`` environment variable to turn it on for any script without touching its code::
+
+    QUERYLOG=1 python read_course_instructors.py
+    QUERYLOG=1 QUERYLOG_JSON=report.json python write.py
+
+A human summary is printed to stderr when the process exits, and a JSON report is written to
+``QUERYLOG_JSON`` when it is set. Statements are grouped per script and per phase. Scripts mark
+their phases with ``querylog.phase()``, and ``main.py`` labels the statements of every task it
+runs with ``querylog.task()``. Both labels are kept in context variables, so threads running at
+the same time, and the worker threads ``sync_to_async`` starts for them, never mix them up.
+"""
+
+import atexit
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from django.db.backends.signals import connection_created
+
+ENV_VAR = "QUERYLOG"
+JSON_ENV_VAR = "QUERYLOG_JSON"
+# A SELECT fingerprint issued this many times from one source line is reported as a likely N+1.
+REPEAT_THRESHOLD = 3
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_DJANGO_DIR = f"{os.sep}django{os.sep}"
+
+# The script and the phases the current thread or task is in, innermost phase last
+_script: ContextVar[str | None] = ContextVar("querylog_script", default=None)
+_phases: ContextVar[tuple[str, ...]] = ContextVar("querylog_phases", default=("main",))
+
+
+def fingerprint(sql: str) -> str:
+    """Return ``sql`` with literals and placeholders replaced so similar queries group together.
+
+    Returns:
+        str: The normalised statement.
+
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _caller() -> str:
+    """Return ``file:line`` of the innermost frame outside Django and this module."""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename != __file__ and _DJANGO_DIR not in frame.filename:
+            return f"{Path(frame.filename).name}:{frame.lineno}"
+    return "<unknown>"
+
+
+@dataclass
+class QueryRecord:
+    script: str
+    phase: str
+    fingerprint: str
+    sql: str
+    duration_ms: float
+    rowcount: int
+    many: bool
+    source: str
+
+
+class QueryLog:
+    """Collect a ``QueryRecord`` for every statement executed while installed.
+
+    Use an instance directly as an execute wrapper, e.g.
+    ``with connection.execute_wrapper(log): ...``, or call ``install()`` to attach it to every
+    database connection the process opens.
+
+    """
+
+    def __init__(self, script: str | None = None) -> None:
+        """Initialize an empty log for ``script``, defaulting to the running script's name."""
+        self.script = script or Path(sys.argv[0]).name or "<interactive>"
+        self.records: list[QueryRecord] = []
+
+    def __call__(
+        self,
+        execute: Callable,
+        sql: str,
+        params: Any,  # noqa: ANN401
+        many: bool,  # noqa: FBT001
+        context: dict,
+    ) -> Any:  # noqa: ANN401
+        """Time one statement and record it."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.records.append(
+                QueryRecord(
+                    script=_script.get() or self.script,
+                    phase=_phases.get()[-1],
+                    fingerprint=fingerprint(sql),
+                    sql=sql,
+                    duration_ms=duration * 1000,
+                    rowcount=getattr(context.get("cursor"), "rowcount", -1),
+                    many=many,
+                    source=_caller(),
+                ),
+            )
+
+    @staticmethod
+    def phase(name: str) -> AbstractContextManager[None]:
+        """Attribute the statements issued inside the block to phase ``name``.
+
+        Returns:
+            AbstractContextManager[None]: The block, see the module level ``phase()``.
+
+        """
+        return phase(name)
+
+    def install(self) -> None:
+        """Attach this log to every database connection opened from now on."""
+        connection_created.connect(self._attach, weak=False, dispatch_uid=id(self))
+
+    def _attach(self, sender: Any, connection: Any, **kwargs: Any) -> None:  # noqa: ANN401, ARG002
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def report(self) -> dict:
+        """Aggregate the records per script, per phase and per fingerprint.
+
+        Returns:
+            dict: A JSON serialisable report with totals, per script and phase statistics,
+            likely N+1 patterns and the raw records.
+
+        """
+        scripts: dict[str, dict] = {}
+        repeats: dict[tuple[str, str], int] = defaultdict(int)
+        for record in list(self.records):
+            script = scripts.setdefault(
+                record.script,
+                {"queries": 0, "duration_ms": 0.0, "phases": {}},
+            )
+            phase = script["phases"].setdefault(
+                record.phase,
+                {"queries": 0, "duration_ms": 0.0, "fingerprints": {}},
+            )
+            for totals in (script, phase):
+                totals["queries"] += 1
+                totals["duration_ms"] += record.duration_ms
+            stats = phase["fingerprints"].setdefault(
+                record.fingerprint,
+                {"count": 0, "duration_ms": 0.0, "max_ms": 0.0, "rows": 0},
+            )
+            stats["count"] += 1
+            stats["duration_ms"] += record.duration_ms
+            stats["max_ms"] = max(stats["max_ms"], record.duration_ms)
+            stats["rows"] += max(record.rowcount, 0)
+            repeats[record.source, record.fingerprint] += 1
+        return {
+            "script": self.script,
+            "queries": len(self.records),
+            "duration_ms": sum(record.duration_ms for record in self.records),
+            "scripts": scripts,
+            "repeated": [
+                {"source": source, "fingerprint": sql, "count": count}
+                for (source, sql), count in repeats.items()
+                if count >= REPEAT_THRESHOLD and sql.startswith("SELECT")
+            ],
+            "records": [asdict(record) for record in self.records],
+        }
+
+    def summary(self) -> str:
+        """Return a short human readable summary of the report."""
+        report = self.report()
+        lines = [
+            (
+                f"querylog: {report['script']} issued {report['queries']} queries "
+                f"in {report['duration_ms']:.2f} ms"
+            ),
+        ]
+        for script_name, script in report["scripts"].items():
+            lines.append(
+                f"  {script_name}: {script['queries']} queries, {script['duration_ms']:.2f} ms",
+            )
+            for name, phase in script["phases"].items():
+                lines.append(
+                    f"    [{name}] {phase['queries']} queries, {phase['duration_ms']:.2f} ms",
+                )
+                slowest = sorted(
+                    phase["fingerprints"].items(),
+                    key=lambda item: item[1]["duration_ms"],
+                    reverse=True,
+                )
+                lines.extend(
+                    f"      {stats['count']:>5}x {stats['duration_ms']:9.2f} ms  {sql[:76]}"
+                    for sql, stats in slowest[:5]
+                )
+        lines.extend(
+            f"  possible N+1: {item['count']} queries from {item['source']}: "
+            f"{item['fingerprint'][:60]}"
+            for item in report["repeated"]
+        )
+        return "\n".join(lines)
+
+    def write(self, path: str | os.PathLike) -> None:
+        """Write the JSON report to ``path``."""
+        Path(path).write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+
+
+_active: QueryLog | None = None
+
+
+def enable() -> QueryLog:
+    """Install a process wide log and report it when the process exits.
+
+    Returns:
+        QueryLog: The installed log, also available as ``querylog.active()``.
+
+    """
+    global _active  # noqa: PLW0603
+    if _active is None:
+        _active = QueryLog()
+        _active.install()
+        atexit.register(_emit, _active)
+    return _active
+
+
+def active() -> QueryLog | None:
+    """Return the process wide log installed by ``enable()``, if any."""
+    return _active
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Attribute the statements the current thread or task issues inside the block to ``name``.
+
+    Phases nest, a statement belongs to the innermost one. Outside of any phase it is ``main``.
+    """
+    token = _phases.set((*_phases.get(), name))
+    try:
+        yield
+    finally:
+        _phases.reset(token)
+
+
+@contextmanager
+def task(script: str) -> Iterator[None]:
+    """Attribute the statements issued inside the block to ``script``, starting in ``main``.
+
+    ``main.py`` runs several scripts in one process, each inside its own ``task()``.
+    """
+    script_token = _script.set(script)
+    phases_token = _phases.set(("main",))
+    try:
+        yield
+    finally:
+        _phases.reset(phases_token)
+        _script.reset(script_token)
+
+
+def _emit(log: QueryLog) -> None:
+    print(log.summary(), file=sys.stderr)  # noqa: T201
+    if path := os.getenv(JSON_ENV_VAR):
+        log.write(path)
+
+
+def enable_from_env() -> None:
+    """Call ``enable()`` when the ``QUERYLOG`` environment variable is set to a true value."""
+    if os.getenv(ENV_VAR, "").lower() not in {"", "0", "false", "no", "off"}:
+        enable()
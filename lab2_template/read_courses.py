@@ -2,13 +2,10 @@
 
 # ruff: noqa: E402, T201
 
-import os
+import bootstrap
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
-
-application = get_wsgi_application()
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
 
 from crud.models import Course
 
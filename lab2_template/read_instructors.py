@@ -1,56 +1,59 @@
 """Testing CRUD Operations on the database tables."""
 # ruff: noqa: E402, T201
 
-import os
+import bootstrap
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
-
-application = get_wsgi_application()
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
 
+import querylog
 from crud.models import Instructor
 
 # Your code starts from here:
-
-instructor_yan = Instructor.objects.get(first_name="Yan")
-print("1. Find a single instructor with first name `Yan`")
-print(instructor_yan)
+# Every numbered step is a querylog phase, so QUERYLOG=1 reports its queries on their own
+with querylog.phase("instructor_yan"):
+    instructor_yan = Instructor.objects.get(first_name="Yan")
+    print("1. Find a single instructor with first name `Yan`")
+    print(instructor_yan)
 
 print("\n")
-# Note that there is no instructor with first name `Andy`
-# So the manager will throw an exception
-try:
-    instructor_andy = Instructor.objects.get(first_name="Andy")
-except Instructor.DoesNotExist:
-    print("2. Try to find a non-existing instructor with first name `Andy`")
-    print("Instructor Andy doesn't exist")
+with querylog.phase("instructor_andy"):
+    # Note that there is no instructor with first name `Andy`
+    # So the manager will throw an exception
+    try:
+        instructor_andy = Instructor.objects.get(first_name="Andy")
+    except Instructor.DoesNotExist:
+        print("2. Try to find a non-existing instructor with first name `Andy`")
+        print("Instructor Andy doesn't exist")
 
 print("\n")
-part_time_instructors = Instructor.objects.filter(full_time=False)
-print("3. Find all part time instructors: ")
-print(part_time_instructors)
+with querylog.phase("part_time_instructors"):
+    part_time_instructors = Instructor.objects.filter(full_time=False)
+    print("3. Find all part time instructors: ")
+    print(part_time_instructors)
 
 print("\n")
-full_time_instructors = (
-    Instructor.objects.exclude(full_time=False)
-    .filter(total_learners__gt=30000)
-    .filter(first_name__startswith="Y")
-)
-print(
-    "4. Find all full time instructors with First Name starts with `Y` and learners count greater "
-    "than 30000",
-)
-print(full_time_instructors)
+with querylog.phase("chained_filters"):
+    full_time_instructors = (
+        Instructor.objects.exclude(full_time=False)
+        .filter(total_learners__gt=30000)
+        .filter(first_name__startswith="Y")
+    )
+    print(
+        "4. Find all full time instructors with First Name starts with `Y` and learners count "
+        "greater than 30000",
+    )
+    print(full_time_instructors)
 
 print("\n")
-full_time_instructors = Instructor.objects.filter(
-    full_time=True,
-    total_learners__gt=30000,
-    first_name__startswith="Y",
-)
-print(
-    "5. Find all full time instructors with First Name starts with `Y` "
-    "and learners count greater than 30000",
-)
-print(full_time_instructors)
+with querylog.phase("combined_filters"):
+    full_time_instructors = Instructor.objects.filter(
+        full_time=True,
+        total_learners__gt=30000,
+        first_name__startswith="Y",
+    )
+    print(
+        "5. Find all full time instructors with First Name starts with `Y` "
+        "and learners count greater than 30000",
+    )
+    print(full_time_instructors)
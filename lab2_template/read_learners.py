@@ -1,23 +1,24 @@
 """Reading Learners."""
 # ruff: noqa: E402, T201
 
-import os
+import bootstrap
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
-
-application = get_wsgi_application()
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
 
+import querylog
 from crud.models import Learner
 
 # Your code starts from here:
-# Find students with last name "Smith"
-learners_smith = Learner.objects.filter(last_name="Smith")
-print("1. Find learners with last name `Smith`:")
-print(learners_smith)
+# Every numbered step is a querylog phase, so QUERYLOG=1 reports its queries on their own
+with querylog.phase("learners_smith"):
+    # Find students with last name "Smith"
+    learners_smith = Learner.objects.filter(last_name="Smith")
+    print("1. Find learners with last name `Smith`:")
+    print(learners_smith)
 print("\n")
-# Order by dob descending, and select the first two objects
-learners = Learner.objects.order_by("-dob")[0:2]
-print("2. Find top two youngest learners:")
-print(learners)
+with querylog.phase("youngest_learners"):
+    # Order by dob descending, and select the first two objects
+    learners = Learner.objects.order_by("-dob")[0:2]
+    print("2. Find top two youngest learners:")
+    print(learners)
@@ -2,9 +2,13 @@
 
 import os
 
-from dotenv import load_dotenv
+import bootstrap
+import querylog
 
-load_dotenv()
+# Imports python-dotenv only when there is a .env file to read
+bootstrap.load_env()
+# Set QUERYLOG=1 to record and report every SQL statement the script issues
+querylog.enable_from_env()
 
 DATABASES = {
     "default": {
@@ -14,6 +18,9 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": "localhost",
         "PORT": "5432",
+        # Persistent connections, checked before reuse
+        "CONN_MAX_AGE": int(os.getenv("CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     },
 }
 
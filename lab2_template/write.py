@@ -1,17 +1,32 @@
 """Testing CRUD Operations on the database tables."""
 # ruff: noqa: E402, T201
 
-import os
+import sys
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
+import bootstrap
 
-application = get_wsgi_application()
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
 
 from datetime import date
 
+import querylog
 from crud.models import Course, Enrollment, Instructor, Learner, Lesson, User
+from crud.reset import reset_tables
+from crud.seeding import bulk_load
+from crud.sync import sync
+from django.db.models import Model
+
+# With --sync, rows are upserted by natural key instead of wiping and reloading every table
+SYNC = "--sync" in sys.argv[1:]
+
+
+def save_all(model: type[Model], objs: list, **sync_options: object) -> None:
+    """Bulk load ``objs`` into ``model``'s tables, or sync the tables with them under --sync."""
+    if SYNC:
+        print(f"{model._meta.label}: {sync(model, objs, **sync_options)}")  # noqa: SLF001
+    else:
+        bulk_load(model, objs)
 
 
 # Your code starts from here:
@@ -20,9 +35,11 @@ def write_instructors() -> None:
 
     This function performs the following actions:
     - Creates a User instance for John Doe and saves it.
-    - Creates an Instructor instance for John, associates it with the created User, and saves it.
-    - Creates and saves Instructor instances for Yan Luo, Joy Li, and Peter Chen with their
-    respective attributes.
+    - Creates an Instructor instance for John and associates it with the created User.
+    - Creates Instructor instances for Yan Luo, Joy Li, and Peter Chen with their respective
+    attributes.
+    - Saves all Instructor objects, with their parent User rows, in a single bulk load, or
+    syncs them by natural key with --sync.
     - Prints a confirmation message after all Instructor objects are saved.
 
     Note:
@@ -34,11 +51,11 @@ def write_instructors() -> None:
     # Add instructors
     # Create a user
     user_john = User(first_name="John", last_name="Doe", dob=date(1962, 7, 16))
-    user_john.save()
+    # Only the users that are neither instructors nor learners are synced here
+    save_all(User, [user_john], queryset=User.objects.filter(instructor=None, learner=None))
     instructor_john = Instructor(full_time=True, total_learners=30050)
     # Update the user reference of instructor_john to be user_john
     instructor_john.user = user_john  # pyright: ignore[reportAttributeAccessIssue]
-    instructor_john.save()
 
     instructor_yan = Instructor(
         first_name="Yan",
@@ -47,7 +64,6 @@ def write_instructors() -> None:
         full_time=True,
         total_learners=30050,
     )
-    instructor_yan.save()
 
     instructor_joy = Instructor(
         first_name="Joy",
@@ -56,7 +72,6 @@ def write_instructors() -> None:
         full_time=False,
         total_learners=10040,
     )
-    instructor_joy.save()
     instructor_peter = Instructor(
         first_name="Peter",
         last_name="Chen",
@@ -64,7 +79,7 @@ def write_instructors() -> None:
         full_time=True,
         total_learners=2002,
     )
-    instructor_peter.save()
+    save_all(Instructor, [instructor_john, instructor_yan, instructor_joy, instructor_peter])
     print("Instructor objects all saved... ")
 
 
@@ -72,20 +87,19 @@ def write_courses() -> None:
     """Create and save Course objects for predefined courses.
 
     This function instantiates Course objects with specific names and descriptions,
-    saves them to the database, and prints a confirmation message upon completion.
+    bulk loads them into the database, and prints a confirmation message upon completion.
     """
     # Add Courses
     course_cloud_app = Course(
         name="Cloud Application Development with Database",
         description="Develop and deploy application on cloud",
     )
-    course_cloud_app.save()
     course_python = Course(
         name="Introduction to Python",
         description="Learn core concepts of Python and obtain hands-on "
         "experience via a capstone project",
     )
-    course_python.save()
+    save_all(Course, [course_cloud_app, course_python])
 
     print("Course objects all saved... ")
 
@@ -94,13 +108,12 @@ def write_lessons() -> None:
     """Create and save Lesson objects for predefined lessons.
 
     This function instantiates Lesson objects with specific titles and content,
-    saves them to the database, and prints a confirmation message upon completion.
+    bulk loads them into the database, and prints a confirmation message upon completion.
     """
     # Add lessons
     lesson1 = Lesson(title="Lesson 1", content="Object-relational mapping project")
-    lesson1.save()
     lesson2 = Lesson(title="Lesson 2", content="Django full stack project")
-    lesson2.save()
+    save_all(Lesson, [lesson1, lesson2])
     print("Lesson objects all saved... ")
 
 
@@ -108,7 +121,7 @@ def write_learners() -> None:
     """Create and save multiple Learner objects with predefined attributes to the database.
 
     This function instantiates several Learner instances with specific first names, last names,
-    dates of birth, occupations, and social links, then saves each instance to the database.
+    dates of birth, occupations, and social links, then bulk loads them into the database.
     Intended for populating the database with initial or sample learner data.
     """
     # Add Learners
@@ -119,7 +132,6 @@ def write_learners() -> None:
         occupation="data_scientist",
         social_link="https://www.linkedin.com/james/",
     )
-    learner_james.save()
     learner_mary = Learner(
         first_name="Mary",
         last_name="Smith",
@@ -127,7 +139,6 @@ def write_learners() -> None:
         occupation="dba",
         social_link="https://www.facebook.com/mary/",
     )
-    learner_mary.save()
     learner_robert = Learner(
         first_name="Robert",
         last_name="Lee",
@@ -135,7 +146,6 @@ def write_learners() -> None:
         occupation="student",
         social_link="https://www.facebook.com/robert/",
     )
-    learner_robert.save()
     learner_david = Learner(
         first_name="David",
         last_name="Smith",
@@ -143,7 +153,6 @@ def write_learners() -> None:
         occupation="developer",
         social_link="https://www.linkedin.com/david/",
     )
-    learner_david.save()
     learner_john = Learner(
         first_name="John",
         last_name="Smith",
@@ -151,7 +160,6 @@ def write_learners() -> None:
         occupation="developer",
         social_link="https://www.linkedin.com/john/",
     )
-    learner_john.save()
 
     learner_harry = Learner(
         first_name="Harry",
@@ -160,7 +168,6 @@ def write_learners() -> None:
         occupation="student",
         social_link="https://www.linkedin.com/harry/",
     )
-    learner_harry.save()
 
     learner_hermione = Learner(
         first_name="Hermione",
@@ -169,13 +176,32 @@ def write_learners() -> None:
         occupation="student",
         social_link="https://www.linkedin.com/hermione/",
     )
-    learner_hermione.save()
+    save_all(
+        Learner,
+        [
+            learner_james,
+            learner_mary,
+            learner_robert,
+            learner_david,
+            learner_john,
+            learner_harry,
+            learner_hermione,
+        ],
+    )
 
     print("Learner objects all saved... ")
 
 
-def clean_data() -> None:
-    """Delete all data to start from fresh."""
+def clean_data(*, fast: bool = True) -> None:
+    """Delete all data to start from fresh.
+
+    With ``fast`` set, the tables are emptied with set-based SQL and their id sequences are
+    restarted. Otherwise every queryset is deleted through Django's deletion collector.
+
+    """
+    if fast:
+        reset_tables()
+        return
     Enrollment.objects.all().delete()
     User.objects.all().delete()
     Learner.objects.all().delete()
@@ -184,10 +210,14 @@ def clean_data() -> None:
     Lesson.objects.all().delete()
 
 
-# Clean any existing data first
-clean_data()
+# Every step is a querylog phase, so QUERYLOG=1 reports its queries on their own
+# Clean any existing data first, unless syncing
+if not SYNC:
+    with querylog.phase("clean_data"):
+        clean_data()
 
-write_courses()
-write_instructors()
-write_lessons()
-write_learners()
+with querylog.phase("populate"):
+    write_courses()
+    write_instructors()
+    write_lessons()
+    write_learners()
@@ -0,0 +1 @@
+"""Benchmarks for the related_objects lab, run with ``python -m benchmarks``."""
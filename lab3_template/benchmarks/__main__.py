@@ -0,0 +1,99 @@
+"""Run the benchmark suites and emit the results as JSON.
+
+Examples::
+
+    python -m benchmarks queries --enrollments 1000 10000 100000
+    python -m benchmarks queries --database postgresql --output results.json
+
+"""
+
+# ruff: noqa: T201
+
+import argparse
+import importlib
+import json
+import sys
+
+from benchmarks import harness
+
+# Suite name -> module exposing ``run(dataset, *, repeat) -> list[dict]``.
+SUITES = {
+    "queries": "benchmarks.bench_queries",
+    "indexes": "benchmarks.bench_indexes",
+    "export": "benchmarks.bench_export",
+    "pool": "benchmarks.bench_pool",
+    "async": "benchmarks.bench_async",
+    "loader": "benchmarks.bench_loader",
+    "pagination": "benchmarks.bench_pagination",
+    "autocomplete": "benchmarks.bench_autocomplete",
+    "layouts": "benchmarks.bench_layouts",
+}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line options."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "suites",
+        nargs="*",
+        metavar="suite",
+        help=f"suites to run, any of {', '.join(SUITES)} (default: all)",
+    )
+    parser.add_argument(
+        "--enrollments",
+        nargs="+",
+        type=int,
+        default=[1000, 10000],
+        help="dataset scales to run, in enrollment rows",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic dataset seed")
+    parser.add_argument("--database", choices=["sqlite", "postgresql"], default="sqlite")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+    if unknown := set(args.suites) - set(SUITES):
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+    args.suites = args.suites or list(SUITES)
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Load each dataset scale once and run the selected suites against it."""
+    args = parse_args(argv)
+    harness.setup(args.database)
+
+    from related_objects import synthetic  # noqa: PLC0415
+
+    runs = []
+    for enrollments in args.enrollments:
+        dataset = synthetic.SyntheticDataset(enrollments=enrollments, seed=args.seed)
+        load_seconds = harness.timed(lambda dataset=dataset: synthetic.load(dataset))
+        print(f"Loaded {enrollments} enrollments in {load_seconds:.2f}s", file=sys.stderr)
+        for suite in args.suites:
+            results = importlib.import_module(SUITES[suite]).run(dataset, repeat=args.repeat)
+            runs.append(
+                {
+                    "suite": suite,
+                    "scale": {
+                        "enrollments": enrollments,
+                        "learners": dataset.learners,
+                        "courses": dataset.courses,
+                        "instructors": dataset.instructors,
+                        "seed": dataset.seed,
+                    },
+                    "load_seconds": load_seconds,
+                    "results": results,
+                },
+            )
+            print(f"  {suite}: {len(results)} measurements", file=sys.stderr)
+
+    report = json.dumps({"environment": harness.environment(), "runs": runs}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:  # noqa: PTH123
+            output.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
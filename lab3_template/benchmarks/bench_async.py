@@ -0,0 +1,95 @@
+"""Compare the wall clock time of the enrollment report run sequentially and concurrently.
+
+Each query of ``related_objects.reports.enrollment_report_queries`` is timed alone, then the
+whole report is timed with a concurrency of 1 and of ``len(queries)``. A concurrent report
+should take about as long as its slowest query.
+"""
+
+import asyncio
+import itertools
+from collections.abc import Callable, Iterator, Mapping
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from related_objects.reports import Query, enrollment_report_queries, gather_queries
+from related_objects.synthetic import SyntheticDataset
+
+from benchmarks.harness import measure
+
+
+def _counted(query: Query, statements: Iterator[int]) -> Query:
+    """Wrap ``query`` to count the SQL statements it issues.
+
+    ``gather_queries`` runs the query on a worker thread, through ``async_to_sync``. Its async
+    ORM calls, like the ``sync_to_async`` calls here, run on that worker thread, so the wrapper
+    is added to and removed from that thread's connection.
+
+    """
+
+    def count(execute: Callable, *args: object) -> object:
+        next(statements)
+        return execute(*args)
+
+    def add() -> None:
+        connections["default"].execute_wrappers.append(count)
+
+    def remove() -> None:
+        connections["default"].execute_wrappers.remove(count)
+
+    async def counted() -> object:
+        await sync_to_async(add)()
+        try:
+            return await query()
+        finally:
+            await sync_to_async(remove)()
+
+    return counted
+
+
+def _count_statements(queries: Mapping[str, Query], concurrency: int) -> int:
+    """Run the queries once, untimed.
+
+    Returns:
+        int: The number of SQL statements the queries issued on their worker threads.
+
+    """
+    statements = itertools.count()
+    counted = {name: _counted(query, statements) for name, query in queries.items()}
+    asyncio.run(gather_queries(counted, concurrency=concurrency))
+    return next(statements)
+
+
+def run(dataset: SyntheticDataset, *, repeat: int) -> list[dict]:  # noqa: ARG001
+    """Time every report query alone, then the report sequentially and concurrently.
+
+    Returns:
+        list[dict]: One timing summary per query and per report concurrency.
+
+    """
+    queries = enrollment_report_queries()
+    results = []
+    for name, query in queries.items():
+        # measure() counts the statements of its own thread only, the queries run on others
+        result = measure(
+            name,
+            lambda query=query: asyncio.run(gather_queries({"query": query})),
+            repeat=repeat,
+            kind="single_query",
+        )
+        result["queries"] = _count_statements({"query": query}, 1)
+        results.append(result)
+    slowest_ms = max(result["median_ms"] for result in results)
+    for concurrency in (1, len(queries)):
+        report = measure(
+            f"enrollment_report_concurrency_{concurrency}",
+            lambda concurrency=concurrency: asyncio.run(
+                gather_queries(queries, concurrency=concurrency),
+            ),
+            repeat=repeat,
+            kind="report",
+            concurrency=concurrency,
+        )
+        report["queries"] = _count_statements(queries, concurrency)
+        report["slowest_query_ratio"] = report["median_ms"] / slowest_ms
+        results.append(report)
+    return results
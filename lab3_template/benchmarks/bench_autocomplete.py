@@ -0,0 +1,43 @@
+"""Compare the in-memory name snapshot with the indexed ``LIKE 'prefix%'`` database lookup.
+
+Both return the ids of the first ten learners whose name starts with a prefix. The snapshot is
+loaded before timing starts, its load time is reported as an entry of its own.
+"""
+
+from related_objects.autocomplete import NameIndex, complete_from_db
+from related_objects.models import Learner
+from related_objects.synthetic import SyntheticDataset
+
+from benchmarks.harness import measure, timed
+
+# A short prefix matching many learners, a longer one and a first and last name prefix.
+PREFIXES = ("J", "Her", "Mary S")
+
+
+def run(dataset: SyntheticDataset, *, repeat: int) -> list[dict]:  # noqa: ARG001
+    """Time the snapshot load and both lookups of every prefix.
+
+    Returns:
+        list[dict]: The load time and two timing summaries per prefix.
+
+    """
+    index = NameIndex(Learner)
+    results = [{"name": "snapshot_load", "load_ms": timed(index.load) * 1000, "size": len(index)}]
+    for prefix in PREFIXES:
+        results += [
+            measure(
+                f"memory_{prefix}",
+                lambda prefix=prefix: index.complete(prefix),
+                repeat=repeat,
+                backend="memory",
+                prefix=prefix,
+            ),
+            measure(
+                f"database_{prefix}",
+                lambda prefix=prefix: complete_from_db(prefix, Learner),
+                repeat=repeat,
+                backend="database",
+                prefix=prefix,
+            ),
+        ]
+    return results
@@ -0,0 +1,81 @@
+"""Measure the export throughput, in rows per second, and its peak memory.
+
+Every export is written to a sink that only counts characters, so the numbers cover fetching
+and encoding the rows rather than disk speed. The ``instances`` baseline loads the enrollments
+as model instances and prints their ``__str__``, the way the lab read scripts do. Run it at the
+scale the exporter is built for, e.g. ``python -m benchmarks export --enrollments 1000000``.
+"""
+
+import io
+import tracemalloc
+from collections.abc import Callable
+
+from related_objects.export import EXPORTS, FORMATS, export
+from related_objects.models import Enrollment
+from related_objects.synthetic import SyntheticDataset
+
+from benchmarks.harness import measure
+
+
+class CountingSink(io.TextIOBase):
+    """Discard everything written, keeping only the number of characters."""
+
+    def __init__(self) -> None:
+        """Start with nothing written."""
+        self.characters = 0
+
+    def write(self, text: str) -> int:
+        """Count ``text`` and drop it.
+
+        Returns:
+            int: The number of characters written.
+
+        """
+        self.characters += len(text)
+        return len(text)
+
+
+def _instances() -> int:
+    sink = CountingSink()
+    enrollments = list(Enrollment.objects.select_related("learner", "course").order_by("pk"))
+    for enrollment in enrollments:
+        sink.write(f"{enrollment} {enrollment.learner} {enrollment.course}\n")
+    return len(enrollments)
+
+
+def _peak_kib(func: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _measure(name: str, func: Callable[[], int], *, repeat: int, **extra: object) -> dict:
+    rows = func()
+    result = measure(name, func, repeat=repeat, rows=rows, peak_kib=_peak_kib(func), **extra)
+    result["rows_per_sec"] = rows / (result["median_ms"] / 1000) if result["median_ms"] else None
+    return result
+
+
+def run(dataset: SyntheticDataset, *, repeat: int) -> list[dict]:  # noqa: ARG001
+    """Time every export in every format, and the instance loading baseline.
+
+    Returns:
+        list[dict]: One timing summary per export and format, with rows/s and peak memory.
+
+    """
+    results = [
+        _measure(
+            f"{name}_{fmt}",
+            lambda name=name, fmt=fmt: export(name, CountingSink(), fmt=fmt),
+            repeat=repeat,
+            export=name,
+            format=fmt,
+        )
+        for name in EXPORTS
+        for fmt in FORMATS
+    ]
+    results.append(_measure("enrollments_instances", _instances, repeat=repeat))
+    return results
@@ -0,0 +1,101 @@
+"""Compare query plans and timings of the hot lookups without and with the lookup indexes.
+
+Every index declared in the related_objects models, plus the trigram index of
+``0002_hot_lookup_indexes``, is dropped. Every lookup is explained and timed, then the indexes
+are created again and the lookups are measured a second time. Run it at
+the scale the indexes are meant for, e.g. ``python -m benchmarks indexes --enrollments 1000000``.
+"""
+
+import importlib
+from collections.abc import Callable
+from datetime import date
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import QuerySet
+from related_objects.models import Course, Enrollment, Instructor, Learner
+from related_objects.synthetic import SyntheticDataset
+
+from benchmarks.harness import measure
+
+MIGRATION = importlib.import_module("related_objects.migrations.0002_hot_lookup_indexes")
+INDEXES = [
+    (model, index)
+    for model in apps.get_app_config("related_objects").get_models()
+    for index in model._meta.indexes  # noqa: SLF001
+]
+
+LOOKUPS: list[tuple[str, Callable[[], QuerySet]]] = [
+    ("instructor_by_first_name", lambda: Instructor.objects.filter(first_name="Yan")),
+    (
+        "instructor_first_name_prefix",
+        lambda: Instructor.objects.filter(first_name__startswith="Y"),
+    ),
+    ("learners_by_last_name", lambda: Learner.objects.filter(last_name="Smith")),
+    ("youngest_learners", lambda: Learner.objects.order_by("-dob")[:2]),
+    (
+        "learners_keyset_page",
+        lambda: Learner.objects.filter(dob__gte=date(1980, 1, 1)).order_by("dob", "id")[:20],
+    ),
+    ("learners_by_occupation", lambda: Learner.objects.filter(occupation=Learner.DATABASE_ADMIN)),
+    ("course_name_contains", lambda: Course.objects.filter(name__contains="Cloud")),
+    (
+        "course_enrollments_in_month",
+        lambda: Enrollment.objects.filter(
+            course_id=1,
+            date_enrolled__gte=date(2020, 8, 1),
+            date_enrolled__lt=date(2020, 9, 1),
+        ),
+    ),
+    (
+        "enrollments_in_month",
+        lambda: Enrollment.objects.filter(
+            date_enrolled__gte=date(2020, 8, 1),
+            date_enrolled__lt=date(2020, 9, 1),
+        ),
+    ),
+]
+
+
+def _set_indexes(*, enabled: bool) -> None:
+    """Create or drop every index of the hot lookup migration, then refresh the statistics."""
+    with connection.schema_editor() as editor:
+        for model, index in INDEXES:
+            if enabled:
+                editor.add_index(model, index)
+            else:
+                editor.remove_index(model, index)
+        if enabled:
+            MIGRATION.create_course_name_trigram_index(None, editor)
+        else:
+            MIGRATION.drop_course_name_trigram_index(None, editor)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def _measure_lookups(phase: str, repeat: int) -> list[dict]:
+    return [
+        measure(
+            name,
+            lambda lookup=lookup: list(lookup()),
+            repeat=repeat,
+            phase=phase,
+            plan=lookup().explain(),
+        )
+        for name, lookup in LOOKUPS
+    ]
+
+
+def run(dataset: SyntheticDataset, *, repeat: int) -> list[dict]:  # noqa: ARG001
+    """Measure every lookup without the indexes and again with them.
+
+    Returns:
+        list[dict]: Two timing summaries per lookup, each with the query plan used.
+
+    """
+    _set_indexes(enabled=False)
+    try:
+        results = _measure_lookups("without_indexes", repeat)
+    finally:
+        _set_indexes(enabled=True)
+    return results + _measure_lookups("with_indexes", repeat)
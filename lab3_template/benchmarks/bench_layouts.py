@@ -0,0 +1,91 @@
+"""Compare the multi-table and the single-table layout of the user hierarchy.
+
+The loaded users are copied into ``Person`` first, so both layouts hold the same people. Every
+read is timed against ``Instructor``/``Learner``, which join ``related_objects_user``, and
+against the ``InstructorPerson``/``LearnerPerson`` proxies, which read one table. The write
+inserts ``WRITE_ROWS`` learners with ``bulk_load``, two tables and their indexes for the
+multi-table layout, one for the single table, and rolls the insert back after every run.
+"""
+
+from collections.abc import Callable
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Model
+from related_objects.models import Instructor, Learner
+from related_objects.people import InstructorPerson, LearnerPerson, copy_people
+from related_objects.seeding import bulk_load
+from related_objects.synthetic import SyntheticDataset
+
+from benchmarks.harness import measure
+
+READ_ROWS = 1000
+WRITE_ROWS = 1000
+LAYOUTS = {
+    "multi_table": (Instructor, Learner),
+    "single_table": (InstructorPerson, LearnerPerson),
+}
+
+READS: list[tuple[str, Callable[[type[Model], type[Model]], object]]] = [
+    (
+        "instructor_by_first_name",
+        lambda instructors, _: list(instructors.objects.filter(first_name="Yan")),
+    ),
+    (
+        "learners_by_occupation",
+        lambda _, learners: list(learners.objects.filter(occupation=Learner.DATABASE_ADMIN)),
+    ),
+    (
+        "learners_in_id_order",
+        lambda _, learners: list(learners.objects.order_by("pk")[:READ_ROWS]),
+    ),
+]
+
+
+def _insert_learners(learners: type[Model]) -> None:
+    """Insert ``WRITE_ROWS`` learners and roll them back."""
+    objs = (
+        learners(
+            first_name="Bench",
+            last_name=str(number),
+            dob=date(1990, 1, 1),
+            occupation=Learner.STUDENT,
+            social_link="https://www.example.com/",
+        )
+        for number in range(WRITE_ROWS)
+    )
+    with transaction.atomic():
+        bulk_load(learners, objs)
+        transaction.set_rollback(True)
+
+
+def run(dataset: SyntheticDataset, *, repeat: int) -> list[dict]:  # noqa: ARG001
+    """Time every read and the learner insert in both layouts.
+
+    Returns:
+        list[dict]: Two timing summaries per read and for the insert, one per layout.
+
+    """
+    copy_people()
+    results = []
+    for name, read in READS:
+        results += [
+            measure(
+                f"{name}_{layout}",
+                lambda models=models, read=read: read(*models),
+                repeat=repeat,
+                layout=layout,
+            )
+            for layout, models in LAYOUTS.items()
+        ]
+    results += [
+        measure(
+            f"insert_learners_{layout}",
+            lambda learners=learners: _insert_learners(learners),
+            repeat=repeat,
+            layout=layout,
+            rows=WRITE_ROWS,
+        )
+        for layout, (_, learners) in LAYOUTS.items()
+    ]
+    return results
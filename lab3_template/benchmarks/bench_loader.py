@@ -0,0 +1,61 @@
+"""Compare the serial loader with the COPY loader and the parallel one at several worker counts.
+
+Each loader replaces the whole dataset, so every measurement is a single timed run. The rows/s
+and speedup over the serial loader are reported for every worker count. Speedups close to the
+worker count need PostgreSQL, on SQLite the writes are serialized.
+"""
+
+import os
+from collections.abc import Callable
+
+from related_objects import synthetic
+from related_objects.models import Enrollment
+from related_objects.parallel import load_parallel
+
+from benchmarks.harness import timed
+
+
+def _timed_load(name: str, workers: int, load: Callable[[], object]) -> dict:
+    """Time one load and count the enrollments it left in the table.
+
+    Returns:
+        dict: The load time and the rows/s of the enrollments actually loaded.
+
+    """
+    seconds = timed(load)
+    rows = Enrollment.objects.count()
+    return {
+        "name": name,
+        "workers": workers,
+        "seconds": seconds,
+        "rows": rows,
+        "rows_per_sec": rows / seconds,
+    }
+
+
+def run(dataset: synthetic.SyntheticDataset, *, repeat: int) -> list[dict]:  # noqa: ARG001
+    """Time the serial and COPY loaders, then the parallel one with 1, 2, 4... workers.
+
+    Returns:
+        list[dict]: The load time, rows loaded, rows/s and speedup of every loader
+        configuration.
+
+    """
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, cpus, *(2**power for power in range(1, cpus.bit_length()))})
+    results = [
+        _timed_load("serial", 0, lambda: synthetic.load(dataset)),
+        _timed_load("copy", 0, lambda: synthetic.load(dataset, use_copy=True)),
+    ]
+    results += [
+        _timed_load(
+            f"parallel_{workers}",
+            workers,
+            lambda workers=workers: load_parallel(dataset, workers=workers),
+        )
+        for workers in worker_counts
+    ]
+    serial_seconds = results[0]["seconds"]
+    for result in results:
+        result["speedup"] = serial_seconds / result["seconds"]
+    return results
@@ -0,0 +1,49 @@
+"""Compare OFFSET and keyset pagination of the learners at increasing page depths.
+
+Both read the same page of ``page_size`` learners in ``(dob, id)`` order. The OFFSET query gets
+slower with every page it skips, the keyset page should take the same time at page 10,000 as at
+page 1. Page 10,000 needs 200,000 learners, e.g. ``--enrollments 800000``, shallower datasets
+stop at their last page.
+"""
+
+from related_objects.models import Learner
+from related_objects.pagination import BY_DOB, KeysetPaginator
+from related_objects.synthetic import SyntheticDataset
+
+from benchmarks.harness import measure
+
+PAGE_SIZE = 20
+PAGES = (1, 10, 100, 1000, 10000)
+
+
+def run(dataset: SyntheticDataset, *, repeat: int) -> list[dict]:
+    """Time the OFFSET and the keyset query of every page depth the dataset has.
+
+    Returns:
+        list[dict]: Two timing summaries per page depth.
+
+    """
+    ordered = Learner.objects.filter(dob__isnull=False).order_by(*BY_DOB)
+    paginator = KeysetPaginator(Learner.objects.all(), BY_DOB, PAGE_SIZE)
+    results = []
+    for page in (page for page in PAGES if (page - 1) * PAGE_SIZE < dataset.learners):
+        offset = (page - 1) * PAGE_SIZE
+        # The cursor a client would hold after reading the previous page.
+        cursor = paginator.cursor_for(ordered[offset - 1]) if offset else None
+        results += [
+            measure(
+                f"offset_page_{page}",
+                lambda offset=offset: list(ordered[offset : offset + PAGE_SIZE]),
+                repeat=repeat,
+                method="offset",
+                page=page,
+            ),
+            measure(
+                f"keyset_page_{page}",
+                lambda cursor=cursor: paginator.page(cursor),
+                repeat=repeat,
+                method="keyset",
+                page=page,
+            ),
+        ]
+    return results
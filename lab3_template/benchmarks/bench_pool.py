@@ -0,0 +1,84 @@
+"""Measure the connect overhead of many short-lived ORM operations run concurrently.
+
+Every operation fetches one learner and closes its connection, as a request does when
+``CONN_MAX_AGE`` is 0. On the ``default`` alias each operation opens a new connection. On the
+``pooled`` alias, the ``dbpool`` backend hands back a connection a finished operation returned.
+Set ``BENCH_POOL_MAX_SIZE`` to change the pool size.
+"""
+
+import itertools
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from related_objects.models import Learner
+from related_objects.synthetic import SyntheticDataset
+
+from benchmarks.harness import measure
+
+THREADS = 8
+OPERATIONS_PER_THREAD = 50
+
+
+def _operations(
+    alias: str,
+    dataset: SyntheticDataset,
+    thread: int,
+    statements: Iterator[int],
+) -> None:
+    def count(execute: Callable, *args: object) -> object:
+        next(statements)
+        return execute(*args)
+
+    # The wrapper stays on this thread's connection object across close() and reconnects
+    with connections[alias].execute_wrapper(count):
+        for operation in range(OPERATIONS_PER_THREAD):
+            index = (thread * OPERATIONS_PER_THREAD + operation) % dataset.learners
+            Learner.objects.using(alias).filter(pk=dataset.learner_id(index)).first()
+            connections[alias].close()
+
+
+def _run_concurrently(alias: str, dataset: SyntheticDataset) -> int:
+    """Run the operations on ``THREADS`` threads.
+
+    Returns:
+        int: The number of SQL statements the threads issued.
+
+    """
+    statements = itertools.count()
+    with ThreadPoolExecutor(THREADS) as executor:
+        for future in [
+            executor.submit(_operations, alias, dataset, thread, statements)
+            for thread in range(THREADS)
+        ]:
+            future.result()
+    return next(statements)
+
+
+def run(dataset: SyntheticDataset, *, repeat: int) -> list[dict]:
+    """Run the concurrent operations without and with the pool.
+
+    Returns:
+        list[dict]: A timing summary per alias with operations/s, plus the pool metrics.
+
+    """
+    operations = THREADS * OPERATIONS_PER_THREAD
+    results = []
+    for alias in ("default", "pooled"):
+        # measure() counts the statements of its own thread only, the operations run on others
+        queries = _run_concurrently(alias, dataset)
+        result = measure(
+            f"short_lived_operations_{alias}",
+            lambda alias=alias: _run_concurrently(alias, dataset),
+            repeat=repeat,
+            alias=alias,
+            engine=connections[alias].settings_dict["ENGINE"],
+            threads=THREADS,
+            operations=operations,
+        )
+        result["queries"] = queries
+        result["operations_per_sec"] = operations / (result["median_ms"] / 1000)
+        results.append(result)
+    results.append({"name": "pool", **connections["pooled"].pool.stats()})
+    connections["pooled"].pool.closeall()
+    return results
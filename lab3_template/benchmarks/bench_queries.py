@@ -0,0 +1,184 @@
+"""Time every query pattern of the lab read scripts on a synthetic dataset.
+
+The patterns mirror ``read_instructors.py``, ``read_learners.py`` and ``read_courses.py`` from
+lab2, run against the related_objects models, plus ``read_course_instructors.py`` and
+``read_enrollments.py`` from this lab. Loops that touch related objects are kept as written in
+the scripts, so N+1 patterns show up in the query counts.
+"""
+
+from collections.abc import Callable
+from contextlib import suppress
+
+from related_objects.models import (
+    Course,
+    Enrollment,
+    EnrollmentMonthlyRollup,
+    Instructor,
+    Learner,
+    User,
+)
+from related_objects.staffing import staffing_cache
+from related_objects.synthetic import SyntheticDataset
+
+from benchmarks.harness import measure
+
+
+def _missing_instructor() -> None:
+    with suppress(Instructor.DoesNotExist):
+        Instructor.objects.get(first_name="Andy")
+
+
+def _occupations_per_course() -> set[str]:
+    return {
+        learner.occupation
+        for course in Course.objects.filter(instructors__first_name="Yan")
+        for learner in course.learners.all()
+    }
+
+
+def _developer_courses_in_aug_2020() -> set[str]:
+    enrollments = Enrollment.objects.filter(
+        date_enrolled__month=8,
+        date_enrolled__year=2020,
+        learner__occupation="developer",
+    )
+    return {enrollment.course.name for enrollment in enrollments}
+
+
+def _developer_courses_in_month_range() -> set[str]:
+    enrollments = Enrollment.objects.in_month(2020, 8).filter(learner__occupation="developer")
+    return set(enrollments.values_list("course__name", flat=True).distinct())
+
+
+def _staffing_patterns(dataset: SyntheticDataset) -> list[tuple[str, str, Callable[[], object]]]:
+    """Return the staffing lookups of a course or instructor whose primary key is known.
+
+    Each runs once through the join table and once through ``staffing_cache``. The cache is
+    filled here, so the cached patterns are counted and timed as the hits they are meant to be.
+
+    """
+    yan, cloud = dataset.instructor_id(0), dataset.course_id(1)
+    staffing_cache.course_ids_of(yan)
+    staffing_cache.instructor_ids_of(cloud)
+    return [
+        (
+            "read_course_instructors.py",
+            "courses_of_instructor_pk",
+            lambda: list(Course.objects.filter(instructors=yan)),
+        ),
+        (
+            "read_course_instructors.py",
+            "courses_of_instructor_pk_cached",
+            lambda: list(Course.objects.filter(pk__in=staffing_cache.course_ids_of(yan))),
+        ),
+        (
+            "read_course_instructors.py",
+            "instructors_of_course_pk",
+            lambda: list(Instructor.objects.filter(course=cloud)),
+        ),
+        (
+            "read_course_instructors.py",
+            "instructors_of_course_pk_cached",
+            lambda: list(
+                Instructor.objects.filter(pk__in=staffing_cache.instructor_ids_of(cloud)),
+            ),
+        ),
+    ]
+
+
+PATTERNS: list[tuple[str, str, Callable[[], object]]] = [
+    ("read_instructors.py", "get_by_first_name", lambda: Instructor.objects.get(first_name="Yan")),
+    ("read_instructors.py", "get_missing", _missing_instructor),
+    (
+        "read_instructors.py",
+        "part_time",
+        lambda: list(Instructor.objects.filter(full_time=False)),
+    ),
+    (
+        "read_instructors.py",
+        "exclude_filter_chain",
+        lambda: list(
+            Instructor.objects.exclude(full_time=False)
+            .filter(total_learners__gt=30000)
+            .filter(first_name__startswith="Y"),
+        ),
+    ),
+    (
+        "read_instructors.py",
+        "single_filter",
+        lambda: list(
+            Instructor.objects.filter(
+                full_time=True,
+                total_learners__gt=30000,
+                first_name__startswith="Y",
+            ),
+        ),
+    ),
+    ("read_learners.py", "by_last_name", lambda: list(Learner.objects.filter(last_name="Smith"))),
+    ("read_learners.py", "youngest_two", lambda: list(Learner.objects.order_by("-dob")[0:2])),
+    ("read_courses.py", "all_courses", lambda: list(Course.objects.all())),
+    (
+        "read_course_instructors.py",
+        "courses_forward",
+        lambda: list(Course.objects.filter(instructors__first_name="Yan")),
+    ),
+    (
+        "read_course_instructors.py",
+        "courses_backward",
+        lambda: list(Instructor.objects.get(first_name="Yan").course_set.all()),
+    ),
+    (
+        "read_course_instructors.py",
+        "instructors_of_course",
+        lambda: list(Instructor.objects.filter(course__name__contains="Cloud")),
+    ),
+    ("read_course_instructors.py", "occupations_per_course", _occupations_per_course),
+    (
+        "read_course_instructors.py",
+        "occupations_single_query",
+        lambda: set(Course.objects.taught_by("Yan").learner_occupations()),
+    ),
+    (
+        "read_enrollments.py",
+        "learner_to_user",
+        lambda: Learner.objects.get(first_name="David").user_ptr,
+    ),
+    (
+        "read_enrollments.py",
+        "user_to_learner",
+        lambda: User.objects.get(first_name="David").learner,
+    ),
+    (
+        "read_enrollments.py",
+        "user_to_learner_joined",
+        lambda: User.objects.select_subclasses().get(first_name="David"),
+    ),
+    (
+        "read_enrollments.py",
+        "course_learners",
+        lambda: list(Course.objects.get(name="Introduction to Python").learners.all()),
+    ),
+    ("read_enrollments.py", "developer_courses_in_month", _developer_courses_in_aug_2020),
+    ("read_enrollments.py", "developer_courses_in_month_range", _developer_courses_in_month_range),
+    (
+        "read_enrollments.py",
+        "developer_courses_from_rollup",
+        lambda: set(EnrollmentMonthlyRollup.objects.course_names(2020, 8, Learner.DEVELOPER)),
+    ),
+]
+
+
+def run(dataset: SyntheticDataset, *, repeat: int) -> list[dict]:
+    """Time every pattern on the loaded dataset.
+
+    Returns:
+        list[dict]: One timing summary per query pattern, then the staffing cache counters.
+
+    """
+    staffing_cache.clear()
+    results = [
+        measure(name, func, repeat=repeat, script=script)
+        for script, name, func in [*PATTERNS, *_staffing_patterns(dataset)]
+    ]
+    results.append({"name": "staffing_cache", **staffing_cache.stats()})
+    return results
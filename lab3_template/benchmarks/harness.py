@@ -0,0 +1,105 @@
+"""Shared helpers for the benchmark suites."""
+
+import os
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import django
+
+
+def setup(database: str) -> None:
+    """Configure Django with the benchmark settings and bring the schema up to date."""
+    os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+    os.environ["BENCH_DATABASE"] = database
+    django.setup()
+
+    from django.core.management import call_command  # noqa: PLC0415
+
+    call_command("migrate", verbosity=0)
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    *,
+    repeat: int,
+    **extra: Any,  # noqa: ANN401
+) -> dict:
+    """Run ``func`` ``repeat`` times and summarise the wall clock timings.
+
+    One untimed call warms caches first and counts the SQL statements ``func`` issues. Extra
+    keyword arguments are copied into the result.
+
+    Returns:
+        dict: The timing summary, in milliseconds, with the query count.
+
+    """
+    from django.db import connection  # noqa: PLC0415
+    from django.test.utils import CaptureQueriesContext  # noqa: PLC0415
+
+    with CaptureQueriesContext(connection) as captured:
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "name": name,
+        **extra,
+        "repeat": repeat,
+        "queries": len(captured),
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "max_ms": max(timings),
+    }
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """Return the seconds one call of ``func`` takes."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def git_commit() -> str | None:
+    """Return the commit the benchmarks run on, or ``None`` outside a git checkout."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def environment() -> dict:
+    """Describe the machine, database and code version the results were produced with.
+
+    Returns:
+        dict: Metadata stored next to every result set so runs can be compared.
+
+    """
+    from django.db import connection  # noqa: PLC0415
+
+    connection.ensure_connection()
+    return {
+        "timestamp": datetime.now(tz=UTC).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "platform": platform.platform(),
+        "database": connection.vendor,
+        "database_version": ".".join(map(str, connection.get_database_version())),
+    }
@@ -0,0 +1,46 @@
+"""Settings for the benchmark suite.
+
+SQLite is used by default, so the suite runs without a database server. Set
+``BENCH_DATABASE=postgresql`` to run against the PostgreSQL server configured in ``.env``.
+The ``pooled`` alias points at the same database through the pooled ``dbpool`` backend.
+"""
+
+import os
+from pathlib import Path
+
+import bootstrap
+
+# Imports python-dotenv only when there is a .env file to read
+bootstrap.load_env()
+
+if os.getenv("BENCH_DATABASE", "sqlite") == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql_psycopg2",
+            "NAME": os.getenv("POSTGRES_DB"),
+            "USER": os.getenv("POSTGRES_USER"),
+            "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
+            "HOST": os.getenv("POSTGRES_HOST"),
+            "PORT": os.getenv("POSTGRES_PORT"),
+        },
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("BENCH_SQLITE_NAME", str(Path(__file__).with_name("bench.sqlite3"))),
+        },
+    }
+
+# The same database through the pooled backend, for the "pool" suite.
+DATABASES["pooled"] = {
+    **DATABASES["default"],
+    "ENGINE": "dbpool.postgresql"
+    if DATABASES["default"]["ENGINE"].endswith("postgresql_psycopg2")
+    else "dbpool.sqlite3",
+    "POOL": {"MAX_SIZE": int(os.getenv("BENCH_POOL_MAX_SIZE", "4"))},
+}
+
+INSTALLED_APPS = ("related_objects",)
+
+SECRET_KEY = os.getenv("SECRET_KEY", "benchmarks")
@@ -0,0 +1,158 @@
+"""Lightweight Django startup for the lab scripts.
+
+The scripts only use the ORM. ``get_wsgi_application()`` configures Django and then builds a
+WSGI request handler, loading its middleware, which a script never calls. ``setup()`` does only
+the first part: it defaults ``DJANGO_SETTINGS_MODULE`` to ``settings`` and runs
+``django.setup()``, which reads the settings and imports the installed apps. The script imports
+the models it uses afterwards::
+
+    import bootstrap
+
+    bootstrap.setup()
+
+    from related_objects.models import Course
+
+``load_env()`` reads the ``.env`` file for ``settings.py``. python-dotenv is only imported when
+there is a file to read, so environments that set the variables directly never load it.
+
+Run the module to see where the startup time of a script goes. The script is run once under
+``python -X importtime`` to list the imports that took the longest themselves, then timed over
+``--repeat`` more runs, side effects included. Without a script, the bare ``setup()`` is measured::
+
+    python bootstrap.py
+    python bootstrap.py read_enrollments.py
+    python bootstrap.py --top 20 --repeat 10 --json read_course_instructors.py
+"""
+
+# ruff: noqa: T201
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import django
+from django.apps import apps
+
+HERE = Path(__file__).resolve().parent
+SETUP_ONLY = ["-c", "import bootstrap; bootstrap.setup()"]
+# "import time: <self us> | <cumulative us> | <indented module name>", as -X importtime writes
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (.*)$", re.MULTILINE)
+
+
+def load_env(start: Path = HERE) -> bool:
+    """Load the nearest ``.env`` file at or above ``start``, variables already set win.
+
+    Returns:
+        bool: Whether a ``.env`` file was found and loaded.
+
+    """
+    for directory in (start, *start.parents):
+        path = directory / ".env"
+        if path.is_file():
+            from dotenv import load_dotenv  # noqa: PLC0415
+
+            return load_dotenv(path)
+    return False
+
+
+def setup(settings_module: str = "settings") -> None:
+    """Configure Django and load the installed apps, enough to use the ORM.
+
+    Later calls in the same process return at once, so scripts run one after the other by
+    ``main.py`` share the first setup.
+
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    if not apps.ready:
+        django.setup(set_prefix=False)
+
+
+def import_times(command: list[str]) -> list[tuple[int, int, str]]:
+    """Run ``python -X importtime`` with ``command`` and parse the timings it reports.
+
+    Returns:
+        list[tuple[int, int, str]]: The self and cumulative microseconds and the indented name
+        of every module imported, in the order they finished.
+
+    """
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", *command],
+        cwd=HERE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return [
+        (int(self_us), int(cumulative_us), name)
+        for self_us, cumulative_us, name in IMPORT_TIME.findall(completed.stderr)
+    ]
+
+
+def wall_times(command: list[str], repeat: int) -> list[float]:
+    """Run ``python`` with ``command`` ``repeat`` times.
+
+    Returns:
+        list[float]: The wall clock time of every run, in milliseconds.
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(  # noqa: S603
+            [sys.executable, *command],
+            cwd=HERE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Report the import time profile and the wall time of a script's startup."""
+    parser = argparse.ArgumentParser(prog="python bootstrap.py", description=__doc__)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("script", nargs="?", help="script to run, the bare setup() if omitted")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments of the script")
+    args = parser.parse_args(argv)
+
+    command = [args.script, *args.args] if args.script else SETUP_ONLY
+    imports = import_times(command)
+    timings = wall_times(command, args.repeat)
+    slowest = sorted(imports, key=lambda entry: entry[0], reverse=True)[: args.top]
+    report = {
+        "command": args.script or "setup()",
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "modules": len(imports),
+        "import_ms": sum(self_us for self_us, _, _ in imports) / 1000,
+        "slowest": [
+            {"module": name.strip(), "self_ms": self_us / 1000, "cumulative_ms": total_us / 1000}
+            for self_us, total_us, name in slowest
+        ],
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(
+        f"{report['command']}: median {report['median_ms']:.1f} ms, "
+        f"min {report['min_ms']:.1f} ms over {args.repeat} runs, "
+        f"{report['import_ms']:.1f} ms importing {report['modules']} modules",
+    )
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for self_us, total_us, name in slowest:
+        print(f"{self_us / 1000:9.1f} {total_us / 1000:9.1f}  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
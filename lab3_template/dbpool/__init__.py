@@ -0,0 +1,10 @@
+"""Pooled database backends.
+
+Set ``ENGINE`` to ``dbpool.postgresql`` or ``dbpool.sqlite3`` to share connections between
+threads and requests of one process, see ``dbpool.backend`` for the ``POOL`` options.
+"""
+
+from .backend import close_pools, pool_stats
+from .pool import ConnectionPool, PoolTimeoutError
+
+__all__ = ["ConnectionPool", "PoolTimeoutError", "close_pools", "pool_stats"]
@@ -0,0 +1,92 @@
+"""Pooling for Django database wrappers.
+
+``PooledDatabaseWrapperMixin`` checks connections out of a process-wide ``ConnectionPool``
+instead of opening them, and gives them back instead of closing them. One pool is shared by
+every thread's wrapper for the same database, configured by the ``POOL`` key of the
+``DATABASES`` entry::
+
+    "POOL": {"MIN_SIZE": 1, "MAX_SIZE": 10, "TIMEOUT": 30, "MAX_IDLE": 300, "CHECK_IDLE": 30}
+
+"""
+
+import abc
+import functools
+import threading
+from typing import Any
+
+from django.db import connections
+
+from .pool import Connection, ConnectionPool
+
+_pools: dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(settings_dict: dict[str, Any]) -> tuple:
+    """Identify the database a wrapper connects to, test databases get their own pool."""
+    return tuple(settings_dict.get(key) for key in ("ENGINE", "NAME", "HOST", "PORT", "USER"))
+
+
+def close_pools(name: str | None = None) -> None:
+    """Close the idle connections of every pool, or of the pools for database ``name``."""
+    with _pools_lock:
+        pools = [pool for key, pool in _pools.items() if name is None or key[1] == name]
+    for pool in pools:
+        pool.closeall()
+
+
+def pool_stats(alias: str = "default") -> dict[str, float]:
+    """Return the metrics of the pool behind database ``alias``.
+
+    Returns:
+        dict[str, float]: The pool size, checkout counters and wait times.
+
+    """
+    return connections[alias].pool.stats()
+
+
+class PooledDatabaseWrapperMixin(abc.ABC):
+    """Take connections from the pool and return them on close.
+
+    Subclasses provide ``pool_check`` and ``pool_reset`` as static methods, see
+    ``ConnectionPool`` for what they must do.
+
+    """
+
+    @staticmethod
+    @abc.abstractmethod
+    def pool_check(connection: Connection) -> bool:
+        """Return whether an idle connection still works."""
+
+    @staticmethod
+    @abc.abstractmethod
+    def pool_reset(connection: Connection) -> bool:
+        """End any open transaction, return ``False`` when the connection is broken."""
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Return the pool of this wrapper's database, creating it on first use."""
+        key = _pool_key(self.settings_dict)
+        with _pools_lock:
+            if key not in _pools:
+                options = self.settings_dict.get("POOL", {})
+                _pools[key] = ConnectionPool(
+                    min_size=options.get("MIN_SIZE", 0),
+                    max_size=options.get("MAX_SIZE", 10),
+                    timeout=options.get("TIMEOUT", 30.0),
+                    max_idle=options.get("MAX_IDLE", 300.0),
+                    check_idle=options.get("CHECK_IDLE", 30.0),
+                    check=self.pool_check,
+                    reset=self.pool_reset,
+                )
+            return _pools[key]
+
+    def get_new_connection(self, conn_params: dict[str, Any]) -> Connection:
+        """Check a connection out of the pool, opening one only when none is idle."""
+        return self.pool.getconn(functools.partial(super().get_new_connection, conn_params))
+
+    def _close(self) -> None:
+        """Give the connection back to the pool instead of closing it."""
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
@@ -0,0 +1,178 @@
+"""A thread-safe, bounded pool of DB-API connections.
+
+The pool keeps the reset rules of ``psycopg2.pool``: a returned connection is rolled back when a
+transaction is still open, and closed when it is broken. Unlike ``psycopg2.pool``, which raises
+``PoolError`` as soon as ``maxconn`` connections are out, a checkout waits up to ``timeout``
+seconds for a connection to come back. The time spent waiting is recorded in the pool metrics.
+"""
+
+import contextlib
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+# DB-API connections have no common base class.
+Connection = Any
+
+
+class PoolTimeoutError(Exception):
+    """No connection became available within the pool timeout."""
+
+
+class ConnectionPool:
+    """Hand out at most ``max_size`` connections and keep the returned ones open for reuse.
+
+    ``check(connection)`` is called before reusing a connection that has been idle for more
+    than ``check_idle`` seconds, and a connection failing it is replaced by a new one.
+    ``reset(connection)`` is called on every returned connection and must bring it back to an
+    idle state, or return ``False`` when the connection is unusable. Idle connections above
+    ``min_size`` are closed after ``max_idle`` seconds.
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        min_size: int = 0,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_idle: float = 300.0,
+        check_idle: float = 30.0,
+        check: Callable[[Connection], bool] | None = None,
+        reset: Callable[[Connection], bool] | None = None,
+    ) -> None:
+        """Create an empty pool, connections are opened on demand."""
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_idle = check_idle
+        self.check = check
+        self.reset = reset
+        # (connection, monotonic time it was returned), the most recently returned last.
+        self._idle: deque[tuple[Connection, float]] = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+        self.checkouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def getconn(self, connect: Callable[[], Connection]) -> Connection:
+        """Return an idle connection, or one opened with ``connect`` while below ``max_size``.
+
+        Returns:
+            Connection: A connection checked out of the pool.
+
+        Raises:
+            PoolTimeoutError: When every connection stays checked out for ``timeout`` seconds.
+
+        """
+        start = time.monotonic()
+        with self._condition:
+            while not self._idle and self._size >= self.max_size:
+                remaining = start + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    msg = f"No connection available within {self.timeout}s"
+                    raise PoolTimeoutError(msg)
+                self._condition.wait(remaining)
+            waited = time.monotonic() - start
+            self.checkouts += 1
+            if waited > 0.001:  # noqa: PLR2004
+                self.waits += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            if self._idle:
+                connection, returned = self._idle.pop()
+            else:
+                # Reserve the slot now, the connection is opened outside the lock.
+                connection, returned = None, 0.0
+                self._size += 1
+
+        if connection is not None:
+            stale = time.monotonic() - returned > self.check_idle
+            if not stale or self.check is None or self.check(connection):
+                return connection
+            # The slot stays reserved for the replacement.
+            self._close(connection)
+        try:
+            connection = connect()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.created += 1
+        return connection
+
+    def putconn(self, connection: Connection, *, close: bool = False) -> None:
+        """Give a connection back, closing it when ``close`` is set or it cannot be reset."""
+        if not close and self.reset is not None:
+            try:
+                close = not self.reset(connection)
+            except Exception:  # noqa: BLE001
+                close = True
+        now = time.monotonic()
+        to_close = [connection] if close else []
+        with self._condition:
+            if close:
+                self._size -= 1
+            else:
+                self._idle.append((connection, now))
+            while (
+                self._idle
+                and self._size > self.min_size
+                and now - self._idle[0][1] > self.max_idle
+            ):
+                to_close.append(self._idle.popleft()[0])
+                self._size -= 1
+            self._condition.notify()
+        for closing in to_close:
+            self._close(closing)
+
+    def closeall(self) -> None:
+        """Close every idle connection, checked out ones are still pooled when returned."""
+        with self._condition:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+        for connection in idle:
+            self._close(connection)
+
+    def _close(self, connection: Connection) -> None:
+        """Close a connection that leaves the pool for good."""
+        with self._condition:
+            self.discarded += 1
+        with contextlib.suppress(Exception):
+            connection.close()
+
+    def stats(self) -> dict[str, float]:
+        """Return the pool size and the checkout and wait time metrics.
+
+        Returns:
+            dict[str, float]: Counters since the pool was created, wait times in milliseconds.
+
+        """
+        with self._condition:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": self.checkouts,
+                "created": self.created,
+                "reused": self.checkouts - self.created,
+                "discarded": self.discarded,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_ms_total": self.wait_seconds_total * 1000,
+                "wait_ms_max": self.wait_seconds_max * 1000,
+            }
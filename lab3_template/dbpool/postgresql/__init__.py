@@ -0,0 +1 @@
+"""PostgreSQL backend drawing its connections from a pool."""
@@ -0,0 +1,40 @@
+import psycopg2
+from django.db.backends.postgresql import base, creation
+from psycopg2 import extensions
+
+from dbpool.backend import PooledDatabaseWrapperMixin, close_pools
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name: str, verbosity: int) -> None:
+        """Close the pooled connections first, PostgreSQL refuses to drop a database in use."""
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @staticmethod
+    def pool_check(connection: extensions.connection) -> bool:
+        """Return whether the server still answers on an idle connection."""
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not connection.autocommit:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+        return not connection.closed
+
+    @staticmethod
+    def pool_reset(connection: extensions.connection) -> bool:
+        """Roll back an open transaction, the same way ``psycopg2.pool`` does on putconn."""
+        if connection.closed:
+            return False
+        status = connection.info.transaction_status
+        if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != extensions.TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+        return True
@@ -0,0 +1 @@
+"""SQLite backend drawing its connections from a pool, a stand-in for tests."""
@@ -0,0 +1,32 @@
+import sqlite3
+
+from django.db.backends.sqlite3 import base, creation
+
+from dbpool.backend import PooledDatabaseWrapperMixin, close_pools
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name: str, verbosity: int) -> None:
+        """Close the pooled connections before the test database file is removed."""
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @staticmethod
+    def pool_check(connection: sqlite3.Connection) -> bool:
+        """Return whether the database file can still be read."""
+        try:
+            connection.execute("SELECT 1").close()
+        except sqlite3.Error:
+            return False
+        return True
+
+    @staticmethod
+    def pool_reset(connection: sqlite3.Connection) -> bool:
+        """Roll back an open transaction."""
+        if connection.in_transaction:
+            connection.rollback()
+        return True
@@ -0,0 +1,90 @@
+"""Tests for the connection pool and the pooled backends."""
+
+# ruff: noqa: PT009, PT027
+
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from dbpool import ConnectionPool, PoolTimeoutError
+from dbpool.sqlite3.base import DatabaseWrapper
+
+
+def connect() -> sqlite3.Connection:
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """The pool reuses, bounds, checks and resets connections."""
+
+    def test_returned_connections_are_reused(self) -> None:
+        """Hand the same connection out again instead of opening a new one."""
+        pool = ConnectionPool(max_size=2)
+        first = pool.getconn(connect)
+        pool.putconn(first)
+        self.assertIs(pool.getconn(connect), first)
+        stats = pool.stats()
+        self.assertEqual((stats["created"], stats["reused"], stats["in_use"]), (1, 1, 1))
+
+    def test_checkouts_wait_for_a_free_connection(self) -> None:
+        """Wait for a returned connection at max_size, and time out when none comes back."""
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        held = pool.getconn(connect)
+        with self.assertRaises(PoolTimeoutError):
+            pool.getconn(connect)
+
+        pool.timeout = 5
+        threading.Timer(0.05, pool.putconn, [held]).start()
+        self.assertIs(pool.getconn(connect), held)
+        stats = pool.stats()
+        self.assertEqual((stats["timeouts"], stats["waits"]), (1, 1))
+        self.assertGreater(stats["wait_ms_max"], 10)
+
+    def test_failed_health_check_replaces_the_connection(self) -> None:
+        """Replace an idle connection that fails its health check."""
+        pool = ConnectionPool(check_idle=0, check=lambda _: False)
+        stale = pool.getconn(connect)
+        pool.putconn(stale)
+        time.sleep(0.01)
+        self.assertIsNot(pool.getconn(connect), stale)
+        self.assertEqual(pool.stats()["discarded"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_idle_connections_expire_above_min_size(self) -> None:
+        """Close connections idle for longer than max_idle, keeping min_size open."""
+        pool = ConnectionPool(min_size=1, max_idle=0)
+        connections = [pool.getconn(connect) for _ in range(3)]
+        for connection in connections:
+            time.sleep(0.01)
+            pool.putconn(connection)
+        self.assertEqual((pool.stats()["size"], pool.stats()["idle"]), (1, 1))
+
+
+class PooledBackendTests(SimpleTestCase):
+    """The pooled SQLite backend gives connections back instead of closing them."""
+
+    def test_close_returns_the_connection(self) -> None:
+        """Reuse the same connection after close, with any open transaction rolled back."""
+        with tempfile.TemporaryDirectory() as directory:
+            handler = ConnectionHandler(
+                {"default": {"ENGINE": "dbpool.sqlite3", "NAME": Path(directory) / "pool.db"}},
+            )
+            wrapper = handler["default"]
+            self.assertIsInstance(wrapper, DatabaseWrapper)
+            wrapper.ensure_connection()
+            raw = wrapper.connection
+            raw.execute("CREATE TABLE t (x integer)")
+            raw.execute("INSERT INTO t VALUES (1)")
+            wrapper.close()
+            self.assertFalse(raw.in_transaction)
+
+            wrapper.ensure_connection()
+            self.assertIs(wrapper.connection, raw)
+            self.assertEqual(wrapper.pool.stats()["reused"], 1)
+            wrapper.close()
+            wrapper.pool.closeall()
@@ -1,6 +1,218 @@
-def main():
-    print("Hello from lab3-template!")
+"""Run the lab scripts as tasks of one long-lived process.
+
+Every script started on its own pays for the interpreter, ``django.setup()`` and a new
+database connection. Here Django is set up once and each task runs its script with ``runpy``.
+Tasks run one after the other on the main thread and share its connection. With ``--parallel``,
+up to N run at once on worker threads. Each worker opens one connection and reuses it for
+every task it runs. The timing of every task is printed at the end::
+
+    python main.py
+    python main.py write update read_enrollments
+    python main.py --parallel 3 read_course_instructors read_enrollments read_enrollments_async
+
+Tasks run in parallel see each other's writes in no particular order, run ``write`` and
+``update`` on their own.
+"""
+
+# ruff: noqa: T201
+
+import argparse
+import io
+import itertools
+import runpy
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import bootstrap
+import querylog
+
+HERE = Path(__file__).resolve().parent
+# Task name -> script, in the order they run by default.
+TASKS = {
+    "write": "write.py",
+    "update": "update.py",
+    "read_course_instructors": "read_course_instructors.py",
+    "read_enrollments": "read_enrollments.py",
+    "read_enrollments_async": "read_enrollments_async.py",
+}
+READ_TASKS = [name for name in TASKS if name.startswith("read_")]
+
+
+@dataclass
+class TaskResult:
+    """The outcome of one task run."""
+
+    name: str
+    seconds: float
+    output: str = ""
+    error: str | None = None
+
+
+class ThreadOutput(io.TextIOBase):
+    """Stand-in for ``sys.stdout`` that sends each thread's output where it was captured."""
+
+    def __init__(self, stream: io.TextIOBase) -> None:
+        """Write to ``stream`` unless the writing thread is capturing its output."""
+        self.stream = stream
+        self._local = threading.local()
+
+    def _target(self) -> io.TextIOBase:
+        buffer = getattr(self._local, "buffer", None)
+        return self.stream if buffer is None else buffer
+
+    def write(self, text: str) -> int:
+        """Write ``text`` to the current thread's buffer or to the stream.
+
+        Returns:
+            int: The number of characters written.
+
+        """
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        """Flush the current thread's target."""
+        self._target().flush()
+
+    @contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        """Collect what the current thread writes in the yielded buffer."""
+        self._local.buffer = buffer = io.StringIO()
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+
+@contextmanager
+def _no_capture() -> Iterator[None]:
+    yield None
+
+
+def run_task(name: str, output: ThreadOutput | None = None) -> TaskResult:
+    """Run the script of task ``name`` in this process, capturing its output into ``output``.
+
+    With ``QUERYLOG`` set, the statements of the task are reported under its script's name.
+
+    Returns:
+        TaskResult: The task's wall time, captured output and the traceback if it failed.
+
+    """
+    capture = output.capture() if output is not None else _no_capture()
+    error = None
+    start = time.perf_counter()
+    with capture as buffer, querylog.task(TASKS[name]):
+        try:
+            runpy.run_path(str(HERE / TASKS[name]), run_name="__main__")
+        except SystemExit as exit_:
+            if exit_.code not in (None, 0):
+                error = f"exited with {exit_.code}"
+        except Exception:  # noqa: BLE001
+            error = traceback.format_exc()
+    seconds = time.perf_counter() - start
+    return TaskResult(name, seconds, "" if buffer is None else buffer.getvalue(), error)
+
+
+def run_tasks(names: list[str], *, parallel: int = 1) -> list[TaskResult]:
+    """Run the tasks, in sequence on this thread or on up to ``parallel`` worker threads.
+
+    Sequential tasks print as they go. The output of parallel tasks is printed per task, as
+    each one finishes.
+
+    Returns:
+        list[TaskResult]: One result per task, in the order of ``names``.
+
+    """
+    if parallel <= 1:
+        results = []
+        for name in names:
+            print(f"== {name}", flush=True)
+            result = run_task(name)
+            if result.error:
+                print(result.error, file=sys.stderr)
+            results.append(result)
+        return results
+
+    stdout = sys.stdout
+    sys.stdout = output = ThreadOutput(stdout)
+    lock = threading.Lock()
+
+    def run_and_print(name: str) -> TaskResult:
+        result = run_task(name, output)
+        with lock:
+            stdout.write(f"== {name}\n{result.output}")
+            stdout.flush()
+            if result.error:
+                print(result.error, file=sys.stderr)
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="task") as executor:
+            return list(executor.map(run_and_print, names))
+    finally:
+        sys.stdout = stdout
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Set Django up once, run the selected tasks and print their timings.
+
+    Returns:
+        int: The exit status, 1 when a task failed.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="python main.py",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "tasks",
+        nargs="*",
+        metavar="task",
+        help=f"tasks to run, any of {', '.join(TASKS)} (default: the read tasks)",
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        metavar="N",
+        help="run up to N tasks at once on worker threads (default: 1, in sequence)",
+    )
+    args = parser.parse_args(argv)
+    if unknown := [name for name in args.tasks if name not in TASKS]:
+        parser.error(f"unknown tasks: {', '.join(unknown)}")
+
+    # The scripts read their options from sys.argv, they run with none
+    sys.argv = sys.argv[:1]
+    start = time.perf_counter()
+    bootstrap.setup()
+    setup_seconds = time.perf_counter() - start
+
+    from django.db.backends.signals import connection_created  # noqa: PLC0415
+
+    opened = itertools.count()
+    connection_created.connect(lambda **_: next(opened), weak=False)
+    results = run_tasks(args.tasks or READ_TASKS, parallel=args.parallel)
+    total_seconds = time.perf_counter() - start
+
+    print(f"\n{'task':<28} {'ms':>9}  status", file=sys.stderr)
+    print(f"{'(django setup)':<28} {setup_seconds * 1000:9.1f}", file=sys.stderr)
+    for result in results:
+        status = "failed" if result.error else "ok"
+        print(f"{result.name:<28} {result.seconds * 1000:9.1f}  {status}", file=sys.stderr)
+    print(
+        f"{len(results)} tasks in {total_seconds * 1000:.1f} ms, "
+        f"{next(opened)} database connections opened",
+        file=sys.stderr,
+    )
+    return 1 if any(result.error for result in results) else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
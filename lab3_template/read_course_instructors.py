@@ -2,39 +2,47 @@
 
 # ruff: noqa: E402, F403, F405, T201
 
-import os
+import bootstrap
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
-
-application = get_wsgi_application()
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
 
 
+import querylog
 from related_objects.models import *
+from related_objects.staffing import staffing_cache
 
 # Your code starts from here:
-# Course has instructors reference field so can be used directly via forward access
-courses = Course.objects.filter(instructors__first_name="Yan")
-print("1. Get courses taught by Instructor `Yan`, forward")
-print(courses)
+# Every numbered step is a querylog phase, so QUERYLOG=1 reports its queries on their own
+with querylog.phase("courses_of_yan_forward"):
+    # Course has instructors reference field so can be used directly via forward access
+    courses = Course.objects.filter(instructors__first_name="Yan")
+    print("1. Get courses taught by Instructor `Yan`, forward")
+    print(courses)
+
+print("\n")
+with querylog.phase("courses_of_yan_backward"):
+    # For each instructor, Django creates a implicit course_set. This is called backward access
+    instructor_yan = Instructor.objects.get(first_name="Yan")
+    print("1. Get courses taught by Instructor `Yan`, backward")
+    print(instructor_yan.course_set.all())  # pyright: ignore[reportAttributeAccessIssue]
 
 print("\n")
-# For each instructor, Django creates a implicit course_set. This is called backward access
-instructor_yan = Instructor.objects.get(first_name="Yan")
-print("1. Get courses taught by Instructor `Yan`, backward")
-print(instructor_yan.course_set.all())  # pyright: ignore[reportAttributeAccessIssue]
+with querylog.phase("courses_of_yan_cached"):
+    # Yan's id is already known, the staffing cache answers the course ids without the join
+    # table once a run in the same process has filled it, e.g. through `main.py`
+    print("1. Get courses taught by Instructor `Yan`, through the staffing cache")
+    print(Course.objects.filter(pk__in=staffing_cache.course_ids_of(instructor_yan.pk)))
 
 print("\n")
-instructors = Instructor.objects.filter(course__name__contains="Cloud")
-print("2. Get the instructors of Cloud app dev course")
-print(instructors)
+with querylog.phase("cloud_app_instructors"):
+    instructors = Instructor.objects.filter(course__name__contains="Cloud")
+    print("2. Get the instructors of Cloud app dev course")
+    print(instructors)
 
 print("\n")
-courses = Course.objects.filter(instructors__first_name="Yan")
-occupation_list = set()
-for course in courses:
-    for learner in course.learners.all():
-        occupation_list.add(learner.occupation)
-print("3. Check the occupations of the courses taught by instructor Yan'")
-print(occupation_list)
+with querylog.phase("occupations_taught_by_yan"):
+    # One query with a database side DISTINCT instead of one learners query per course
+    occupation_list = set(Course.objects.taught_by("Yan").learner_occupations())
+    print("3. Check the occupations of the courses taught by instructor Yan'")
+    print(occupation_list)
@@ -1,47 +1,44 @@
 # Django specific settings
 # ruff: noqa: E402, F403, F405, T201
 
-import os
+import bootstrap
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
-
-application = get_wsgi_application()
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
 
 
+import querylog
 from related_objects.models import *
 
 # Your code starts from here:
-print("1. Get the user information about learner `David`")
-learner_david = Learner.objects.get(first_name="David")
-print(learner_david.user_ptr)  # pyright: ignore[reportAttributeAccessIssue]
-
-print("2. Get learner `David` information from user")
-user_david = User.objects.get(first_name="David")
-print(user_david.learner)  # pyright: ignore[reportAttributeAccessIssue]
-
-print("3. Get all learners for `Introduction to Python` course")
-course = Course.objects.get(name="Introduction to Python")
-learners = course.learners.all()
-print(learners)
-
-print("4. Check the occupation list for the courses taught by instructor `Yan`")
-courses = Course.objects.filter(instructors__first_name="Yan")
-occupation_list = set()
-for course in courses:
-    for learner in course.learners.all():
-        occupation_list.add(learner.occupation)
-print(occupation_list)
-
-print("5. Check which courses developers are enrolled in Aug, 2020")
-enrollments = Enrollment.objects.filter(
-    date_enrolled__month=8,
-    date_enrolled__year=2020,
-    learner__occupation="developer",
-)
-courses_for_developers = set()
-for enrollment in enrollments:
-    course = enrollment.course
-    courses_for_developers.add(course.name)
-print(courses_for_developers)
+# Every numbered step is a querylog phase, so QUERYLOG=1 reports its queries on their own
+with querylog.phase("learner_david"):
+    print("1. Get the user information about learner `David`")
+    learner_david = Learner.objects.get(first_name="David")
+    print(learner_david.user_ptr)  # pyright: ignore[reportAttributeAccessIssue]
+
+with querylog.phase("user_david"):
+    print("2. Get learner `David` information from user")
+    # The learner row is LEFT JOINed in, so the user comes back as a Learner in one query
+    user_david = User.objects.select_subclasses().get(first_name="David")
+    print(user_david)
+
+with querylog.phase("introduction_to_python_learners"):
+    print("3. Get all learners for `Introduction to Python` course")
+    course = Course.objects.get(name="Introduction to Python")
+    learners = course.learners.all()
+    print(learners)
+
+with querylog.phase("occupations_taught_by_yan"):
+    print("4. Check the occupation list for the courses taught by instructor `Yan`")
+    # One query with a database side DISTINCT instead of one learners query per course
+    occupation_list = set(Course.objects.taught_by("Yan").learner_occupations())
+    print(occupation_list)
+
+with querylog.phase("developer_courses"):
+    print("5. Check which courses developers are enrolled in Aug, 2020")
+    # An indexed lookup on the monthly rollup instead of a scan over every enrollment
+    courses_for_developers = set(
+        EnrollmentMonthlyRollup.objects.course_names(2020, 8, occupation=Learner.DEVELOPER),
+    )
+    print(courses_for_developers)
@@ -0,0 +1,31 @@
+# Django specific settings
+# ruff: noqa: E402, T201
+
+import asyncio
+
+import bootstrap
+
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
+
+
+import querylog
+from related_objects.reports import enrollment_report
+
+# Your code starts from here:
+# The independent queries of read_enrollments.py, run concurrently. The phase follows them
+# onto the worker threads that run them.
+with querylog.phase("enrollment_report"):
+    report = asyncio.run(enrollment_report())
+
+print("1. Get the user information about learner `David`")
+print(report["learner_david"].user_ptr)
+
+print("2. Get all learners for `Introduction to Python` course")
+print(report["introduction_to_python_learners"])
+
+print("3. Check the occupation list for the courses taught by instructor `Yan`")
+print(report["occupations_taught_by_yan"])
+
+print("4. Check which courses developers are enrolled in Aug, 2020")
+print(report["developer_courses"])
@@ -0,0 +1 @@
+"""Related objects operations for the application."""
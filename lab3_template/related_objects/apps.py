@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class RelatedObjectsConfig(AppConfig):
+    name = "related_objects"
+
+    def ready(self) -> None:
+        """Connect the signal receivers that keep derived data up to date."""
+        from related_objects import signals  # noqa: F401, PLC0415
@@ -0,0 +1,264 @@
+"""Set-based bulk updates of per-row values for the related_objects models.
+
+``bulk_set`` writes a value per row and ``bulk_add`` adds a delta per row. Each chunk of rows is
+one UPDATE per table, not a ``save()`` per object. On PostgreSQL the chunk's values are joined
+in with ``UPDATE ... FROM (VALUES ...)``. Other databases, such as SQLite, get a ``CASE`` over
+the primary key. Fields of multi-table inherited models are grouped by the table that stores
+them, so setting a learner's ``first_name`` and ``occupation`` updates ``related_objects_user``
+and ``related_objects_learner`` in the chunk's transaction.
+
+Like ``QuerySet.update()``, the updates skip ``save()`` and its signals. The workflow functions
+at the end rebuild the derived data their fields feed.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+
+from django.db import connections, router, transaction
+from django.db.models import Field, Model, QuerySet
+
+from .models import Enrollment, Instructor, Learner
+from .rollup import rebuild_enrollment_rollup
+from .seeding import chunked
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# ``(primary key, {field name: value})`` pairs.
+Rows = Iterable[tuple[int, Mapping[str, object]]]
+# Called with the number of rows updated so far after every chunk.
+Progress = Callable[[int], None]
+
+
+def _fields_by_table(model: type[Model], names: Iterable[str]) -> dict[type[Model], list[Field]]:
+    """Group the named fields by the model whose table stores them, root table first.
+
+    Returns:
+        dict[type[Model], list[Field]]: The fields each table's UPDATE sets.
+
+    Raises:
+        ValueError: When a field is the primary key or has no column.
+
+    """
+    opts = model._meta  # noqa: SLF001
+    tables: dict[type[Model], list[Field]] = {
+        table: [] for table in [*reversed(opts.get_parent_list()), model]
+    }
+    for name in names:
+        field = opts.get_field(name)
+        if not field.concrete or field.primary_key or field.many_to_many:
+            msg = f"{opts.label}.{name} cannot be bulk updated."
+            raise ValueError(msg)
+        tables[field.model._meta.concrete_model].append(field)  # noqa: SLF001
+    return {table: fields for table, fields in tables.items() if fields}
+
+
+def _update_sql(
+    table: type[Model],
+    fields: list[Field],
+    rows: dict[int, Mapping[str, object]],
+    *,
+    using: str,
+    increment: bool,
+) -> tuple[str, list[object]]:
+    """Return one UPDATE setting, or incrementing, ``fields`` of ``table`` for every row.
+
+    Returns:
+        tuple[str, list[object]]: The statement and its parameters.
+
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    opts = table._meta  # noqa: SLF001
+    name, pk = quote(opts.db_table), opts.pk
+    params: list[object] = []
+    if connection.vendor == "postgresql":
+        # VALUES columns are untyped, the casts give them the types of the table's columns.
+        assignments = ", ".join(
+            f"{quote(field.column)} = "
+            + (f"{name}.{quote(field.column)} + " if increment else "")
+            + f"v.{quote(field.column)}::{field.cast_db_type(connection)}"
+            for field in fields
+        )
+        values = ", ".join(["({})".format(", ".join(["%s"] * (len(fields) + 1)))] * len(rows))
+        columns = ", ".join(quote(column) for column in ["pk", *(f.column for f in fields)])
+        for key, row in rows.items():
+            params.append(pk.get_db_prep_save(key, connection))
+            params += [field.get_db_prep_save(row[field.name], connection) for field in fields]
+        sql = (
+            f"UPDATE {name} SET {assignments} FROM (VALUES {values}) AS v ({columns}) "  # noqa: S608
+            f'WHERE {name}.{quote(pk.column)} = v."pk"::{pk.cast_db_type(connection)}'
+        )
+        return sql, params
+
+    pk_column = quote(pk.column)
+    cases = []
+    for field in fields:
+        whens = " ".join(["WHEN %s THEN %s"] * len(rows))
+        prefix = f"{quote(field.column)} + " if increment else ""
+        cases.append(f"{quote(field.column)} = {prefix}CASE {pk_column} {whens} END")
+        for key, row in rows.items():
+            params += [
+                pk.get_db_prep_save(key, connection),
+                field.get_db_prep_save(row[field.name], connection),
+            ]
+    placeholders = ", ".join(["%s"] * len(rows))
+    params += [pk.get_db_prep_save(key, connection) for key in rows]
+    sql = f"UPDATE {name} SET {', '.join(cases)} WHERE {pk_column} IN ({placeholders})"  # noqa: S608
+    return sql, params
+
+
+def _bulk_update(  # noqa: PLR0913
+    model: type[Model],
+    rows: Rows,
+    *,
+    increment: bool,
+    chunk_size: int,
+    progress: Progress | None,
+    using: str | None,
+) -> int:
+    using = using or router.db_for_write(model)
+    connection = connections[using]
+    total = 0
+    for chunk in chunked(rows, chunk_size):
+        names = set(chunk[0][1])
+        # A row may appear twice in a chunk: the last value wins, deltas are summed.
+        merged: dict[int, dict[str, object]] = defaultdict(dict)
+        for key, row in chunk:
+            if set(row) != names:
+                msg = f"Every row of a chunk must set the same fields, {sorted(names)}."
+                raise ValueError(msg)
+            for field_name, value in row.items():
+                merged[key][field_name] = (
+                    merged[key].get(field_name, 0) + value if increment else value
+                )
+        updated = 0
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            for table, fields in _fields_by_table(model, names).items():
+                cursor.execute(
+                    *_update_sql(table, fields, merged, using=using, increment=increment),
+                )
+                # Every table's UPDATE matches the same primary keys, a row updated in the
+                # parent and the child table is counted once.
+                updated = max(updated, cursor.rowcount)
+        total += updated
+        if progress is not None:
+            progress(total)
+    return total
+
+
+def bulk_set(
+    model: type[Model],
+    rows: Rows,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Progress | None = None,
+    using: str | None = None,
+) -> int:
+    """Set per-row field values, one UPDATE per table for every ``chunk_size`` rows.
+
+    Returns:
+        int: The number of rows updated.
+
+    """
+    return _bulk_update(
+        model,
+        rows,
+        increment=False,
+        chunk_size=chunk_size,
+        progress=progress,
+        using=using,
+    )
+
+
+def bulk_add(
+    model: type[Model],
+    rows: Rows,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Progress | None = None,
+    using: str | None = None,
+) -> int:
+    """Add per-row deltas to numeric fields, one UPDATE per table for every ``chunk_size`` rows.
+
+    The increments happen in the database, so concurrent changes to the counters are kept.
+
+    Returns:
+        int: The number of rows updated.
+
+    """
+    return _bulk_update(
+        model,
+        rows,
+        increment=True,
+        chunk_size=chunk_size,
+        progress=progress,
+        using=using,
+    )
+
+
+def _pages(queryset: QuerySet, chunk_size: int) -> Iterator[int]:
+    """Yield the primary keys of ``queryset``, reading ``chunk_size`` of them per query.
+
+    Every page is read into a list and paged by primary key, so no SELECT cursor stays open
+    while the caller updates the rows it returned, which SQLite does not isolate.
+
+    """
+    pks = queryset.values_list("pk", flat=True).order_by("pk")
+    page = list(pks[:chunk_size])
+    while page:
+        yield from page
+        page = list(pks.filter(pk__gt=page[-1])[:chunk_size])
+
+
+def set_occupation(
+    learners: QuerySet,
+    occupation: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Progress | None = None,
+) -> int:
+    """Change the occupation of every learner in ``learners`` and rebuild the rollup.
+
+    Returns:
+        int: The number of learners updated.
+
+    """
+    rows = ((pk, {"occupation": occupation}) for pk in _pages(learners, chunk_size))
+    updated = bulk_set(Learner, rows, chunk_size=chunk_size, progress=progress)
+    rebuild_enrollment_rollup()
+    return updated
+
+
+def set_mode(
+    enrollments: QuerySet,
+    mode: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Progress | None = None,
+) -> int:
+    """Move every enrollment in ``enrollments`` to ``mode`` and rebuild the rollup.
+
+    Returns:
+        int: The number of enrollments updated.
+
+    """
+    rows = ((pk, {"mode": mode}) for pk in _pages(enrollments, chunk_size))
+    updated = bulk_set(Enrollment, rows, chunk_size=chunk_size, progress=progress)
+    rebuild_enrollment_rollup()
+    return updated
+
+
+def add_total_learners(
+    deltas: Mapping[int, int],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Progress | None = None,
+) -> int:
+    """Add a delta per instructor id to ``Instructor.total_learners``.
+
+    Returns:
+        int: The number of instructors updated.
+
+    """
+    rows = ((pk, {"total_learners": delta}) for pk, delta in deltas.items() if delta)
+    return bulk_add(Instructor, rows, chunk_size=chunk_size, progress=progress)
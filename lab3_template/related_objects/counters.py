@@ -0,0 +1,70 @@
+"""Maintenance of the ``Instructor.total_learners`` counter.
+
+``total_learners`` counts the enrollments in every course an instructor teaches, not distinct
+learners: a learner enrolled in two of an instructor's courses counts twice. The signal
+receivers in ``signals.py`` keep it current with atomic ``F()`` increments as enrollments and
+course staffing change. ``reconcile_total_learners`` recomputes every counter in one statement,
+for repairing drift after bulk loads or raw SQL that bypasses the signals.
+"""
+
+from collections.abc import Iterable
+
+from django.db import router
+from django.db.models import Count, F, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Enrollment, Instructor
+
+
+def add_learners(instructor_ids: Iterable[int], delta: int) -> None:
+    """Add ``delta``, which may be negative, to the counters of the given instructors."""
+    if delta:
+        Instructor.objects.filter(pk__in=instructor_ids).update(
+            total_learners=F("total_learners") + delta,
+        )
+
+
+def add_course_learners(course_id: int, delta: int) -> None:
+    """Add ``delta`` to the counters of every instructor teaching the course."""
+    if delta:
+        Instructor.objects.filter(course=course_id).update(
+            total_learners=F("total_learners") + delta,
+        )
+
+
+def count_enrollments(course_ids: Iterable[int]) -> int:
+    """Return the number of enrollments across the given courses."""
+    return Enrollment.objects.filter(course_id__in=course_ids).count()
+
+
+def recount_total_learners(instructors: QuerySet, enrollments: QuerySet) -> int:
+    """Set the counter of every instructor in ``instructors`` from ``enrollments`` in one UPDATE.
+
+    Takes querysets, so data migrations can pass those of their historical models.
+
+    Returns:
+        int: The number of instructors updated.
+
+    """
+    totals = (
+        enrollments.filter(course__instructors=OuterRef("pk"))
+        .order_by()
+        .values("course__instructors")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return instructors.update(total_learners=Coalesce(Subquery(totals), 0))
+
+
+def reconcile_total_learners(*, using: str | None = None) -> int:
+    """Recompute every instructor's counter from the enrollment rows in one UPDATE.
+
+    Returns:
+        int: The number of instructors updated.
+
+    """
+    using = using or router.db_for_write(Instructor)
+    return recount_total_learners(
+        Instructor.objects.using(using),
+        Enrollment.objects.using(using),
+    )
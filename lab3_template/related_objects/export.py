@@ -0,0 +1,128 @@
+"""Stream enrollments and learners to NDJSON or CSV with a flat memory profile.
+
+Rows are read as ``values_list`` tuples through ``QuerySet.iterator()``, which uses a named
+server-side cursor on PostgreSQL, and each row is written out before the next one is fetched.
+Only ``chunk_size`` rows are held in memory at any time, whatever the size of the table.
+"""
+
+import csv
+import json
+from collections.abc import Callable, Iterator
+from datetime import date
+from typing import TextIO
+
+from django.db.models import QuerySet
+
+from .models import Enrollment, Learner
+
+DEFAULT_CHUNK_SIZE = 2000
+FORMATS = ("ndjson", "csv")
+
+# Export name -> (queryset factory, output column -> model field lookup).
+EXPORTS: dict[str, tuple[Callable[[], QuerySet], dict[str, str]]] = {
+    "enrollments": (
+        lambda: Enrollment.objects.order_by("pk"),
+        {
+            "id": "pk",
+            "date_enrolled": "date_enrolled",
+            "mode": "mode",
+            "learner_id": "learner_id",
+            "learner_first_name": "learner__first_name",
+            "learner_last_name": "learner__last_name",
+            "learner_occupation": "learner__occupation",
+            "course_id": "course_id",
+            "course_name": "course__name",
+        },
+    ),
+    "learners": (
+        lambda: Learner.objects.order_by("pk"),
+        {
+            "id": "pk",
+            "first_name": "first_name",
+            "last_name": "last_name",
+            "dob": "dob",
+            "occupation": "occupation",
+            "social_link": "social_link",
+        },
+    ),
+}
+
+
+def export_rows(
+    name: str,
+    *,
+    queryset: QuerySet | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> tuple[list[str], Iterator[tuple]]:
+    """Return the column names of export ``name`` and an iterator over its rows.
+
+    ``queryset`` narrows the export to a subset of the rows, it defaults to every row.
+
+    Returns:
+        tuple[list[str], Iterator[tuple]]: The columns and the lazily fetched value tuples.
+
+    """
+    default_queryset, columns = EXPORTS[name]
+    queryset = default_queryset() if queryset is None else queryset
+    rows = queryset.values_list(*columns.values()).iterator(chunk_size=chunk_size)
+    return list(columns), rows
+
+
+def _json_default(value: object) -> str:
+    if isinstance(value, date):
+        return value.isoformat()
+    msg = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def write_ndjson(stream: TextIO, columns: list[str], rows: Iterator[tuple]) -> int:
+    """Write one JSON object per line.
+
+    Returns:
+        int: The number of rows written.
+
+    """
+    encode = json.JSONEncoder(default=_json_default, ensure_ascii=False).encode
+    written = 0
+    for row in rows:
+        stream.write(encode(dict(zip(columns, row, strict=True))))
+        stream.write("\n")
+        written += 1
+    return written
+
+
+def write_csv(stream: TextIO, columns: list[str], rows: Iterator[tuple]) -> int:
+    """Write a header line followed by one CSV line per row.
+
+    Returns:
+        int: The number of rows written, not counting the header.
+
+    """
+    writer = csv.writer(stream)
+    writer.writerow(columns)
+    written = 0
+    for row in rows:
+        writer.writerow(row)
+        written += 1
+    return written
+
+
+WRITERS = {"ndjson": write_ndjson, "csv": write_csv}
+
+
+def export(
+    name: str,
+    stream: TextIO,
+    *,
+    fmt: str = "ndjson",
+    queryset: QuerySet | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Stream export ``name`` to ``stream`` in format ``fmt``.
+
+    Returns:
+        int: The number of rows written.
+
+    """
+    columns, rows = export_rows(name, queryset=queryset, chunk_size=chunk_size)
+    return WRITERS[fmt](stream, columns, rows)
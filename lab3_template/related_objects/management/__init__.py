@@ -0,0 +1 @@
+"""Management commands for the related_objects app."""
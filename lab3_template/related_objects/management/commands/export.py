@@ -0,0 +1,34 @@
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+
+from related_objects.export import DEFAULT_CHUNK_SIZE, EXPORTS, FORMATS, export
+
+
+class Command(BaseCommand):
+    help = "Stream enrollments or learners as NDJSON or CSV without loading them into memory."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the export name, format, output and chunk size options."""
+        parser.add_argument("name", choices=list(EXPORTS), help="what to export")
+        parser.add_argument("--format", choices=FORMATS, default="ndjson", dest="fmt")
+        parser.add_argument("--output", help="write to this file instead of stdout")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="rows fetched from the database cursor at a time",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:  # noqa: ARG002
+        """Write the export and report the row count on stderr."""
+        name, fmt, output = options["name"], options["fmt"], options["output"]
+        chunk_size = options["chunk_size"]
+        if output:
+            with open(output, "w", encoding="utf-8", newline="") as stream:  # noqa: PTH123
+                written = export(name, stream, fmt=fmt, chunk_size=chunk_size)
+        else:
+            # Rows carry their own line endings.
+            self.stdout.ending = ""
+            written = export(name, self.stdout, fmt=fmt, chunk_size=chunk_size)
+        self.stderr.write(self.style.SUCCESS(f"Exported {written} {name}"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from related_objects.rollup import rebuild_enrollment_rollup
+
+
+class Command(BaseCommand):
+    help = "Recompute the EnrollmentMonthlyRollup table from the enrollment rows."
+
+    def handle(self, *args: object, **options: object) -> None:  # noqa: ARG002
+        """Rebuild the rollup table and report how many rows it holds."""
+        written = rebuild_enrollment_rollup()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} enrollment rollup rows"))
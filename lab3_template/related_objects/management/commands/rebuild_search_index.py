@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from related_objects.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Reindex every course and lesson for full-text search, e.g. after a bulk import."
+
+    def handle(self, *args: object, **options: object) -> None:  # noqa: ARG002
+        """Rebuild the search index and report how many objects it holds."""
+        indexed = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} courses and lessons"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from related_objects.counters import reconcile_total_learners
+
+
+class Command(BaseCommand):
+    help = "Recompute Instructor.total_learners from the enrollment rows in one UPDATE."
+
+    def handle(self, *args: object, **options: object) -> None:  # noqa: ARG002
+        """Reconcile every instructor's counter and report how many were updated."""
+        updated = reconcile_total_learners()
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled total_learners of {updated} instructors"),
+        )
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:05
+
+from django.db import DatabaseError, migrations, models, transaction
+
+
+def has_trigram_extension(schema_editor):
+    # Creating the extension takes the CREATE privilege on the database, which an application
+    # role often lacks. Have an administrator run "CREATE EXTENSION pg_trgm" beforehand, the
+    # migration only tries to create it itself and otherwise goes on without the index.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone():
+            return True
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        return False
+    return True
+
+
+def create_course_name_trigram_index(apps, schema_editor):
+    # A trigram GIN index lets PostgreSQL answer name__contains without a sequential scan.
+    # Without pg_trgm, name__contains keeps working with a scan.
+    if schema_editor.connection.vendor != "postgresql" or not has_trigram_extension(schema_editor):
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS ro_course_name_trgm_idx ON related_objects_course USING gin (name gin_trgm_ops)"
+    )
+
+
+def drop_course_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS ro_course_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('related_objects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['name'], name='ro_course_name_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['course', 'date_enrolled'], name='ro_enroll_course_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['date_enrolled'], name='ro_enroll_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learner',
+            index=models.Index(fields=['occupation'], name='ro_learner_occupation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['first_name'], name='ro_user_first_name_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['last_name', 'first_name'], name='ro_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['dob'], name='ro_user_dob_idx'),
+        ),
+        migrations.RunPython(create_course_name_trigram_index, drop_course_name_trigram_index),
+    ]
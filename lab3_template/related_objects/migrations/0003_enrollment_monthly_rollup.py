@@ -0,0 +1,50 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+
+
+def populate_rollup(apps, schema_editor):
+    # Count the enrollments that existed before the signals started maintaining the rollup
+    Enrollment = apps.get_model("related_objects", "Enrollment")
+    EnrollmentMonthlyRollup = apps.get_model("related_objects", "EnrollmentMonthlyRollup")
+    db_alias = schema_editor.connection.alias
+    rows = (
+        Enrollment.objects.using(db_alias)
+        .annotate(month=TruncMonth("date_enrolled"))
+        .values("course_id", "month", "mode", occupation=F("learner__occupation"))
+        .annotate(enrollments=Count("pk"))
+        .order_by()
+    )
+    EnrollmentMonthlyRollup.objects.using(db_alias).bulk_create(
+        (EnrollmentMonthlyRollup(**row) for row in rows.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('related_objects', '0002_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnrollmentMonthlyRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('mode', models.CharField(choices=[('audit', 'Audit'), ('honor', 'Honor')], max_length=5)),
+                ('occupation', models.CharField(choices=[('student', 'Student'), ('developer', 'Developer'), ('data_scientist', 'Data Scientist'), ('dba', 'Database Admin')], max_length=20)),
+                ('enrollments', models.IntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='related_objects.course')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='enrollmentmonthlyrollup',
+            constraint=models.UniqueConstraint(fields=('month', 'occupation', 'course', 'mode'), name='ro_rollup_bucket_uniq'),
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
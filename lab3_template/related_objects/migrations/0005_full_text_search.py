@@ -0,0 +1,61 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:24
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# The GIN index name and the title and body column of every searchable table, see search.py
+DOCUMENTS = {
+    "related_objects_course": ("ro_course_search_idx", "name", "description"),
+    "related_objects_lesson": ("ro_lesson_search_idx", "title", "content"),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    # PostgreSQL searches a GIN-indexed tsvector column, SQLite an FTS5 table per model
+    for table, (index, title, body) in DOCUMENTS.items():
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(
+                f"UPDATE {table} SET search_vector = "
+                f"setweight(to_tsvector('english', COALESCE({title}, '')), 'A') || "
+                f"setweight(to_tsvector('english', COALESCE({body}, '')), 'B')"
+            )
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {index} ON {table} USING gin (search_vector)"
+            )
+        elif schema_editor.connection.vendor == "sqlite":
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts "
+                "USING fts5(title, body, tokenize = 'porter unicode61')"
+            )
+            schema_editor.execute(
+                f"INSERT INTO {table}_fts (rowid, title, body) SELECT id, {title}, {body} FROM {table}"
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    for table, (index, _, _) in DOCUMENTS.items():
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(f"DROP INDEX IF EXISTS {index}")
+        elif schema_editor.connection.vendor == "sqlite":
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('related_objects', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('related_objects', '0005_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('user', 'User'), ('instructor', 'Instructor'), ('learner', 'Learner')], default='user', max_length=10)),
+                ('first_name', models.CharField(default='john', max_length=30)),
+                ('last_name', models.CharField(default='doe', max_length=30)),
+                ('dob', models.DateField(null=True)),
+                ('full_time', models.BooleanField(null=True)),
+                ('total_learners', models.IntegerField(null=True)),
+                ('occupation', models.CharField(blank=True, choices=[('student', 'Student'), ('developer', 'Developer'), ('data_scientist', 'Data Scientist'), ('dba', 'Database Admin')], max_length=20)),
+                ('social_link', models.URLField(blank=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'first_name'], name='ro_person_kind_first_name_idx', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']), models.Index(fields=['last_name', 'first_name', 'id'], name='ro_person_name_id_idx'), models.Index(fields=['dob', 'id'], name='ro_person_dob_id_idx'), models.Index(fields=['occupation'], name='ro_person_occupation_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='InstructorPerson',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('related_objects.person',),
+        ),
+        migrations.CreateModel(
+            name='LearnerPerson',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('related_objects.person',),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:40
+
+from django.core.management.color import no_style
+from django.db import migrations
+
+# One row per user, keeping its id, instructors before learners, see people.py
+COPY_PEOPLE = """
+INSERT INTO related_objects_person
+    (id, kind, first_name, last_name, dob, full_time, total_learners, occupation, social_link)
+SELECT u.id,
+       CASE WHEN i.user_ptr_id IS NOT NULL THEN 'instructor'
+            WHEN l.user_ptr_id IS NOT NULL THEN 'learner'
+            ELSE 'user' END,
+       u.first_name, u.last_name, u.dob, i.full_time, i.total_learners,
+       COALESCE(l.occupation, ''), COALESCE(l.social_link, '')
+FROM related_objects_user u
+LEFT JOIN related_objects_instructor i ON i.user_ptr_id = u.id
+LEFT JOIN related_objects_learner l ON l.user_ptr_id = u.id
+"""
+
+
+def copy_users_to_people(apps, schema_editor):
+    schema_editor.execute(COPY_PEOPLE)
+    # The ids were copied explicitly, move the PostgreSQL sequence past them
+    person = apps.get_model("related_objects", "Person")
+    for sql in schema_editor.connection.ops.sequence_reset_sql(no_style(), [person]):
+        schema_editor.execute(sql)
+
+
+def delete_people(apps, schema_editor):
+    schema_editor.execute("DELETE FROM related_objects_person")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('related_objects', '0006_person'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_users_to_people, delete_people),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:50
+
+from django.db import migrations, models
+
+from related_objects.counters import recount_total_learners
+
+
+def reconcile_total_learners(apps, schema_editor):
+    # The counters were entered by hand until now, the F() increments must start from real counts
+    db_alias = schema_editor.connection.alias
+    Instructor = apps.get_model("related_objects", "Instructor")
+    Enrollment = apps.get_model("related_objects", "Enrollment")
+    recount_total_learners(Instructor.objects.using(db_alias), Enrollment.objects.using(db_alias))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('related_objects', '0007_copy_users_to_people'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='instructor',
+            name='total_learners',
+            field=models.IntegerField(default=0, help_text='Enrollments in the courses the instructor teaches. A learner enrolled in two of them counts twice.'),
+        ),
+        migrations.RunPython(reconcile_total_learners, migrations.RunPython.noop),
+    ]
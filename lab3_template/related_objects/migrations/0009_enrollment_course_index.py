@@ -0,0 +1,19 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('related_objects', '0008_instructor_total_learners_enrollments'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='enrollment',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='related_objects.course'),
+        ),
+    ]
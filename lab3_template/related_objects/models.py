@@ -1,22 +1,115 @@
+from collections.abc import Iterator
+from datetime import date
 from typing import ClassVar
 
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from django.db.models.query import ModelIterable
 from django.utils.timezone import now
 
+from .pagination import BY_DOB, DEFAULT_PAGE_SIZE, KeysetPage, KeysetPaginator
+
 
 # Define your models from here:
+class SubclassIterable(ModelIterable):
+    """Yield every row as the most specific subclass its joined child rows make it."""
+
+    def __iter__(self) -> Iterator[models.Model]:
+        accessors = self.queryset.subclass_accessors()
+        for obj in super().__iter__():
+            yield downcast(obj, accessors)
+
+
+def downcast(obj: models.Model, accessors: list[str]) -> models.Model:
+    """Return the first child object of ``obj`` loaded by ``select_related``, or ``obj``.
+
+    Returns:
+        models.Model: An instance of a subclass, with the parent's fields already set.
+
+    """
+    for accessor in accessors:
+        try:
+            return getattr(obj, accessor)
+        except ObjectDoesNotExist:
+            continue
+    return obj
+
+
+class UserQuerySet(models.QuerySet):
+    def keyset_page(
+        self,
+        cursor: str | None = None,
+        *,
+        ordering: tuple[str, ...] = BY_DOB,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> KeysetPage:
+        """Return the page after ``cursor`` in ``ordering``, the first page without one."""
+        return KeysetPaginator(self, ordering, page_size).page(cursor)
+
+    def subclass_accessors(self) -> list[str]:
+        """Return the accessors of the child tables of multi-table inherited subclasses.
+
+        Returns:
+            list[str]: Such as ``["instructor", "learner"]`` for users.
+
+        """
+        opts = self.model._meta  # noqa: SLF001
+        return [rel.get_accessor_name() for rel in opts.related_objects if rel.parent_link]
+
+    def select_subclasses(self) -> "UserQuerySet":
+        """Return the rows as ``Instructor`` and ``Learner`` objects where they are one.
+
+        Every child table is LEFT JOINed in the same query, so the number of joins is fixed by
+        the subclasses, not the rows, and ``iterator(chunk_size=...)`` streams as usual. Users
+        that are neither stay ``User`` objects, an instructor that is also a learner comes back
+        as an instructor.
+
+        Returns:
+            UserQuerySet: The users, downcast to their subclasses.
+
+        """
+        queryset = self.select_related(*self.subclass_accessors())
+        queryset._iterable_class = SubclassIterable  # noqa: SLF001
+        return queryset
+
+
 class User(models.Model):
     first_name = models.CharField(null=False, max_length=30, default="john")
     last_name = models.CharField(null=False, max_length=30, default="doe")
     dob = models.DateField(null=True)
 
+    objects = UserQuerySet.as_manager()
+
+    class Meta:
+        """Index the name and birth date lookups."""
+
+        # Pattern ops let PostgreSQL use the index for equality and for startswith lookups
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["first_name"],
+                name="ro_user_first_name_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            # The trailing id makes the keyset pagination orderings fully indexed
+            models.Index(fields=["last_name", "first_name", "id"], name="ro_user_name_id_idx"),
+            models.Index(fields=["dob", "id"], name="ro_user_dob_id_idx"),
+        ]
+
     def __str__(self) -> str:
         return self.first_name + " " + self.last_name
 
 
 class Instructor(User):
     full_time = models.BooleanField(default=True)
-    total_learners = models.IntegerField()
+    # Maintained from the enrollment rows, see counters.py
+    total_learners = models.IntegerField(
+        default=0,
+        help_text=(
+            "Enrollments in the courses the instructor teaches. A learner enrolled in two of "
+            "them counts twice."
+        ),
+    )
 
     def __str__(self) -> str:
         return (
@@ -47,6 +140,13 @@ class Learner(User):
     )
     social_link = models.URLField(max_length=200)
 
+    class Meta:
+        """Index the occupation filter."""
+
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["occupation"], name="ro_learner_occupation_idx"),
+        ]
+
     def __str__(self) -> str:
         return (
             f"First name: {self.first_name}, "
@@ -57,6 +157,41 @@ class Learner(User):
         )
 
 
+class CourseQuerySet(models.QuerySet):
+    def taught_by(self, first_name: str) -> "CourseQuerySet":
+        """Return the courses taught by instructors with the given first name."""
+        return self.filter(instructors__first_name=first_name)
+
+    def learner_occupations(self) -> models.QuerySet:
+        """Return the distinct occupations of learners enrolled in these courses.
+
+        The courses are used as a subquery, so the answer comes back in a single SQL query with
+        the DISTINCT applied by the database.
+
+        Returns:
+            QuerySet: A flat ``values_list`` of occupation codes.
+
+        """
+        return (
+            Learner.objects.filter(course__in=self)
+            .values_list("occupation", flat=True)
+            .distinct()
+            .order_by("occupation")
+        )
+
+    def with_learners(self) -> "CourseQuerySet":
+        """Prefetch each course's learners, so ``course.learners.all()`` issues no queries.
+
+        Use this when full ``Learner`` objects are needed, it costs two queries however many
+        courses are returned.
+
+        Returns:
+            CourseQuerySet: The courses with their learners prefetched.
+
+        """
+        return self.prefetch_related("learners")
+
+
 # Course model
 class Course(models.Model):
     name = models.CharField(null=False, max_length=100, default="online course")
@@ -65,11 +200,65 @@ class Course(models.Model):
     instructors = models.ManyToManyField(Instructor)
     # Many-To-Many relationship with Learner
     learners = models.ManyToManyField(Learner, through="Enrollment")
+    # Kept current by the search receivers, see search.py. Only used on PostgreSQL.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = CourseQuerySet.as_manager()
+
+    class Meta:
+        """Index the course name lookups."""
+
+        # name__contains is served by a trigram index created in the migration on PostgreSQL
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["name"],
+                name="ro_course_name_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Name: {self.name}, Description: {self.description}"
 
 
+def month_range(year: int, month: int) -> tuple[date, date]:
+    """Return the half-open ``[first day, first day of next month)`` range of a month."""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)  # noqa: PLR2004
+    return start, end
+
+
+class EnrollmentQuerySet(models.QuerySet):
+    def in_month(self, year: int, month: int) -> "EnrollmentQuerySet":
+        """Return the enrollments of a month as a date range the indexes on it can serve.
+
+        ``date_enrolled__month`` and ``date_enrolled__year`` compile to EXTRACT() on the
+        column, which no index can answer. A half-open range on the raw column can.
+
+        Returns:
+            EnrollmentQuerySet: The enrollments dated within the month.
+
+        """
+        start, end = month_range(year, month)
+        return self.filter(date_enrolled__gte=start, date_enrolled__lt=end)
+
+    def for_display(self) -> "EnrollmentQuerySet":
+        """Join the learner and course names ``__str__`` prints and defer every other column.
+
+        Without it, printing N enrollments costs 2N+1 queries. Reading a deferred field loads it
+        with a query of its own, so use this for display only.
+
+        Returns:
+            EnrollmentQuerySet: The enrollments with the columns of ``__str__`` loaded.
+
+        """
+        return self.select_related("learner", "course").only(
+            "date_enrolled",
+            "learner__first_name",
+            "course__name",
+        )
+
+
 class Enrollment(models.Model):
     AUDIT = "audit"
     HONOR = "honor"
@@ -78,10 +267,21 @@ class Enrollment(models.Model):
         (HONOR, "Honor"),
     ]
     learner = models.ForeignKey(Learner, on_delete=models.CASCADE)
-    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    # The (course, date_enrolled) index leads with the course and serves the foreign key
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, db_index=False)
     date_enrolled = models.DateField(default=now)
     mode = models.CharField(max_length=5, choices=COURSE_MODES, default=AUDIT)
 
+    objects = EnrollmentQuerySet.as_manager()
+
+    class Meta:
+        """Index the enrollments of a course by date, and by date alone."""
+
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["course", "date_enrolled"], name="ro_enroll_course_date_idx"),
+            models.Index(fields=["date_enrolled"], name="ro_enroll_date_idx"),
+        ]
+
     def __str__(self) -> str:
         """Return a string representation of the enrollment, showing learner and course details.
 
@@ -95,10 +295,68 @@ class Enrollment(models.Model):
         )
 
 
+class EnrollmentMonthlyRollupQuerySet(models.QuerySet):
+    def course_names(self, year: int, month: int, occupation: str) -> models.QuerySet:
+        """Return the names of courses that learners of ``occupation`` enrolled in that month.
+
+        Returns:
+            QuerySet: A flat, distinct ``values_list`` of course names.
+
+        """
+        return (
+            self.filter(month=date(year, month, 1), occupation=occupation, enrollments__gt=0)
+            .values_list("course__name", flat=True)
+            .distinct()
+        )
+
+
+# Enrollment counts per course, month, mode and learner occupation, kept up to date by signals
+class EnrollmentMonthlyRollup(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    # First day of the month
+    month = models.DateField()
+    mode = models.CharField(max_length=5, choices=Enrollment.COURSE_MODES)
+    occupation = models.CharField(max_length=20, choices=Learner.OCCUPATION_CHOICES)
+    enrollments = models.IntegerField(default=0)
+
+    objects = EnrollmentMonthlyRollupQuerySet.as_manager()
+
+    class Meta:
+        """Keep one row per bucket."""
+
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["month", "occupation", "course", "mode"],
+                name="ro_rollup_bucket_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.month:%Y-%m}: {self.enrollments} {self.occupation} enrollments "
+            f"({self.mode}) in course {self.course_id}"
+        )
+
+
+class LessonQuerySet(models.QuerySet):
+    def for_display(self) -> "LessonQuerySet":
+        """Join the course name ``__str__`` prints and defer every other column, content too.
+
+        Returns:
+            LessonQuerySet: The lessons with the columns of ``__str__`` loaded.
+
+        """
+        return self.select_related("course").only("title", "course__name")
+
+
 class Lesson(models.Model):
     title = models.CharField(max_length=200, default="title")
     course = models.ForeignKey(Course, null=True, on_delete=models.CASCADE)
     content = models.TextField()
+    # Kept current by the search receivers, see search.py. Only used on PostgreSQL.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = LessonQuerySet.as_manager()
 
     def __str__(self) -> str:
         """Return a string representation of the lesson, showing its title and course.
@@ -108,3 +366,7 @@ class Lesson(models.Model):
 
         """
         return f"Lesson: {self.title}, Course: {self.course.name if self.course else 'None'}"
+
+
+# The single-table Person snapshot is defined in people.py, imported here so the app registers it
+from .people import InstructorPerson, LearnerPerson, Person, PersonKindManager  # noqa: E402, F401
@@ -0,0 +1,153 @@
+"""Load a dataset with several worker processes, each inserting its own key range.
+
+The coordinator empties the tables and loads the small parent tables (instructors, courses,
+lessons) and the ``Course.instructors`` links itself. The learners are then split into key
+ranges, and a worker process loads each range's learners followed by their enrollments. The
+courses and the range's own learners already exist at that point. Workers build their model
+instances in parallel and write through their own database connection, one transaction per
+chunk. Once every range is in, the coordinator recomputes the derived data: sequences,
+``total_learners``, the enrollment rollup and the search index. The workers are spawned, they
+set Django up and open the coordinator's database through ``worker``.
+
+SQLite allows one writer at a time, so there the workers still build their chunks in parallel
+but take turns writing them. An in-memory database cannot be shared with other processes, so it
+is loaded range by range in the coordinator.
+
+Any dataset with the range methods of ``SyntheticDataset`` can be loaded, such as an import
+that reads its learners from a file.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from itertools import pairwise
+
+from django.db import connections, router
+
+from . import worker
+from .counters import reconcile_total_learners
+from .models import Course, Enrollment, Instructor, Learner, Lesson, User
+from .reset import reset_tables
+from .rollup import rebuild_enrollment_rollup
+from .search import rebuild_search_index
+from .seeding import (
+    DEFAULT_BATCH_SIZE,
+    bulk_load,
+    chunked,
+    link_course_instructors,
+    reset_sequences,
+)
+from .synthetic import SyntheticDataset
+
+
+def key_ranges(total: int, parts: int) -> list[tuple[int, int]]:
+    """Split ``[0, total)`` into at most ``parts`` contiguous ranges of near equal size.
+
+    Returns:
+        list[tuple[int, int]]: ``(start, stop)`` pairs covering every index once.
+
+    """
+    parts = max(1, min(parts, total))
+    size, extra = divmod(total, parts)
+    bounds = [index * size + min(index, extra) for index in range(parts + 1)]
+    return list(pairwise(bounds))
+
+
+def load_range(  # noqa: PLR0913
+    dataset: SyntheticDataset,
+    start: int,
+    stop: int,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    using: str | None = None,
+    write_lock: AbstractContextManager | None = None,
+) -> int:
+    """Insert the learners with index in ``[start, stop)`` and their enrollments.
+
+    Every chunk is built before ``write_lock`` is taken, so only the inserts are serialized.
+
+    Returns:
+        int: The number of enrollments inserted.
+
+    """
+    write_lock = write_lock or nullcontext()
+    total = 0
+    for model, objs in (
+        (Learner, dataset.learner_objects(start, stop)),
+        (Enrollment, dataset.enrollment_objects(start, stop)),
+    ):
+        for chunk in chunked(objs, batch_size):
+            with write_lock:
+                inserted = bulk_load(model, chunk, batch_size=batch_size, using=using)
+            total += inserted if model is Enrollment else 0
+    return total
+
+
+def load_parallel(
+    dataset: SyntheticDataset,
+    *,
+    workers: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    using: str | None = None,
+) -> int:
+    """Replace the contents of the related_objects tables with ``dataset``, in parallel.
+
+    ``workers`` defaults to the number of CPUs. With ``workers=0`` every range is loaded in
+    this process, which is also what happens for in-memory databases.
+
+    Returns:
+        int: The number of enrollments inserted.
+
+    """
+    using = using or router.db_for_write(Learner)
+    connection = connections[using]
+    reset_tables(using=using)
+    bulk_load(Instructor, dataset.instructor_objects(), batch_size=batch_size, using=using)
+    bulk_load(Course, dataset.course_objects(), batch_size=batch_size, using=using)
+    link_course_instructors(dataset.course_instructor_pairs(), batch_size=batch_size, using=using)
+    bulk_load(Lesson, dataset.lesson_objects(), batch_size=batch_size, using=using)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    in_memory = connection.vendor == "sqlite" and connection.is_in_memory_db()
+    ranges = key_ranges(dataset.learners, workers or 1)
+    if workers == 0 or in_memory:
+        total = sum(
+            load_range(dataset, start, stop, batch_size=batch_size, using=using)
+            for start, stop in ranges
+        )
+    else:
+        # Workers open their own connections, none is inherited from this process.
+        connections.close_all()
+        context = multiprocessing.get_context("spawn")
+        with (
+            context.Manager() as manager,
+            ProcessPoolExecutor(
+                workers,
+                mp_context=context,
+                initializer=worker.setup,
+                initargs=(using, connection.settings_dict),
+            ) as executor,
+        ):
+            write_lock = manager.Lock() if connection.vendor == "sqlite" else None
+            futures = [
+                executor.submit(
+                    worker.load_range,
+                    dataset,
+                    start,
+                    stop,
+                    batch_size=batch_size,
+                    using=using,
+                    write_lock=write_lock,
+                )
+                for start, stop in ranges
+            ]
+            total = sum(future.result() for future in futures)
+
+    # Users and courses were loaded with explicit ids.
+    reset_sequences(User, Course, using=using)
+    reconcile_total_learners(using=using)
+    rebuild_enrollment_rollup(batch_size=batch_size, using=using)
+    rebuild_search_index(using=using)
+    return total
@@ -0,0 +1,106 @@
+"""Async counterparts of the related_objects reporting queries, and a concurrent runner.
+
+The queries use Django's async ORM (``aget`` and ``async for``). On their own, Django runs
+every async ORM call on one shared thread, so gathering them does not overlap anything.
+``gather_queries`` runs each query on its own worker thread, and so with its own database
+connection. That lets up to ``concurrency`` queries wait on the database at the same time, and
+a report then takes about as long as its slowest query.
+
+Each query opens a connection and closes it when done. Use the pooled ``dbpool`` backend to
+keep that cheap.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import date
+from typing import Any
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connections
+
+from .models import Course, EnrollmentMonthlyRollup, Learner
+
+DEFAULT_CONCURRENCY = 4
+
+Query = Callable[[], Awaitable[Any]]
+
+
+async def learner_by_name(first_name: str) -> Learner:
+    """Return the learner with the given first name."""
+    return await Learner.objects.select_related("user_ptr").aget(first_name=first_name)
+
+
+async def course_learners(course_name: str) -> list[Learner]:
+    """Return the learners enrolled in the named course."""
+    return [learner async for learner in Learner.objects.filter(course__name=course_name)]
+
+
+async def occupations_taught_by(instructor_first_name: str) -> set[str]:
+    """Return the occupations of the learners in the courses an instructor teaches."""
+    occupations = Course.objects.taught_by(instructor_first_name).learner_occupations()
+    return {occupation async for occupation in occupations}
+
+
+async def courses_in_month(year: int, month: int, occupation: str) -> set[str]:
+    """Return the names of the courses learners of an occupation enrolled in that month."""
+    names = EnrollmentMonthlyRollup.objects.course_names(year, month, occupation)
+    return {name async for name in names}
+
+
+async def _call(query: Query) -> object:
+    return await query()
+
+
+def _run_on_this_thread(query: Query) -> object:
+    """Run ``query`` with this thread as the one its async ORM calls are sent to."""
+    try:
+        return async_to_sync(_call)(query)
+    finally:
+        connections.close_all()
+
+
+async def _run_isolated(query: Query, semaphore: asyncio.Semaphore) -> object:
+    async with semaphore:
+        return await sync_to_async(_run_on_this_thread, thread_sensitive=False)(query)
+
+
+async def gather_queries(
+    queries: Mapping[str, Query],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict[str, Any]:
+    """Run independent queries concurrently, at most ``concurrency`` at a time.
+
+    Returns:
+        dict[str, Any]: The result of every query, under the query's name.
+
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    runs = [_run_isolated(query, semaphore) for query in queries.values()]
+    results = await asyncio.gather(*runs)
+    return dict(zip(queries, results, strict=True))
+
+
+def enrollment_report_queries(month: date = date(2020, 8, 1)) -> dict[str, Query]:
+    """Return the independent queries of ``read_enrollments.py``.
+
+    Returns:
+        dict[str, Query]: Zero-argument coroutine functions, keyed by report line.
+
+    """
+    return {
+        "learner_david": lambda: learner_by_name("David"),
+        "introduction_to_python_learners": lambda: course_learners("Introduction to Python"),
+        "occupations_taught_by_yan": lambda: occupations_taught_by("Yan"),
+        "developer_courses": lambda: courses_in_month(month.year, month.month, Learner.DEVELOPER),
+    }
+
+
+async def enrollment_report(*, concurrency: int = DEFAULT_CONCURRENCY) -> dict[str, Any]:
+    """Run the ``read_enrollments.py`` report with its queries in parallel.
+
+    Returns:
+        dict[str, Any]: The result of every report line.
+
+    """
+    return await gather_queries(enrollment_report_queries(), concurrency=concurrency)
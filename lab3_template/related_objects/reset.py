@@ -0,0 +1,95 @@
+"""Set-based table reset for the related_objects models.
+
+``QuerySet.delete()`` runs Django's deletion collector, which loads every row into memory and
+cascades in Python. ``reset_tables`` wipes the app's tables with plain SQL instead, so memory use
+stays flat however many rows there are.
+"""
+
+from graphlib import TopologicalSorter
+
+from django.core.management.color import no_style
+from django.db import connections, router, transaction
+
+from .autocomplete import name_indexes
+from .models import Course
+from .staffing import staffing_cache
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def tables_in_delete_order() -> list[str]:
+    """Return the app's tables, including M2M tables, ordered so referencing tables come first.
+
+    Returns:
+        list[str]: Table names that can be emptied one by one without violating a foreign key.
+
+    """
+    references: dict[str, set[str]] = {}
+    for model in Course._meta.app_config.get_models(include_auto_created=True):  # noqa: SLF001
+        opts = model._meta  # noqa: SLF001
+        if not opts.managed or opts.proxy:
+            continue
+        references[opts.db_table] = {
+            field.related_model._meta.db_table  # noqa: SLF001
+            for field in opts.local_concrete_fields
+            if field.is_relation and field.related_model is not model
+        }
+    # static_order() lists referenced tables first, deleting needs the reverse.
+    order = [
+        table for table in TopologicalSorter(references).static_order() if table in references
+    ]
+    return order[::-1]
+
+
+def _delete_in_batches(using: str, tables: list[str], batch_size: int) -> None:
+    """Empty ``tables`` on SQLite in rowid batches and restart their AUTOINCREMENT counters."""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    for table in tables:
+        sql = (
+            f"DELETE FROM {quote(table)} WHERE rowid IN "  # noqa: S608
+            f"(SELECT rowid FROM {quote(table)} LIMIT %s)"
+        )
+        deleted = batch_size
+        while deleted == batch_size:
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                cursor.execute(sql, [batch_size])
+                deleted = cursor.rowcount
+    connection.ops.execute_sql_flush(
+        connection.ops.sequence_reset_by_name_sql(
+            no_style(),
+            [{"table": table, "column": None} for table in tables],
+        ),
+    )
+
+
+def reset_tables(*, using: str | None = None, batch_size: int = DEFAULT_BATCH_SIZE) -> list[str]:
+    """Delete every row of the app's tables and restart their primary key sequences.
+
+    PostgreSQL gets a single ``TRUNCATE ... RESTART IDENTITY CASCADE``. SQLite deletes each table
+    in batches of ``batch_size`` rows, referencing tables first, and then resets
+    ``sqlite_sequence``. Other backends fall back to Django's own flush statements. The staffing
+    cache is cleared as well, since the restarted ids will name new rows.
+
+    Returns:
+        list[str]: The tables that were emptied, in the order they were processed.
+
+    """
+    using = using or router.db_for_write(Course)
+    connection = connections[using]
+    tables = tables_in_delete_order()
+    if connection.vendor == "sqlite":
+        _delete_in_batches(using, tables, batch_size)
+    else:
+        sql_list = connection.ops.sql_flush(
+            no_style(),
+            tables,
+            reset_sequences=True,
+            allow_cascade=True,
+        )
+        connection.ops.execute_sql_flush(sql_list)
+    staffing_cache.clear()
+    # The ids restart, a snapshot would answer with ids that now belong to other people
+    for index in name_indexes.values():
+        index.clear()
+    return tables
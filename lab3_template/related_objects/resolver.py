@@ -0,0 +1,134 @@
+"""Batched natural-key resolution for building relationship rows.
+
+Linking learners to courses by looking each one up with ``get()`` costs a query per reference.
+A ``NaturalKeyResolver`` instead collects every key a batch of rows references and resolves
+them with one ``IN`` query per model, then builds the rows with the primary keys filled in.
+Resolved keys stay cached for the life of the resolver, typically one load, so later batches
+only query the keys they add. Keys that match no row or several rows are all reported together
+in one ``UnresolvedKeysError``.
+
+Keys default to the models' ``NATURAL_KEYS``. A key with a single field may be given as a bare
+value instead of a one-element tuple.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+from functools import reduce
+from operator import or_
+
+from django.db import router
+from django.db.models import Model, Q
+
+from .seeding import DEFAULT_BATCH_SIZE, chunked
+from .sync import NATURAL_KEYS
+
+
+class UnresolvedKeysError(LookupError):
+    """Some natural keys matched no row, or more than one."""
+
+    def __init__(
+        self,
+        missing: Mapping[str, list[tuple]],
+        ambiguous: Mapping[str, list[tuple]],
+    ) -> None:
+        """Keep the missing and ambiguous keys by model label and describe them all."""
+        self.missing = dict(missing)
+        self.ambiguous = dict(ambiguous)
+        problems = [f"missing {label}: {keys}" for label, keys in self.missing.items()]
+        problems += [f"ambiguous {label}: {keys}" for label, keys in self.ambiguous.items()]
+        super().__init__("Unresolved natural keys, " + "; ".join(problems))
+
+
+def _as_key(value: object) -> tuple:
+    return value if isinstance(value, tuple) else (value,)
+
+
+class NaturalKeyResolver:
+    """Resolve natural keys to primary keys with one query per model and batch."""
+
+    def __init__(
+        self,
+        natural_keys: Mapping[type[Model], Sequence[str]] | None = None,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        using: str | None = None,
+    ) -> None:
+        """Resolve with ``natural_keys``, which override the default key fields per model."""
+        self.natural_keys = {**NATURAL_KEYS, **(natural_keys or {})}
+        self.batch_size = batch_size
+        self.using = using
+        self._pks: dict[type[Model], dict[tuple, object]] = defaultdict(dict)
+
+    def resolve(self, keys: Mapping[type[Model], Iterable[object]]) -> None:
+        """Look up the keys not cached yet, with one ``IN`` query per model and batch.
+
+        Raises:
+            UnresolvedKeysError: Listing every key that matched no row or more than one.
+
+        """
+        missing: dict[str, list[tuple]] = {}
+        ambiguous: dict[str, list[tuple]] = {}
+        for model, model_keys in keys.items():
+            cached = self._pks[model]
+            pending = {_as_key(key) for key in model_keys} - cached.keys()
+            fields = self.natural_keys[model]
+            queryset = model._base_manager.using(self.using or router.db_for_read(model))  # noqa: SLF001
+            found: dict[tuple, list[object]] = defaultdict(list)
+            for chunk in chunked(sorted(pending, key=repr), self.batch_size):
+                if len(fields) == 1:
+                    condition = Q(**{f"{fields[0]}__in": [key[0] for key in chunk]})
+                else:
+                    matches = (Q(**dict(zip(fields, key, strict=True))) for key in chunk)
+                    condition = reduce(or_, matches)
+                for pk, *values in queryset.filter(condition).values_list("pk", *fields):
+                    found[tuple(values)].append(pk)
+            for key in pending:
+                pks = found.get(key, [])
+                if len(pks) == 1:
+                    cached[key] = pks[0]
+                else:
+                    problems = ambiguous if pks else missing
+                    problems.setdefault(model._meta.label, []).append(key)  # noqa: SLF001
+        if missing or ambiguous:
+            raise UnresolvedKeysError(missing, ambiguous)
+
+    def pk(self, model: type[Model], key: object) -> object:
+        """Return the primary key of the ``model`` row with natural key ``key``.
+
+        Returns:
+            object: The primary key, resolved with a query unless cached.
+
+        """
+        self.resolve({model: [key]})
+        return self._pks[model][_as_key(key)]
+
+    def build(
+        self,
+        model: type[Model],
+        rows: Iterable[Mapping[str, object]],
+        **references: type[Model],
+    ) -> list[Model]:
+        """Return unsaved ``model`` objects, with the natural keys of ``references`` resolved.
+
+        Every row maps field names to values. The value of a field named in ``references``,
+        such as ``learner=Learner``, is a natural key of that model, and the object gets the
+        key's primary key as that foreign key. All keys of all rows are resolved up front.
+
+        Returns:
+            list[Model]: One unsaved object per row.
+
+        """
+        rows = list(rows)
+        # Several fields may reference the same model, their keys are resolved together.
+        keys: dict[type[Model], list[object]] = defaultdict(list)
+        for name, target in references.items():
+            keys[target].extend(row[name] for row in rows)
+        self.resolve(keys)
+        objs = []
+        for row in rows:
+            values = {name: value for name, value in row.items() if name not in references}
+            for name, target in references.items():
+                attname = model._meta.get_field(name).attname  # noqa: SLF001
+                values[attname] = self._pks[target][_as_key(row[name])]
+            objs.append(model(**values))
+        return objs
@@ -0,0 +1,100 @@
+"""Maintenance of the ``EnrollmentMonthlyRollup`` table.
+
+Each rollup row counts the enrollments of one course, month, mode and learner occupation. The
+receivers in ``signals.py`` move single enrollments between buckets as they are created,
+changed or deleted. ``rebuild_enrollment_rollup`` recomputes the whole table with one grouped
+query, for use after bulk loads or learner occupation changes made with ``update()``.
+"""
+
+from collections.abc import Iterator
+from datetime import date
+
+from django.db import IntegrityError, router, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+
+from .models import Enrollment, EnrollmentMonthlyRollup
+from .seeding import DEFAULT_BATCH_SIZE, bulk_load
+
+# A bucket is the course id, first day of the month, mode and learner occupation.
+Bucket = tuple[int, date, str, str]
+
+
+def bucket_of(course_id: int, date_enrolled: date, mode: str, occupation: str) -> Bucket:
+    """Return the rollup bucket an enrollment with these values is counted in."""
+    return course_id, date_enrolled.replace(day=1), mode, occupation
+
+
+def bump(bucket: Bucket, delta: int) -> None:
+    """Add ``delta`` to a bucket's count, creating the row when an increment finds none.
+
+    Decrements never create rows. A missing row means the course is being deleted and its
+    rollup rows have already been removed by the cascade.
+
+    """
+    course_id, month, mode, occupation = bucket
+    buckets = EnrollmentMonthlyRollup.objects.filter(
+        course_id=course_id,
+        month=month,
+        mode=mode,
+        occupation=occupation,
+    )
+    if buckets.update(enrollments=F("enrollments") + delta) or delta <= 0:
+        return
+    try:
+        with transaction.atomic(using=router.db_for_write(EnrollmentMonthlyRollup)):
+            EnrollmentMonthlyRollup.objects.create(
+                course_id=course_id,
+                month=month,
+                mode=mode,
+                occupation=occupation,
+                enrollments=delta,
+            )
+    except IntegrityError:
+        # Another transaction created the bucket first.
+        buckets.update(enrollments=F("enrollments") + delta)
+
+
+def move(old: Bucket | None, new: Bucket | None, count: int = 1) -> None:
+    """Move ``count`` enrollments from bucket ``old`` to bucket ``new``, either may be None."""
+    if old == new:
+        return
+    if old is not None:
+        bump(old, -count)
+    if new is not None:
+        bump(new, count)
+
+
+def _grouped_buckets(using: str) -> Iterator[EnrollmentMonthlyRollup]:
+    rows = (
+        Enrollment.objects.using(using)
+        .annotate(month=TruncMonth("date_enrolled"))
+        .values("course_id", "month", "mode", occupation=F("learner__occupation"))
+        .annotate(enrollments=Count("pk"))
+        .order_by()
+    )
+    for row in rows.iterator():
+        yield EnrollmentMonthlyRollup(**row)
+
+
+def rebuild_enrollment_rollup(
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    using: str | None = None,
+) -> int:
+    """Replace the rollup table with counts grouped from the enrollment rows.
+
+    Returns:
+        int: The number of rollup rows written.
+
+    """
+    using = using or router.db_for_write(EnrollmentMonthlyRollup)
+    with transaction.atomic(using=using):
+        # Nothing references the rollup rows, so this is a single DELETE statement.
+        EnrollmentMonthlyRollup.objects.using(using).all().delete()
+        return bulk_load(
+            EnrollmentMonthlyRollup,
+            _grouped_buckets(using),
+            batch_size=batch_size,
+            using=using,
+        )
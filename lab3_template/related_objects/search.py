@@ -0,0 +1,235 @@
+"""Ranked full-text search over course names and descriptions and lesson titles and contents.
+
+``search`` finds the courses and lessons containing every word of a query, best match first.
+Words are stemmed, so "databases" also finds "database". Two backends implement it:
+
+* PostgreSQL keeps a weighted ``tsvector`` in the ``search_vector`` column of each table, with
+  a GIN index on it, and ranks with ``ts_rank``.
+* SQLite keeps an FTS5 table per model, ``<table>_fts``, whose rowid is the object's primary key,
+  and ranks with ``bm25``.
+
+Either way the title (the course name or lesson title) weighs more than the body. The receivers
+in ``signals.py`` index every saved object and drop deleted ones. Bulk loads skip them, so run
+``rebuild_search_index`` after an import. Each model is ranked against its own documents, so on
+SQLite ranks of courses and lessons are only roughly comparable.
+"""
+
+from dataclasses import dataclass
+from heapq import merge
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import NotSupportedError, connections, router, transaction
+from django.db.models import F, Model
+
+from .models import Course, Lesson
+
+DEFAULT_LIMIT = 20
+# Text search configuration of PostgreSQL, it sets the language of the stemmer.
+SEARCH_CONFIG = "english"
+
+# The title and body field of every searchable model.
+DOCUMENTS: dict[type[Model], tuple[str, str]] = {
+    Course: ("name", "description"),
+    Lesson: ("title", "content"),
+}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A course or lesson matching a search, with its rank, higher is better."""
+
+    item: Model
+    rank: float
+
+
+class PostgresSearch:
+    """Search through the GIN-indexed ``search_vector`` columns."""
+
+    def __init__(self, using: str) -> None:
+        """Search the database ``using``."""
+        self.using = using
+
+    @staticmethod
+    def vector(model: type[Model]) -> SearchVector:
+        """Return the weighted vector a ``model`` row is indexed by.
+
+        Returns:
+            SearchVector: The title with weight A and the body with weight B.
+
+        """
+        title, body = DOCUMENTS[model]
+        return SearchVector(title, weight="A", config=SEARCH_CONFIG) + SearchVector(
+            body,
+            weight="B",
+            config=SEARCH_CONFIG,
+        )
+
+    def index(self, obj: Model) -> None:
+        """Recompute the search vector of one object."""
+        model = type(obj)
+        model.objects.using(self.using).filter(pk=obj.pk).update(search_vector=self.vector(model))
+
+    def unindex(self, obj: Model) -> None:
+        """Do nothing, the vector is deleted with its row."""
+
+    def rebuild(self) -> int:
+        """Recompute every search vector, with one UPDATE per table.
+
+        Returns:
+            int: The number of objects indexed.
+
+        """
+        with transaction.atomic(using=self.using):
+            return sum(
+                model.objects.using(self.using).update(search_vector=self.vector(model))
+                for model in DOCUMENTS
+            )
+
+    def search(self, model: type[Model], text: str, limit: int) -> list[SearchHit]:
+        """Return the best ``limit`` matches of ``text`` among the ``model`` rows.
+
+        Returns:
+            list[SearchHit]: The matches, best first.
+
+        """
+        query = SearchQuery(text, config=SEARCH_CONFIG)
+        matches = (
+            model.objects.using(self.using)
+            .filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .defer("search_vector")
+            .order_by("-rank", "pk")
+        )
+        return [SearchHit(item, item.rank) for item in matches[:limit]]
+
+
+class SQLiteSearch:
+    """Search through one FTS5 table per model."""
+
+    # Column weights of bm25(), the title counts twice as much as the body.
+    WEIGHTS = (2.0, 1.0)
+
+    def __init__(self, using: str) -> None:
+        """Search the database ``using``."""
+        self.using = using
+        self.connection = connections[using]
+
+    def table(self, model: type[Model]) -> str:
+        """Return the quoted name of the FTS5 table of ``model``."""
+        return self.connection.ops.quote_name(f"{model._meta.db_table}_fts")  # noqa: SLF001
+
+    def index(self, obj: Model) -> None:
+        """Replace the indexed title and body of one object."""
+        table = self.table(type(obj))
+        title, body = (getattr(obj, name) for name in DOCUMENTS[type(obj)])
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [obj.pk])  # noqa: S608
+            cursor.execute(
+                f"INSERT INTO {table} (rowid, title, body) VALUES (%s, %s, %s)",  # noqa: S608
+                [obj.pk, title, body],
+            )
+
+    def unindex(self, obj: Model) -> None:
+        """Remove one object from the index."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table(type(obj))} WHERE rowid = %s", [obj.pk])  # noqa: S608
+
+    def rebuild(self) -> int:
+        """Refill every FTS5 table from its model's table, with one INSERT per table.
+
+        Returns:
+            int: The number of objects indexed.
+
+        """
+        quote = self.connection.ops.quote_name
+        total = 0
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            for model, (title, body) in DOCUMENTS.items():
+                table = self.table(model)
+                opts = model._meta  # noqa: SLF001
+                cursor.execute(f"DELETE FROM {table}")  # noqa: S608
+                cursor.execute(
+                    f"INSERT INTO {table} (rowid, title, body) "  # noqa: S608
+                    f"SELECT {quote(opts.pk.column)}, {quote(title)}, {quote(body)} "
+                    f"FROM {quote(opts.db_table)}",
+                )
+                total += cursor.rowcount
+                # Merge the index segments written by the bulk insert.
+                cursor.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")  # noqa: S608
+        return total
+
+    def search(self, model: type[Model], text: str, limit: int) -> list[SearchHit]:
+        """Return the best ``limit`` matches of ``text`` among the ``model`` rows.
+
+        Returns:
+            list[SearchHit]: The matches, best first.
+
+        """
+        # Quoting every word keeps FTS5 query syntax out of user input, the words are ANDed.
+        match = " ".join('"{}"'.format(word.replace('"', '""')) for word in text.split())
+        table = self.table(model)
+        weights = ", ".join(map(str, self.WEIGHTS))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, bm25({table}, {weights}) AS score FROM {table} "  # noqa: S608
+                f"WHERE {table} MATCH %s ORDER BY score, rowid LIMIT %s",
+                [match, limit],
+            )
+            scores = cursor.fetchall()
+        items = model.objects.using(self.using).in_bulk([pk for pk, _ in scores])
+        # bm25() scores are negative, lower is better.
+        return [SearchHit(items[pk], -score) for pk, score in scores if pk in items]
+
+
+BACKENDS = {"postgresql": PostgresSearch, "sqlite": SQLiteSearch}
+
+
+def search_backend(using: str | None = None) -> PostgresSearch | SQLiteSearch:
+    """Return the search backend of the database ``using``, by default the one courses use.
+
+    Returns:
+        PostgresSearch | SQLiteSearch: The backend for the database's vendor.
+
+    Raises:
+        NotSupportedError: When the database is neither PostgreSQL nor SQLite.
+
+    """
+    using = using or router.db_for_write(Course)
+    vendor = connections[using].vendor
+    if vendor not in BACKENDS:
+        msg = f"Full-text search is not supported on {vendor}."
+        raise NotSupportedError(msg)
+    return BACKENDS[vendor](using)
+
+
+def search(
+    text: str,
+    *,
+    models: tuple[type[Model], ...] = tuple(DOCUMENTS),
+    limit: int = DEFAULT_LIMIT,
+    using: str | None = None,
+) -> list[SearchHit]:
+    """Return the courses and lessons containing every word of ``text``, best match first.
+
+    Returns:
+        list[SearchHit]: At most ``limit`` matches over all ``models``.
+
+    """
+    if not text.split():
+        return []
+    backend = search_backend(using)
+    hits = merge(
+        *(backend.search(model, text, limit) for model in models),
+        key=lambda hit: -hit.rank,
+    )
+    return list(hits)[:limit]
+
+
+def rebuild_search_index(*, using: str | None = None) -> int:
+    """Reindex every course and lesson, for use after bulk loads.
+
+    Returns:
+        int: The number of objects indexed.
+
+    """
+    return search_backend(using).rebuild()
@@ -0,0 +1,158 @@
+"""Bulk loading helpers for the related_objects models.
+
+``QuerySet.bulk_create`` refuses multi-table inherited models such as ``Instructor`` and
+``Learner``. The helpers below insert the parent ``User`` rows first, copy the returned primary
+keys onto the child ``user_ptr`` links and then insert the child rows, one chunk per transaction.
+"""
+
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import NotSupportedError, connections, router, transaction
+from django.db.models import Model
+from django.db.models.sql import InsertQuery
+
+from .models import Course
+from .staffing import staffing_cache
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _insert_local_rows(model: type[Model], objs: list[Model], using: str) -> None:
+    """Insert only the columns stored in ``model``'s own table for every object.
+
+    Like ``bulk_create``, the rows are split into as many statements as the backend's limit on
+    query parameters requires, such as SQLite's ``max_query_params``.
+    """
+    fields = model._meta.local_concrete_fields  # noqa: SLF001
+    batch_size = max(connections[using].ops.bulk_batch_size(fields, objs), 1)
+    for batch in chunked(objs, batch_size):
+        query = InsertQuery(model)
+        query.insert_values(fields, batch)
+        query.get_compiler(using=using).execute_sql()
+
+
+def _bulk_insert_inherited(model: type[Model], objs: list[Model], using: str) -> None:
+    """Insert the parent rows and then the child rows of multi-table inherited objects."""
+    opts = model._meta  # noqa: SLF001
+    if not connections[using].features.can_return_rows_from_bulk_insert:
+        msg = f"Bulk loading {opts.label} needs a database that returns ids from bulk inserts."
+        raise NotSupportedError(msg)
+
+    # Ancestors are ordered nearest first, the root parent owns the primary key. Objects that
+    # already carry a primary key keep it, the others get one assigned by the database.
+    *intermediates, root = opts.get_parent_list()
+    root_fields = [f for f in root._meta.concrete_fields if not f.primary_key]  # noqa: SLF001
+    parents = [
+        root(pk=obj.pk, **{f.attname: getattr(obj, f.attname) for f in root_fields})
+        for obj in objs
+    ]
+    root._base_manager.using(using).bulk_create(parents)  # noqa: SLF001
+
+    chain = [model, *intermediates]
+    for obj, parent in zip(objs, parents, strict=True):
+        for link in (link for m in chain for link in m._meta.parents.values()):  # noqa: SLF001
+            setattr(obj, link.attname, parent.pk)
+
+    for intermediate in reversed(intermediates):
+        _insert_local_rows(intermediate, objs, using)
+    _insert_local_rows(model, objs, using)
+
+    for obj in objs:
+        obj._state.adding = False  # noqa: SLF001
+        obj._state.db = using  # noqa: SLF001
+
+
+def bulk_load(
+    model: type[Model],
+    objs: Iterable[Model],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    using: str | None = None,
+) -> int:
+    """Insert ``objs`` in chunks of ``batch_size``, each chunk inside its own transaction.
+
+    ``objs`` may be any iterable, including a generator, so very large datasets never have to
+    be held in memory at once. Multi-table inherited models get their parent rows inserted as
+    well, and primary keys are set on the objects as they are saved. Loaded
+    ``Course.instructors`` links drop the staffing cache entries they make stale.
+
+    Returns:
+        int: The number of objects inserted.
+
+    """
+    using = using or router.db_for_write(model)
+    # Proxies list their concrete model as a parent, only concrete parents mean another table.
+    inherited = bool(model._meta.concrete_model._meta.parents)  # noqa: SLF001
+    links = model is Course.instructors.through
+    total = 0
+    for chunk in chunked(objs, batch_size):
+        with transaction.atomic(using=using):
+            if inherited:
+                _bulk_insert_inherited(model, chunk, using)
+            else:
+                model._base_manager.using(using).bulk_create(chunk)  # noqa: SLF001
+        if links:
+            staffing_cache.invalidate_links(
+                ((obj.course_id, obj.instructor_id) for obj in chunk),
+                using=using,
+            )
+        total += len(chunk)
+    return total
+
+
+def link_course_instructors(
+    pairs: Iterable[tuple[int, int]],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    using: str | None = None,
+) -> int:
+    """Insert ``Course.instructors`` rows from ``(course_id, instructor_id)`` pairs in bulk.
+
+    Existing links are skipped, mirroring ``course.instructors.add()``, and the staffing cache
+    entries of both sides are dropped.
+
+    Returns:
+        int: The number of pairs submitted.
+
+    """
+    through = Course.instructors.through
+    rows = (
+        through(course_id=course_id, instructor_id=instructor_id)
+        for course_id, instructor_id in pairs
+    )
+    using = using or router.db_for_write(through)
+    total = 0
+    for chunk in chunked(rows, batch_size):
+        with transaction.atomic(using=using):
+            through._base_manager.using(using).bulk_create(chunk, ignore_conflicts=True)  # noqa: SLF001
+        staffing_cache.invalidate_links(
+            ((obj.course_id, obj.instructor_id) for obj in chunk),
+            using=using,
+        )
+        total += len(chunk)
+    return total
+
+
+def reset_sequences(*models: type[Model], using: str | None = None) -> None:
+    """Move the primary key sequences of ``models`` past the highest id in their tables.
+
+    Needed after loading rows with explicit primary keys, which does not advance PostgreSQL
+    sequences. Backends without sequences, such as SQLite, get no statements.
+
+    """
+    using = using or router.db_for_write(models[0])
+    connection = connections[using]
+    sql_list = connection.ops.sequence_reset_sql(no_style(), models)
+    if sql_list:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            for sql in sql_list:
+                cursor.execute(sql)
@@ -0,0 +1,244 @@
+"""Signal receivers for the related_objects models."""
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import rollup
+from .autocomplete import name_indexes
+from .counters import add_course_learners, add_learners, count_enrollments
+from .models import Course, Enrollment, Instructor, Learner, Lesson, User
+from .search import DOCUMENTS, search_backend
+from .staffing import staffing_cache
+
+ROLLUP_FIELDS = ("course_id", "date_enrolled", "mode", "learner__occupation")
+
+
+def _bucket(instance: Enrollment) -> rollup.Bucket:
+    return rollup.bucket_of(
+        instance.course_id,
+        instance.date_enrolled,
+        instance.mode,
+        Learner.objects.values_list("occupation", flat=True).get(pk=instance.learner_id),
+    )
+
+
+@receiver(pre_save, sender=Enrollment)
+def remember_previous_enrollment(
+    instance: Enrollment,
+    raw: bool,  # noqa: FBT001
+    **kwargs: object,  # noqa: ARG001
+) -> None:
+    """Store the course and rollup bucket an existing enrollment had before this save."""
+    if not instance._state.adding and not raw:  # noqa: SLF001
+        previous = Enrollment.objects.filter(pk=instance.pk).values_list(*ROLLUP_FIELDS).first()
+        if previous is not None:
+            instance._previous_course_id = previous[0]  # noqa: SLF001
+            instance._previous_bucket = rollup.bucket_of(*previous)  # noqa: SLF001
+
+
+@receiver(post_save, sender=Enrollment)
+def count_saved_enrollment(
+    instance: Enrollment,
+    created: bool,  # noqa: FBT001
+    raw: bool,  # noqa: FBT001
+    **kwargs: object,  # noqa: ARG001
+) -> None:
+    """Count a new enrollment, or move an existing one to its new course and rollup bucket."""
+    if raw:
+        return
+    if created:
+        add_course_learners(instance.course_id, 1)
+        rollup.bump(_bucket(instance), 1)
+        return
+    rollup.move(instance.__dict__.pop("_previous_bucket", None), _bucket(instance))
+    previous = instance.__dict__.pop("_previous_course_id", None)
+    if previous is not None and previous != instance.course_id:
+        add_course_learners(previous, -1)
+        add_course_learners(instance.course_id, 1)
+
+
+@receiver(post_delete, sender=Enrollment)
+def uncount_deleted_enrollment(instance: Enrollment, **kwargs: object) -> None:  # noqa: ARG001
+    """Remove a deleted enrollment from its instructors' counters and from its rollup bucket."""
+    add_course_learners(instance.course_id, -1)
+    rollup.bump(_bucket(instance), -1)
+
+
+@receiver(pre_save, sender=Learner)
+def remember_previous_occupation(
+    instance: Learner,
+    raw: bool,  # noqa: FBT001
+    **kwargs: object,  # noqa: ARG001
+) -> None:
+    """Store the occupation an existing learner had before this save."""
+    if not instance._state.adding and not raw:  # noqa: SLF001
+        instance._previous_occupation = (  # noqa: SLF001
+            Learner.objects.filter(pk=instance.pk).values_list("occupation", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Learner)
+def move_learner_enrollments(
+    instance: Learner,
+    raw: bool,  # noqa: FBT001
+    **kwargs: object,  # noqa: ARG001
+) -> None:
+    """Move a learner's enrollments to the rollup buckets of their new occupation."""
+    previous = instance.__dict__.pop("_previous_occupation", None)
+    if raw or previous is None or previous == instance.occupation:
+        return
+    groups = (
+        Enrollment.objects.filter(learner=instance)
+        .values_list("course_id", "date_enrolled", "mode")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    for course_id, date_enrolled, mode, count in groups:
+        rollup.move(
+            rollup.bucket_of(course_id, date_enrolled, mode, previous),
+            rollup.bucket_of(course_id, date_enrolled, mode, instance.occupation),
+            count,
+        )
+
+
+@receiver(pre_delete, sender=Course)
+def uncount_deleted_course(instance: Course, **kwargs: object) -> None:  # noqa: ARG001
+    """Remove a course's enrollments from its instructors before the course is deleted.
+
+    The course's instructor links are deleted before its enrollments, so the enrollment
+    receivers find no instructors left to update.
+
+    """
+    add_course_learners(instance.pk, -count_enrollments([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Course.instructors.through)
+def count_staffing_change(
+    instance: Course | Instructor,
+    action: str,
+    reverse: bool,  # noqa: FBT001
+    pk_set: set[int] | None,
+    **kwargs: object,  # noqa: ARG001
+) -> None:
+    """Move enrollment counts when instructors are added to or removed from courses.
+
+    ``reverse`` is set when the change goes through ``instructor.course_set``, in which case
+    ``instance`` is the instructor and ``pk_set`` holds course ids. ``remove()`` passes every
+    id it was given, so only the ids that were linked before the change are uncounted.
+
+    """
+    if action in {"pre_clear", "pre_remove"}:
+        related = instance.course_set if reverse else instance.instructors
+        if pk_set is not None:
+            related = related.filter(pk__in=pk_set)
+        instance._unlinked_pks = set(related.values_list("pk", flat=True))  # noqa: SLF001
+        return
+    if action in {"post_clear", "post_remove"}:
+        action, pk_set = "post_remove", instance.__dict__.pop("_unlinked_pks", set())
+    if action not in {"post_add", "post_remove"} or not pk_set:
+        return
+    sign = 1 if action == "post_add" else -1
+    if reverse:
+        add_learners([instance.pk], sign * count_enrollments(pk_set))
+    else:
+        add_learners(pk_set, sign * count_enrollments([instance.pk]))
+
+
+def _staffing_related_ids(instance: Course | Instructor) -> list[int]:
+    """Return the ids on the other side of the staffing relation of a course or instructor."""
+    through = Course.instructors.through.objects
+    if isinstance(instance, Course):
+        return list(through.filter(course_id=instance.pk).values_list("instructor_id", flat=True))
+    return list(through.filter(instructor_id=instance.pk).values_list("course_id", flat=True))
+
+
+@receiver(pre_delete, sender=Course)
+@receiver(pre_delete, sender=Instructor)
+def remember_deleted_staffing(instance: Course | Instructor, **kwargs: object) -> None:  # noqa: ARG001
+    """Store the related ids of a course or instructor before its join rows are deleted."""
+    instance._staffing_related_ids = _staffing_related_ids(instance)  # noqa: SLF001
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Instructor)
+def invalidate_deleted_staffing(
+    instance: Course | Instructor,
+    using: str,
+    **kwargs: object,  # noqa: ARG001
+) -> None:
+    """Drop the cached staffing entries of a deleted course or instructor and its partners.
+
+    Django sends no delete signals for the join rows themselves, the course or instructor
+    stands in for its links.
+
+    """
+    related_ids = instance.__dict__.pop("_staffing_related_ids", [])
+    if isinstance(instance, Course):
+        course_ids, instructor_ids = [instance.pk], related_ids
+    else:
+        course_ids, instructor_ids = related_ids, [instance.pk]
+    staffing_cache.invalidate(course_ids, instructor_ids, using=using)
+
+
+@receiver(m2m_changed, sender=Course.instructors.through)
+def invalidate_staffing_change(
+    instance: Course | Instructor,
+    action: str,
+    reverse: bool,  # noqa: FBT001
+    pk_set: set[int] | None,
+    using: str,
+    **kwargs: object,  # noqa: ARG001
+) -> None:
+    """Drop the cached staffing entries on both sides of every added or removed link."""
+    if action == "pre_clear":
+        instance._staffing_cleared_pks = _staffing_related_ids(instance)  # noqa: SLF001
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_staffing_cleared_pks", [])
+    elif action not in {"post_add", "post_remove"}:
+        return
+    if reverse:
+        staffing_cache.invalidate(pk_set or [], [instance.pk], using=using)
+    else:
+        staffing_cache.invalidate([instance.pk], pk_set or [], using=using)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Lesson)
+def index_saved_document(
+    instance: Course | Lesson,
+    raw: bool,  # noqa: FBT001
+    using: str,
+    update_fields: frozenset[str] | None,
+    **kwargs: object,  # noqa: ARG001
+) -> None:
+    """Reindex a saved course or lesson, unless the save left its searched fields alone."""
+    if raw or (update_fields is not None and not update_fields & set(DOCUMENTS[type(instance)])):
+        return
+    search_backend(using).index(instance)
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Lesson)
+def unindex_deleted_document(instance: Course | Lesson, using: str, **kwargs: object) -> None:  # noqa: ARG001
+    """Remove a deleted course or lesson from the search index."""
+    search_backend(using).unindex(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Instructor)
+@receiver(post_save, sender=Learner)
+def index_saved_name(instance: User, using: str, **kwargs: object) -> None:  # noqa: ARG001
+    """Update the autocomplete snapshots holding a saved user, once the save is committed."""
+    for index in name_indexes.values():
+        transaction.on_commit(lambda index=index: index.update(instance), using=using)
+
+
+@receiver(post_delete, sender=Instructor)
+@receiver(post_delete, sender=Learner)
+def unindex_deleted_name(instance: User, using: str, **kwargs: object) -> None:  # noqa: ARG001
+    """Remove a deleted instructor or learner from its autocomplete snapshot once committed."""
+    index, pk = name_indexes[type(instance)], instance.pk
+    transaction.on_commit(lambda: index.discard(pk), using=using)
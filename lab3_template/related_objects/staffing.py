@@ -0,0 +1,290 @@
+"""Read cache for the ``Course.instructors`` relation, in both directions.
+
+``StaffingCache.instructor_ids_of(course_id)`` and ``StaffingCache.course_ids_of(instructor_id)``
+answer from the cache and only query the join table on a miss. Entries are stored either in a
+bounded in-process LRU or in one of Django's caches, chosen with the ``STAFFING_CACHE``
+setting::
+
+    STAFFING_CACHE = {"BACKEND": "lru", "MAXSIZE": 1024}
+    STAFFING_CACHE = {"BACKEND": "django", "ALIAS": "default", "TIMEOUT": None}
+
+Only the ids of the related rows are cached, so an entry goes stale when the links change, never
+when a course or instructor row does. Counters such as ``total_learners`` move with
+``QuerySet.update()`` and would never be seen by cached instances. Load the rows from the ids
+when more than the ids is needed.
+
+The receivers in ``signals.py`` drop exactly the entries a change makes stale: link changes
+through ``m2m_changed``, and the links of deleted courses and instructors through
+``post_delete``. Entries are dropped when the change is made and again when its transaction
+commits. Bulk inserts of links, which send no signals, call ``invalidate_links()``, and
+``reset_tables()`` drops every entry.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any, Protocol
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, router, transaction
+
+from .models import Course
+
+DEFAULT_MAXSIZE = 1024
+COURSE, INSTRUCTOR = "course", "instructor"
+
+# (kind, primary key), the kind says which side of the relation the key belongs to.
+Key = tuple[str, int]
+
+
+class Backend(Protocol):
+    """Storage for the cache entries."""
+
+    def get_many(self, keys: Iterable[Key]) -> dict[Key, Any]:
+        """Return the cached entries among ``keys``."""
+
+    def set(self, key: Key, value: object) -> None:
+        """Store an entry."""
+
+    def delete_many(self, keys: Iterable[Key]) -> None:
+        """Drop the given entries."""
+
+    def clear(self) -> None:
+        """Drop every entry."""
+
+
+class LRUBackend:
+    """Keep at most ``maxsize`` entries in process memory, evicting the least recently used."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        """Create an empty cache bounded to ``maxsize`` entries."""
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Key, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[Key]) -> dict[Key, Any]:
+        """Return the cached entries among ``keys`` and mark them as recently used."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+        return found
+
+    def set(self, key: Key, value: object) -> None:
+        """Store an entry, evicting the oldest one when the cache is full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys: Iterable[Key]) -> None:
+        """Drop the given entries, missing ones are ignored."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+
+class DjangoCacheBackend:
+    """Store the entries in a cache of Django's cache framework, shared between processes."""
+
+    def __init__(self, alias: str = "default", timeout: float | None = None) -> None:
+        """Use the cache named ``alias``, entries expire after ``timeout`` seconds or never."""
+        self.alias = alias
+        self.timeout = timeout
+
+    @staticmethod
+    def _name(key: Key) -> str:
+        return f"staffing:{key[0]}:{key[1]}"
+
+    def get_many(self, keys: Iterable[Key]) -> dict[Key, Any]:
+        """Return the cached entries among ``keys``."""
+        names = {self._name(key): key for key in keys}
+        return {names[name]: value for name, value in caches[self.alias].get_many(names).items()}
+
+    def set(self, key: Key, value: object) -> None:
+        """Store an entry."""
+        caches[self.alias].set(self._name(key), value, self.timeout)
+
+    def delete_many(self, keys: Iterable[Key]) -> None:
+        """Drop the given entries."""
+        caches[self.alias].delete_many([self._name(key) for key in keys])
+
+    def clear(self) -> None:
+        """Drop every entry of the whole Django cache, not only the staffing ones."""
+        caches[self.alias].clear()
+
+
+class StaffingCache:
+    """Cache the instructors of each course and the courses of each instructor."""
+
+    def __init__(self, backend: Backend) -> None:
+        """Serve the relation from ``backend`` with zeroed counters."""
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        # Per thread, the aliases whose open transaction changed links, see ``invalidate``.
+        self._local = threading.local()
+
+    def _changed_aliases(self) -> set[str]:
+        if not hasattr(self._local, "aliases"):
+            self._local.aliases = set()
+        return self._local.aliases
+
+    def _storable(self, using: str) -> bool:
+        """Return whether a lookup on ``using`` may be cached by this thread.
+
+        Not while this thread's transaction has uncommitted link changes, the transaction may
+        still roll back. Once it has ended, committed or not, the mark is dropped.
+
+        """
+        changed = self._changed_aliases()
+        if using not in changed:
+            return True
+        if connections[using].in_atomic_block:
+            return False
+        changed.discard(using)
+        return True
+
+    def _get(self, key: Key) -> tuple[int, ...]:
+        found = self.backend.get_many([key])
+        hit = key in found
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if hit:
+            return found[key]
+        kind, pk = key
+        through = Course.instructors.through
+        using = router.db_for_read(through)
+        links = through.objects.using(using)
+        if kind == COURSE:
+            value = tuple(
+                links.filter(course_id=pk)
+                .order_by("instructor_id")
+                .values_list("instructor_id", flat=True),
+            )
+        else:
+            value = tuple(
+                links.filter(instructor_id=pk)
+                .order_by("course_id")
+                .values_list("course_id", flat=True),
+            )
+        if self._storable(using):
+            self.backend.set(key, value)
+        return value
+
+    def instructor_ids_of(self, course_id: int) -> tuple[int, ...]:
+        """Return the ids of the instructors teaching a course, in ascending order."""
+        return self._get((COURSE, course_id))
+
+    def course_ids_of(self, instructor_id: int) -> tuple[int, ...]:
+        """Return the ids of the courses an instructor teaches, in ascending order."""
+        return self._get((INSTRUCTOR, instructor_id))
+
+    def invalidate(
+        self,
+        course_ids: Iterable[int] = (),
+        instructor_ids: Iterable[int] = (),
+        *,
+        using: str | None = None,
+    ) -> None:
+        """Drop the entries of the given courses and instructors, now and once committed.
+
+        When the links changed inside a transaction on ``using``, the entries are dropped again
+        on commit, since other threads may have cached the links being replaced in between.
+        Until the transaction ends, this thread caches none of its own lookups, which could see
+        links that are then rolled back.
+
+        """
+        keys = [(COURSE, pk) for pk in course_ids] + [(INSTRUCTOR, pk) for pk in instructor_ids]
+        if not keys:
+            return
+        self.backend.delete_many(keys)
+        with self._lock:
+            self.invalidations += len(keys)
+        if using is not None and connections[using].in_atomic_block:
+            self._changed_aliases().add(using)
+
+            def drop_committed() -> None:
+                self.backend.delete_many(keys)
+                self._changed_aliases().discard(using)
+
+            transaction.on_commit(drop_committed, using=using)
+
+    def invalidate_links(
+        self,
+        pairs: Iterable[tuple[int, int]],
+        *,
+        using: str | None = None,
+    ) -> None:
+        """Drop the entries of both sides of every ``(course_id, instructor_id)`` link."""
+        course_ids, instructor_ids = set(), set()
+        for course_id, instructor_id in pairs:
+            course_ids.add(course_id)
+            instructor_ids.add(instructor_id)
+        self.invalidate(course_ids, instructor_ids, using=using)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+        self._changed_aliases().clear()
+
+    def stats(self) -> dict[str, float]:
+        """Return the hit, miss and invalidation counters with the hit ratio.
+
+        Returns:
+            dict[str, float]: The counters of this process since the last ``clear``.
+
+        """
+        with self._lock:
+            hits, misses, invalidations = self.hits, self.misses, self.invalidations
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "invalidations": invalidations,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+
+def backend_from_settings() -> Backend:
+    """Build the backend described by the ``STAFFING_CACHE`` setting, an LRU by default.
+
+    Returns:
+        Backend: The configured backend.
+
+    Raises:
+        ImproperlyConfigured: When ``BACKEND`` is neither ``lru`` nor ``django``.
+
+    """
+    options = getattr(settings, "STAFFING_CACHE", {})
+    backend = options.get("BACKEND", "lru")
+    if backend == "lru":
+        return LRUBackend(options.get("MAXSIZE", DEFAULT_MAXSIZE))
+    if backend == "django":
+        return DjangoCacheBackend(options.get("ALIAS", "default"), options.get("TIMEOUT"))
+    msg = f"STAFFING_CACHE BACKEND must be 'lru' or 'django', not {backend!r}"
+    raise ImproperlyConfigured(msg)
+
+
+staffing_cache = StaffingCache(backend_from_settings())
@@ -0,0 +1,152 @@
+"""Incremental, idempotent sync of the related_objects tables with a source of objects.
+
+``sync(model, objs)`` matches the source objects to the stored rows by natural key. It inserts
+the new ones, updates the ones whose values differ and deletes the stored rows the source no
+longer has. Rows that did not change are not written at all, so running the same sync twice
+writes nothing the second time. Each model is synced in one transaction, so readers see the old
+rows or the new ones, never an empty table.
+
+Matching happens in Python against one read of the stored keys and values, which is what tells
+updated rows from unchanged ones. New rows are written with ``bulk_load`` and changed rows with
+``bulk_set``. Deletions go through Django's collector, so cascades and delete signals run as
+usual. Inserts, updates and changes to ``Course.instructors`` links skip the other signals, so
+rebuild the derived data afterwards. Only the staffing cache is told about changed links.
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from django.db import router, transaction
+from django.db.models import Field, Model, QuerySet
+
+from .bulk_update import bulk_set
+from .models import Course, Enrollment, Instructor, Learner, Lesson, User
+from .seeding import DEFAULT_BATCH_SIZE, bulk_load, chunked
+from .staffing import staffing_cache
+
+# The fields that identify a row across runs, in place of its generated primary key.
+NATURAL_KEYS: dict[type[Model], tuple[str, ...]] = {
+    User: ("first_name", "last_name", "dob"),
+    Instructor: ("first_name", "last_name", "dob"),
+    Learner: ("first_name", "last_name", "dob"),
+    Course: ("name",),
+    Course.instructors.through: ("course", "instructor"),
+    Lesson: ("title",),
+    Enrollment: ("learner", "course"),
+}
+# Fields maintained from other tables, they are never compared or updated.
+DERIVED_FIELDS: dict[type[Model], tuple[str, ...]] = {
+    Instructor: ("total_learners",),
+}
+
+
+@dataclass
+class SyncCounts:
+    """How many source objects were inserted, updated or left unchanged, and rows deleted."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+
+def _synced_fields(model: type[Model], key_fields: list[Field]) -> list[Field]:
+    """Return the fields a sync compares and updates, those outside the key and the links."""
+    excluded = DERIVED_FIELDS.get(model, ())
+    return [
+        field
+        for field in model._meta.concrete_fields  # noqa: SLF001
+        if field.editable
+        and not field.primary_key
+        and field not in key_fields
+        and field.name not in excluded
+    ]
+
+
+def _adopt(obj: Model, pk: object, using: str) -> None:
+    """Make a source object stand for the stored row ``pk``, parent links included."""
+    opts = obj._meta  # noqa: SLF001
+    for owner in [obj, *opts.get_parent_list()]:
+        setattr(obj, owner._meta.pk.attname, pk)  # noqa: SLF001
+    obj._state.adding = False  # noqa: SLF001
+    obj._state.db = using  # noqa: SLF001
+
+
+def sync(  # noqa: PLR0913
+    model: type[Model],
+    objs: Iterable[Model],
+    *,
+    key: Sequence[str] | None = None,
+    queryset: QuerySet | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    using: str | None = None,
+) -> SyncCounts:
+    """Make the ``model`` rows in ``queryset`` match ``objs``, matched by natural key.
+
+    ``key`` defaults to the model's entry in ``NATURAL_KEYS``, ``queryset`` to every row of the
+    model. Source objects get the primary keys of the rows they were matched to or inserted
+    as, so objects referencing them can be synced next. Stored rows sharing a key with an
+    earlier row are deleted as duplicates.
+
+    Returns:
+        SyncCounts: The number of objects inserted, updated and unchanged, and rows deleted.
+
+    Raises:
+        ValueError: When two source objects have the same natural key.
+
+    """
+    using = using or router.db_for_write(model)
+    opts = model._meta  # noqa: SLF001
+    key_fields = [opts.get_field(name) for name in key or NATURAL_KEYS[model]]
+    fields = _synced_fields(model, key_fields)
+    if queryset is None:
+        queryset = model._base_manager.all()  # noqa: SLF001
+    counts = SyncCounts()
+
+    with transaction.atomic(using=using):
+        stored: dict[tuple, tuple[object, tuple]] = {}
+        duplicates = []
+        columns = [field.attname for field in key_fields + fields]
+        rows = queryset.using(using).order_by("pk").values_list("pk", *columns)
+        for pk, *values in rows.iterator(chunk_size=batch_size):
+            natural_key = tuple(values[: len(key_fields)])
+            if natural_key in stored:
+                duplicates.append(pk)
+            else:
+                stored[natural_key] = (pk, tuple(values[len(key_fields) :]))
+
+        new, changed, seen = [], [], set()
+        for obj in objs:
+            # Copies the primary keys of related objects saved earlier in the sync.
+            obj._prepare_related_fields_for_save(operation_name="sync")  # noqa: SLF001
+            natural_key = tuple(f.to_python(getattr(obj, f.attname)) for f in key_fields)
+            if natural_key in seen:
+                msg = f"Two {opts.verbose_name_plural} share the natural key {natural_key}."
+                raise ValueError(msg)
+            seen.add(natural_key)
+            if natural_key not in stored:
+                new.append(obj)
+                continue
+            pk, current = stored[natural_key]
+            _adopt(obj, pk, using)
+            values = tuple(f.to_python(getattr(obj, f.attname)) for f in fields)
+            if values == current:
+                counts.unchanged += 1
+            else:
+                changed.append((pk, dict(zip((f.name for f in fields), values, strict=True))))
+
+        counts.inserted = bulk_load(model, new, batch_size=batch_size, using=using)
+        counts.updated = bulk_set(model, changed, chunk_size=batch_size, using=using)
+        missing = [pk for stored_key, (pk, _) in stored.items() if stored_key not in seen]
+        missing += duplicates
+        for chunk in chunked(missing, batch_size):
+            rows = model._base_manager.using(using).filter(pk__in=chunk)  # noqa: SLF001
+            if model is Course.instructors.through:
+                # Django sends no delete signals for the rows of an auto-created join table
+                staffing_cache.invalidate_links(
+                    rows.values_list("course_id", "instructor_id"),
+                    using=using,
+                )
+            rows.delete()
+        counts.deleted = len(missing)
+    return counts
@@ -0,0 +1,253 @@
+"""Deterministic synthetic datasets for the related_objects models.
+
+A ``SyntheticDataset`` is sized by its number of enrollments. Every row is derived from the seed
+and its own position, so any key range can be generated on its own and always yields the same
+rows. Course popularity follows a Zipf distribution: course 0 gets the most enrollments, course
+1 about half as many, and so on.
+
+The dataset always contains the fixtures the lab scripts look up. These are instructor `Yan`,
+learner `David Smith`, and the courses `Introduction to Python` and
+`Cloud Application Development with Database`.
+"""
+
+import math
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import cached_property
+from itertools import accumulate
+
+from .counters import reconcile_total_learners
+from .ingest import copy_load
+from .models import Course, Enrollment, Instructor, Learner, Lesson, User
+from .reset import reset_tables
+from .rollup import rebuild_enrollment_rollup
+from .search import rebuild_search_index
+from .seeding import DEFAULT_BATCH_SIZE, bulk_load, link_course_instructors, reset_sequences
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "William",
+    "Elizabeth", "Richard", "Barbara", "Joseph", "Susan", "Thomas", "Jessica", "Joy", "Peter",
+    "Harry", "Hermione", "Wei", "Priya", "Ahmed", "Sofia", "Kenji", "Amara",
+)  # fmt: skip
+LAST_NAMES = (
+    "Smith", "Lee", "Chen", "Li", "Doe", "Garcia", "Patel", "Kim", "Nguyen", "Brown",
+    "Wilson", "Khan", "Silva", "Muller", "Rossi", "Tanaka", "Potter", "Granger",
+)  # fmt: skip
+TOPICS = (
+    "Databases", "Django", "Kubernetes", "Machine Learning", "Data Engineering", "Security",
+    "Web APIs", "Containers", "Statistics", "Front End", "DevOps", "SQL",
+)  # fmt: skip
+FIXED_COURSES = (
+    ("Introduction to Python", "Learn core concepts of Python"),
+    ("Cloud Application Development with Database", "Develop and deploy application on cloud"),
+)
+OCCUPATION_WEIGHTS = (
+    (Learner.STUDENT, 5),
+    (Learner.DEVELOPER, 3),
+    (Learner.DATA_SCIENTIST, 2),
+    (Learner.DATABASE_ADMIN, 1),
+)
+ENROLLMENT_START = date(2019, 1, 1)
+ENROLLMENT_DAYS = 4 * 365
+# Rows are generated in blocks, each block has its own random stream.
+BLOCK_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class SyntheticDataset:
+    """Describe a reproducible related_objects dataset with ``enrollments`` enrollment rows."""
+
+    enrollments: int
+    seed: int = 0
+    zipf_exponent: float = 1.1
+    enrollments_per_learner: int = 4
+    lessons_per_course: int = 3
+
+    @property
+    def learners(self) -> int:
+        """Return the number of learners."""
+        return max(1, math.ceil(self.enrollments / self.enrollments_per_learner))
+
+    @property
+    def courses(self) -> int:
+        """Return the number of courses, which grows with the square root of the enrollments."""
+        return max(len(FIXED_COURSES) + 8, round(math.sqrt(self.enrollments)))
+
+    @property
+    def instructors(self) -> int:
+        """Return the number of instructors."""
+        return max(3, self.courses // 2)
+
+    def instructor_id(self, index: int) -> int:
+        """Return the primary key of the instructor at ``index``."""
+        return index + 1
+
+    def learner_id(self, index: int) -> int:
+        """Return the primary key of the learner at ``index``, placed after the instructors."""
+        return self.instructors + index + 1
+
+    def course_id(self, index: int) -> int:
+        """Return the primary key of the course at ``index``."""
+        return index + 1
+
+    @cached_property
+    def _course_cum_weights(self) -> list[float]:
+        weights = (1 / (rank + 1) ** self.zipf_exponent for rank in range(self.courses))
+        return list(accumulate(weights))
+
+    def _rows(self, kind: str, start: int, stop: int) -> Iterator[tuple[int, tuple]]:
+        """Yield ``(index, values)`` for every index in ``[start, stop)``.
+
+        The generator is re-seeded at every block boundary, so the values produced for an index
+        do not depend on where the range starts.
+
+        """
+        for block in range(start // BLOCK_SIZE, math.ceil(stop / BLOCK_SIZE)):
+            rng = random.Random(f"{self.seed}:{kind}:{block}")  # noqa: S311
+            first = block * BLOCK_SIZE
+            for index in range(first, min(first + BLOCK_SIZE, stop)):
+                values = self._draw(kind, rng)
+                if index >= start:
+                    yield index, values
+
+    def _draw(self, kind: str, rng: random.Random) -> tuple:
+        if kind == "learner":
+            return (
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                date(1950, 1, 1) + timedelta(days=rng.randrange(55 * 365)),
+                rng.choices(
+                    [occupation for occupation, _ in OCCUPATION_WEIGHTS],
+                    weights=[weight for _, weight in OCCUPATION_WEIGHTS],
+                )[0],
+            )
+        courses: set[int] = set()
+        wanted = min(self.enrollments_per_learner, self.courses)
+        while len(courses) < wanted:
+            courses.add(rng.choices(range(self.courses), cum_weights=self._course_cum_weights)[0])
+        return tuple(
+            (
+                course,
+                ENROLLMENT_START + timedelta(days=rng.randrange(ENROLLMENT_DAYS)),
+                rng.choice((Enrollment.AUDIT, Enrollment.HONOR)),
+            )
+            for course in sorted(courses)
+        )
+
+    def instructor_objects(self) -> Iterator[Instructor]:
+        """Yield every instructor, the first one is `Yan Luo`."""
+        rng = random.Random(f"{self.seed}:instructor")  # noqa: S311
+        for index in range(self.instructors):
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            if index == 0:
+                first_name, last_name = "Yan", "Luo"
+            yield Instructor(
+                pk=self.instructor_id(index),
+                first_name=first_name,
+                last_name=last_name,
+                dob=date(1950, 1, 1) + timedelta(days=rng.randrange(40 * 365)),
+                full_time=rng.random() < 0.7,  # noqa: PLR2004
+                total_learners=0,
+            )
+
+    def course_objects(self) -> Iterator[Course]:
+        """Yield every course, the most popular ones first."""
+        for index in range(self.courses):
+            if index < len(FIXED_COURSES):
+                name, description = FIXED_COURSES[index]
+            else:
+                topic = TOPICS[index % len(TOPICS)]
+                name = f"{topic} {index}"
+                description = f"Hands-on {topic.lower()} course number {index}"
+            yield Course(pk=self.course_id(index), name=name, description=description)
+
+    def course_instructor_pairs(self) -> Iterator[tuple[int, int]]:
+        """Yield ``(course_id, instructor_id)`` pairs, one or two instructors per course."""
+        for index in range(self.courses):
+            first = index % self.instructors
+            second = (index * 7 + 1) % self.instructors
+            yield self.course_id(index), self.instructor_id(first)
+            if second != first and index % 2:
+                yield self.course_id(index), self.instructor_id(second)
+
+    def lesson_objects(self) -> Iterator[Lesson]:
+        """Yield ``lessons_per_course`` lessons for every course."""
+        for index in range(self.courses):
+            for number in range(1, self.lessons_per_course + 1):
+                yield Lesson(
+                    title=f"Lesson {number}",
+                    course_id=self.course_id(index),
+                    content=f"Lesson {number} of course {index}: {TOPICS[number % len(TOPICS)]}",
+                )
+
+    def learner_objects(self, start: int = 0, stop: int | None = None) -> Iterator[Learner]:
+        """Yield the learners with index in ``[start, stop)``, the first one is `David Smith`."""
+        stop = self.learners if stop is None else min(stop, self.learners)
+        for index, values in self._rows("learner", start, stop):
+            first_name, last_name, dob, occupation = values
+            if index == 0:
+                first_name, last_name, occupation = "David", "Smith", Learner.DEVELOPER
+            yield Learner(
+                pk=self.learner_id(index),
+                first_name=first_name,
+                last_name=last_name,
+                dob=dob,
+                occupation=occupation,
+                social_link=f"https://www.linkedin.com/learner-{index}/",
+            )
+
+    def enrollment_objects(self, start: int = 0, stop: int | None = None) -> Iterator[Enrollment]:
+        """Yield the enrollments of the learners with index in ``[start, stop)``.
+
+        Every learner is enrolled in ``enrollments_per_learner`` distinct courses.
+
+        """
+        stop = self.learners if stop is None else min(stop, self.learners)
+        for index, courses in self._rows("enrollment", start, stop):
+            for course, date_enrolled, mode in courses:
+                yield Enrollment(
+                    learner_id=self.learner_id(index),
+                    course_id=self.course_id(course),
+                    date_enrolled=date_enrolled,
+                    mode=mode,
+                )
+
+
+def load(
+    dataset: SyntheticDataset,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_copy: bool = False,
+) -> None:
+    """Replace the contents of the related_objects tables with ``dataset``.
+
+    With ``use_copy`` the rows are streamed with ``COPY`` on PostgreSQL, see ``ingest``.
+
+    """
+    reset_tables()
+    if use_copy:
+        through = Course.instructors.through
+        links = (
+            through(course_id=course_id, instructor_id=instructor_id)
+            for course_id, instructor_id in dataset.course_instructor_pairs()
+        )
+        copy_load(Instructor, dataset.instructor_objects())
+        copy_load(Course, dataset.course_objects())
+        copy_load(through, links)
+        copy_load(Lesson, dataset.lesson_objects())
+        copy_load(Learner, dataset.learner_objects())
+        copy_load(Enrollment, dataset.enrollment_objects())
+    else:
+        bulk_load(Instructor, dataset.instructor_objects(), batch_size=batch_size)
+        bulk_load(Course, dataset.course_objects(), batch_size=batch_size)
+        link_course_instructors(dataset.course_instructor_pairs(), batch_size=batch_size)
+        bulk_load(Lesson, dataset.lesson_objects(), batch_size=batch_size)
+        bulk_load(Learner, dataset.learner_objects(), batch_size=batch_size)
+        bulk_load(Enrollment, dataset.enrollment_objects(), batch_size=batch_size)
+    # Users and courses were loaded with explicit ids.
+    reset_sequences(User, Course)
+    reconcile_total_learners()
+    rebuild_enrollment_rollup(batch_size=batch_size)
+    rebuild_search_index()
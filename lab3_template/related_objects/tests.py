@@ -0,0 +1,982 @@
+"""Tests for the related_objects app."""
+
+# ruff: noqa: PT009, PT027
+
+import csv
+import io
+import json
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+import querylog
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from related_objects.autocomplete import complete, name_indexes
+from related_objects.bulk_update import add_total_learners, bulk_set, set_mode, set_occupation
+from related_objects.counters import reconcile_total_learners
+from related_objects.export import export
+from related_objects.ingest import copy_load
+from related_objects.models import (
+    Course,
+    Enrollment,
+    EnrollmentMonthlyRollup,
+    Instructor,
+    Learner,
+    Lesson,
+    User,
+)
+from related_objects.pagination import BY_DOB, BY_NAME, YOUNGEST_FIRST, InvalidCursorError
+from related_objects.parallel import key_ranges, load_parallel
+from related_objects.people import InstructorPerson, LearnerPerson, Person, copy_people
+from related_objects.reports import enrollment_report, gather_queries
+from related_objects.reset import reset_tables
+from related_objects.resolver import NaturalKeyResolver, UnresolvedKeysError
+from related_objects.rollup import rebuild_enrollment_rollup
+from related_objects.search import rebuild_search_index, search
+from related_objects.seeding import bulk_load, link_course_instructors
+from related_objects.staffing import DjangoCacheBackend, LRUBackend, staffing_cache
+from related_objects.sync import SyncCounts, sync
+from related_objects.synthetic import SyntheticDataset, load
+
+
+def _execute(sql: str, params: object, many: bool, context: dict) -> None:  # noqa: FBT001
+    """Stand in for the database, for logs called directly."""
+
+
+class QueryLogTests(TestCase):
+    """The query log records every statement under its script and phase."""
+
+    def test_fingerprints_group_similar_statements(self) -> None:
+        """Replace literals, placeholders and IN lists."""
+        self.assertEqual(
+            querylog.fingerprint("SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s, %s) LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?",
+        )
+
+    def test_report_groups_by_script_and_phase(self) -> None:
+        """Aggregate per script, phase and fingerprint, and flag repeated SELECTs."""
+        log = querylog.QueryLog("write.py")
+        with connection.execute_wrapper(log):
+            Course.objects.count()
+            with querylog.phase("lookups"):
+                for name in ("a", "b", "c"):
+                    Course.objects.filter(name=name).first()
+            with querylog.task("update.py"), querylog.phase("renames"):
+                Course.objects.update(name="renamed")
+        report = log.report()
+        self.assertEqual(report["queries"], 5)
+        self.assertEqual(
+            {
+                script: {phase: stats["queries"] for phase, stats in data["phases"].items()}
+                for script, data in report["scripts"].items()
+            },
+            {"write.py": {"main": 1, "lookups": 3}, "update.py": {"renames": 1}},
+        )
+        lookups = report["scripts"]["write.py"]["phases"]["lookups"]["fingerprints"]
+        self.assertEqual([stats["count"] for stats in lookups.values()], [3])
+        self.assertEqual([item["count"] for item in report["repeated"]], [3])
+        self.assertIn("update.py: 1 queries", log.summary())
+
+    def test_threads_keep_their_own_phases(self) -> None:
+        """Label the statements of concurrent threads with their own task and phase."""
+        log = querylog.QueryLog("main.py")
+        inside = threading.Barrier(2)
+
+        def run(name: str) -> None:
+            with querylog.task(f"{name}.py"), querylog.phase(name):
+                inside.wait()
+                log(_execute, f"SELECT '{name}'", None, False, {})  # noqa: FBT003
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ("left", "right")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log(_execute, "SELECT 1", None, False, {})  # noqa: FBT003
+        self.assertEqual(
+            sorted((record.script, record.phase, record.sql) for record in log.records),
+            [
+                ("left.py", "left", "SELECT 'left'"),
+                ("main.py", "main", "SELECT 1"),
+                ("right.py", "right", "SELECT 'right'"),
+            ],
+        )
+
+
+class OccupationTraversalTests(TestCase):
+    """Occupation lookups over courses must not issue a query per course."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create instructor `Yan`, who every course in these tests is taught by."""
+        cls.instructor_yan = Instructor.objects.create(
+            first_name="Yan",
+            last_name="Luo",
+            total_learners=0,
+        )
+
+    def add_courses(self, count: int) -> None:
+        """Add ``count`` courses taught by Yan, each with one learner per occupation."""
+        for number in range(count):
+            course = Course.objects.create(name=f"Course {number}", description="")
+            course.instructors.add(self.instructor_yan)
+            for occupation, _ in Learner.OCCUPATION_CHOICES:
+                learner = Learner.objects.create(
+                    first_name=f"{occupation} {number}",
+                    occupation=occupation,
+                    social_link="https://www.example.com/",
+                )
+                Enrollment.objects.create(learner=learner, course=course)
+
+    def test_learner_occupations_is_a_single_query(self) -> None:
+        """Answer the occupation set with one query, whatever the number of courses."""
+        expected = sorted(code for code, _ in Learner.OCCUPATION_CHOICES)
+        for count in (1, 10):
+            with self.subTest(courses=count):
+                self.add_courses(count)
+                with self.assertNumQueries(1):
+                    occupations = list(Course.objects.taught_by("Yan").learner_occupations())
+                self.assertEqual(occupations, expected)
+
+    def test_with_learners_query_count_is_constant(self) -> None:
+        """Load courses and learners in two queries, whatever the number of courses."""
+        expected = {code for code, _ in Learner.OCCUPATION_CHOICES}
+        for count in (1, 10):
+            with self.subTest(courses=count):
+                self.add_courses(count)
+                with self.assertNumQueries(2):
+                    occupations = {
+                        learner.occupation
+                        for course in Course.objects.taught_by("Yan").with_learners()
+                        for learner in course.learners.all()
+                    }
+                self.assertEqual(occupations, expected)
+
+
+class DisplayQueryTests(TestCase):
+    """Printing enrollments and lessons loaded ``for_display`` issues no extra queries."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create two courses, each with a lesson and two enrolled learners."""
+        for number in range(2):
+            course = Course.objects.create(name=f"Course {number}", description="")
+            Lesson.objects.create(title=f"Lesson {number}", course=course, content="")
+            for name in ("James", "Mary"):
+                learner = Learner.objects.create(
+                    first_name=name,
+                    social_link="https://www.example.com/",
+                )
+                Enrollment.objects.create(learner=learner, course=course)
+        Lesson.objects.create(title="Unassigned", content="")
+
+    def test_enrollments_print_in_one_query(self) -> None:
+        """Print every enrollment with the query that loads them."""
+        expected = [str(enrollment) for enrollment in Enrollment.objects.all()]
+        with self.assertNumQueries(1):
+            printed = [str(enrollment) for enrollment in Enrollment.objects.for_display()]
+        self.assertEqual(sorted(printed), sorted(expected))
+
+    def test_lessons_print_in_one_query(self) -> None:
+        """Print every lesson, with or without a course, with the query that loads them."""
+        expected = [str(lesson) for lesson in Lesson.objects.all()]
+        with self.assertNumQueries(1):
+            printed = [str(lesson) for lesson in Lesson.objects.for_display()]
+        self.assertEqual(sorted(printed), sorted(expected))
+
+
+class SubclassQueryTests(TestCase):
+    """Users load as instructors and learners in a single query."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create a plain user, an instructor and two learners."""
+        User.objects.create(first_name="John")
+        Instructor.objects.create(first_name="Yan", total_learners=0)
+        for name in ("James", "Mary"):
+            Learner.objects.create(first_name=name, social_link="https://www.example.com/")
+
+    def test_rows_are_downcast_in_one_query(self) -> None:
+        """Return each user as its subclass, with the parent and child fields loaded."""
+        expected = [
+            str(User.objects.get(first_name="John")),
+            str(Instructor.objects.get()),
+            *(str(learner) for learner in Learner.objects.order_by("pk")),
+        ]
+        with self.assertNumQueries(1):
+            users = list(User.objects.select_subclasses().order_by("pk"))
+            printed = [str(user) for user in users]
+        self.assertEqual([type(user) for user in users], [User, Instructor, Learner, Learner])
+        self.assertEqual(printed, expected)
+
+    def test_chunked_iteration(self) -> None:
+        """Stream the downcast users in chunks."""
+        users = User.objects.select_subclasses().order_by("pk")
+        with self.assertNumQueries(1):
+            names = [(type(user), user.first_name) for user in users.iterator(chunk_size=2)]
+        self.assertEqual(
+            names,
+            [(User, "John"), (Instructor, "Yan"), (Learner, "James"), (Learner, "Mary")],
+        )
+
+
+class SingleTablePersonTests(TestCase):
+    """The single-table layout holds the same people as the multi-table one."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create a plain user, an instructor and a learner."""
+        User.objects.create(first_name="John")
+        Instructor.objects.create(first_name="Yan", total_learners=3)
+        Learner.objects.create(
+            first_name="James",
+            occupation=Learner.DEVELOPER,
+            social_link="https://www.example.com/",
+        )
+
+    def test_copy_keeps_ids_and_kinds(self) -> None:
+        """Copy every user with its id, and load the rows as the proxies of their kinds."""
+        self.assertEqual(copy_people(), 3)
+        with self.assertNumQueries(1):
+            people = {person.pk: str(person) for person in Person.objects.all()}
+        expected = {user.pk: str(user) for user in User.objects.select_subclasses()}
+        self.assertEqual(people, expected)
+        self.assertEqual(
+            [type(person) for person in Person.objects.order_by("pk")],
+            [Person, InstructorPerson, LearnerPerson],
+        )
+
+    def test_proxies_filter_and_set_their_kind(self) -> None:
+        """Read and create the people of one kind through the proxy managers."""
+        copy_people()
+        learner = LearnerPerson.objects.create(first_name="Mary", occupation=Learner.STUDENT)
+        self.assertEqual(learner.kind, Person.LEARNER)
+        self.assertGreater(learner.pk, User.objects.order_by("pk").last().pk)
+        self.assertEqual(
+            list(LearnerPerson.objects.order_by("pk").values_list("first_name", flat=True)),
+            ["James", "Mary"],
+        )
+        self.assertEqual(InstructorPerson.objects.get().total_learners, 3)
+
+
+class TotalLearnersCounterTests(TestCase):
+    """``Instructor.total_learners`` follows enrollments and course staffing."""
+
+    def setUp(self) -> None:
+        """Create a course taught by Yan with two enrollments, and a second instructor."""
+        self.yan = Instructor.objects.create(first_name="Yan", total_learners=0)
+        self.joy = Instructor.objects.create(first_name="Joy", total_learners=0)
+        self.course = Course.objects.create(name="Cloud", description="")
+        self.course.instructors.add(self.yan)
+        self.learners = [
+            Learner.objects.create(first_name=name, social_link="https://www.example.com/")
+            for name in ("James", "Mary")
+        ]
+        for learner in self.learners:
+            Enrollment.objects.create(learner=learner, course=self.course)
+
+    def assertTotals(self, yan: int, joy: int) -> None:  # noqa: N802
+        """Assert the counters stored in the database."""
+        totals = dict(Instructor.objects.values_list("first_name", "total_learners"))
+        self.assertEqual(totals, {"Yan": yan, "Joy": joy})
+
+    def test_enrollments_are_counted(self) -> None:
+        """Count created enrollments and uncount deleted ones."""
+        self.assertTotals(yan=2, joy=0)
+        Enrollment.objects.filter(learner=self.learners[0]).delete()
+        self.assertTotals(yan=1, joy=0)
+
+    def test_staffing_changes_move_counts(self) -> None:
+        """Move the course's enrollments with every add, remove and clear."""
+        self.course.instructors.add(self.joy)
+        self.assertTotals(yan=2, joy=2)
+        self.yan.course_set.remove(self.course)
+        self.assertTotals(yan=0, joy=2)
+        self.course.instructors.clear()
+        self.assertTotals(yan=0, joy=0)
+        self.yan.course_set.add(self.course)
+        self.assertTotals(yan=2, joy=0)
+
+    def test_removing_unlinked_instructor_keeps_counts(self) -> None:
+        """Leave the counter of an instructor that never taught the course alone."""
+        Instructor.objects.filter(pk=self.joy.pk).update(total_learners=5)
+        self.course.instructors.remove(self.joy)
+        self.assertTotals(yan=2, joy=5)
+        self.course.instructors.remove(self.yan, self.joy)
+        self.assertTotals(yan=0, joy=5)
+
+    def test_moving_and_deleting_enrollments(self) -> None:
+        """Follow an enrollment to a new course and drop the counts of a deleted course."""
+        other = Course.objects.create(name="Python", description="")
+        other.instructors.add(self.joy)
+        enrollment = Enrollment.objects.filter(learner=self.learners[0]).get()
+        enrollment.course = other
+        enrollment.save()
+        self.assertTotals(yan=1, joy=1)
+        self.course.delete()
+        self.assertTotals(yan=0, joy=1)
+
+    def test_reconcile_repairs_drift(self) -> None:
+        """Recompute every counter from the enrollment rows."""
+        Instructor.objects.update(total_learners=1000)
+        self.assertEqual(reconcile_total_learners(), 2)
+        self.assertTotals(yan=2, joy=0)
+
+
+class EnrollmentRollupTests(TestCase):
+    """The monthly rollup follows enrollment and learner changes."""
+
+    def setUp(self) -> None:
+        """Create a course with a developer enrolled on the first and last day of August."""
+        self.course = Course.objects.create(name="Cloud", description="")
+        self.developer = Learner.objects.create(
+            first_name="David",
+            occupation=Learner.DEVELOPER,
+            social_link="https://www.example.com/",
+        )
+        for day in (date(2020, 7, 31), date(2020, 8, 1), date(2020, 8, 31), date(2020, 9, 1)):
+            Enrollment.objects.create(
+                learner=self.developer,
+                course=self.course,
+                date_enrolled=day,
+            )
+
+    def counts(self) -> dict[tuple[date, str], int]:
+        """Return the non-empty rollup counts by month and occupation."""
+        rows = EnrollmentMonthlyRollup.objects.filter(enrollments__gt=0)
+        return {(row.month, row.occupation): row.enrollments for row in rows}
+
+    def test_in_month_keeps_the_month_boundaries(self) -> None:
+        """Match the first and last day of the month and nothing around it."""
+        days = Enrollment.objects.in_month(2020, 8).values_list("date_enrolled", flat=True)
+        self.assertEqual(sorted(days), [date(2020, 8, 1), date(2020, 8, 31)])
+        self.assertEqual(Enrollment.objects.in_month(2020, 12).count(), 0)
+
+    def test_rollup_follows_changes(self) -> None:
+        """Move counts when enrollments or occupations change, and drop deleted enrollments."""
+        courses = EnrollmentMonthlyRollup.objects.course_names(2020, 8, Learner.DEVELOPER)
+        self.assertEqual(list(courses), ["Cloud"])
+        self.assertEqual(self.counts()[date(2020, 8, 1), Learner.DEVELOPER], 2)
+
+        enrollment = Enrollment.objects.get(date_enrolled=date(2020, 8, 31))
+        enrollment.date_enrolled = date(2020, 9, 2)
+        enrollment.save()
+        Enrollment.objects.filter(date_enrolled=date(2020, 7, 31)).delete()
+        self.assertEqual(
+            self.counts(),
+            {(date(2020, 8, 1), Learner.DEVELOPER): 1, (date(2020, 9, 1), Learner.DEVELOPER): 2},
+        )
+
+        self.developer.occupation = Learner.STUDENT
+        self.developer.save()
+        self.assertEqual(
+            self.counts(),
+            {(date(2020, 8, 1), Learner.STUDENT): 1, (date(2020, 9, 1), Learner.STUDENT): 2},
+        )
+
+    def test_rebuild_repairs_drift(self) -> None:
+        """Recompute the rollup from the enrollment rows."""
+        expected = self.counts()
+        EnrollmentMonthlyRollup.objects.update(enrollments=1000)
+        self.assertEqual(rebuild_enrollment_rollup(), 3)
+        self.assertEqual(self.counts(), expected)
+
+
+class ExportTests(TestCase):
+    """Exports stream flat rows joined with the learner and course fields."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create one enrollment of learner `David` in course `Cloud`."""
+        course = Course.objects.create(name="Cloud", description="")
+        learner = Learner.objects.create(
+            first_name="David",
+            occupation=Learner.DEVELOPER,
+            social_link="https://www.example.com/",
+        )
+        Enrollment.objects.create(learner=learner, course=course, date_enrolled=date(2020, 8, 1))
+
+    def test_enrollments_ndjson(self) -> None:
+        """Write one JSON object per enrollment with one query."""
+        stream = io.StringIO()
+        with self.assertNumQueries(1):
+            self.assertEqual(export("enrollments", stream), 1)
+        row = json.loads(stream.getvalue())
+        self.assertEqual(row["date_enrolled"], "2020-08-01")
+        self.assertEqual(row["learner_first_name"], "David")
+        self.assertEqual(row["course_name"], "Cloud")
+
+    def test_learners_csv(self) -> None:
+        """Write a header line followed by the learner rows."""
+        stream = io.StringIO()
+        self.assertEqual(export("learners", stream, fmt="csv"), 1)
+        header, row = csv.reader(io.StringIO(stream.getvalue()))
+        self.assertEqual(dict(zip(header, row, strict=True))["occupation"], Learner.DEVELOPER)
+
+
+class StaffingCacheTests(TestCase):
+    """The staffing cache answers repeated lookups and drops exactly the stale entries."""
+
+    def setUp(self) -> None:
+        """Create a course taught by Yan and an instructor without courses, with a cold cache."""
+        self.yan = Instructor.objects.create(first_name="Yan")
+        self.joy = Instructor.objects.create(first_name="Joy")
+        self.course = Course.objects.create(name="Cloud", description="")
+        self.course.instructors.add(self.yan)
+        staffing_cache.clear()
+        self.addCleanup(staffing_cache.clear)
+
+    def warm(self) -> None:
+        """Cache both directions for both instructors and the course."""
+        staffing_cache.instructor_ids_of(self.course.pk)
+        staffing_cache.course_ids_of(self.yan.pk)
+        staffing_cache.course_ids_of(self.joy.pk)
+
+    def test_repeated_lookups_are_hits(self) -> None:
+        """Query the join table once per key and count hits and misses."""
+        self.warm()
+        with self.assertNumQueries(0):
+            self.assertEqual(staffing_cache.instructor_ids_of(self.course.pk), (self.yan.pk,))
+            self.assertEqual(staffing_cache.course_ids_of(self.yan.pk), (self.course.pk,))
+        self.assertEqual(staffing_cache.stats()["hits"], 2)
+        self.assertEqual(staffing_cache.stats()["misses"], 3)
+
+    def test_staffing_changes_invalidate_both_sides(self) -> None:
+        """See every add, remove and clear from either side of the relation."""
+        self.warm()
+        self.course.instructors.add(self.joy)
+        self.assertEqual(staffing_cache.course_ids_of(self.joy.pk), (self.course.pk,))
+        self.yan.course_set.remove(self.course)
+        self.assertEqual(staffing_cache.instructor_ids_of(self.course.pk), (self.joy.pk,))
+        self.assertEqual(staffing_cache.course_ids_of(self.yan.pk), ())
+        self.course.instructors.clear()
+        self.assertEqual(staffing_cache.course_ids_of(self.joy.pk), ())
+
+    def test_rolled_back_links_are_not_cached(self) -> None:
+        """Cache no lookup made after a link change that is then rolled back."""
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.course.instructors.add(self.joy)
+            self.assertEqual(staffing_cache.course_ids_of(self.joy.pk), (self.course.pk,))
+            raise RuntimeError
+        self.assertEqual(staffing_cache.course_ids_of(self.joy.pk), ())
+
+    def test_commits_invalidate_again(self) -> None:
+        """Drop the entries other threads cached before the link change was committed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.instructors.add(self.joy)
+            # Another thread reading before the commit still sees Joy without courses
+            staffing_cache.backend.set(("instructor", self.joy.pk), ())
+        self.assertEqual(staffing_cache.course_ids_of(self.joy.pk), (self.course.pk,))
+
+    def test_deletes_and_bulk_links_invalidate(self) -> None:
+        """Forget deleted instructors and see links loaded in bulk."""
+        self.warm()
+        self.yan.delete()
+        self.assertEqual(staffing_cache.instructor_ids_of(self.course.pk), ())
+        link_course_instructors([(self.course.pk, self.joy.pk)])
+        self.assertEqual(staffing_cache.instructor_ids_of(self.course.pk), (self.joy.pk,))
+        self.assertEqual(staffing_cache.course_ids_of(self.joy.pk), (self.course.pk,))
+
+    def test_counters_are_read_fresh(self) -> None:
+        """Report the current total_learners of an instructor found through the cache."""
+        self.warm()
+        learner = Learner.objects.create(first_name="James", social_link="https://example.com/")
+        Enrollment.objects.create(learner=learner, course=self.course)
+        (instructor_id,) = staffing_cache.instructor_ids_of(self.course.pk)
+        self.assertEqual(Instructor.objects.get(pk=instructor_id).total_learners, 1)
+
+    def test_backends(self) -> None:
+        """Evict the least recently used LRU entry and round trip through Django's cache."""
+        lru = LRUBackend(maxsize=2)
+        lru.set(("course", 1), ())
+        lru.set(("course", 2), ())
+        lru.get_many([("course", 1)])
+        lru.set(("course", 3), ())
+        cached = lru.get_many([("course", 1), ("course", 2), ("course", 3)])
+        self.assertEqual(set(cached), {("course", 1), ("course", 3)})
+        backend = DjangoCacheBackend()
+        backend.set(("course", 1), (self.yan.pk,))
+        self.assertEqual(backend.get_many([("course", 1)]), {("course", 1): (self.yan.pk,)})
+        backend.delete_many([("course", 1)])
+        self.assertEqual(backend.get_many([("course", 1)]), {})
+
+
+class AsyncReportTests(TransactionTestCase):
+    """The async report answers like the read script, with queries on their own threads."""
+
+    def setUp(self) -> None:
+        """Create the rows ``read_enrollments.py`` looks up."""
+        yan = Instructor.objects.create(first_name="Yan", total_learners=0)
+        course = Course.objects.create(name="Introduction to Python", description="")
+        course.instructors.add(yan)
+        david = Learner.objects.create(
+            first_name="David",
+            occupation=Learner.DEVELOPER,
+            social_link="https://www.example.com/",
+        )
+        Enrollment.objects.create(learner=david, course=course, date_enrolled=date(2020, 8, 3))
+
+    async def test_enrollment_report(self) -> None:
+        """Answer every report line."""
+        report = await enrollment_report()
+        self.assertEqual(report["learner_david"].first_name, "David")
+        self.assertEqual(
+            [learner.first_name for learner in report["introduction_to_python_learners"]],
+            ["David"],
+        )
+        self.assertEqual(report["occupations_taught_by_yan"], {Learner.DEVELOPER})
+        self.assertEqual(report["developer_courses"], {"Introduction to Python"})
+
+
+class GatherQueriesTests(SimpleTestCase):
+    """Independent queries overlap, up to the concurrency bound."""
+
+    async def test_queries_overlap(self) -> None:
+        """Take about as long as one query when all four may run at once."""
+        queries = {number: lambda: sync_to_async(time.sleep)(0.1) for number in range(4)}
+        for concurrency, low, high in ((4, 0.1, 0.3), (2, 0.2, 0.35), (1, 0.4, 1)):
+            with self.subTest(concurrency=concurrency):
+                start = time.perf_counter()
+                await gather_queries(queries, concurrency=concurrency)
+                self.assertTrue(low <= time.perf_counter() - start < high)
+
+
+def loaded_rows(using: str = "default") -> tuple:
+    """Return the learners, enrollments and derived counters, to compare two loads."""
+    return (
+        list(Learner.objects.using(using).order_by("pk").values_list("pk", "first_name", "dob")),
+        list(
+            Enrollment.objects.using(using)
+            .order_by("learner", "course")
+            .values_list("learner", "course", "date_enrolled"),
+        ),
+        list(
+            Instructor.objects.using(using)
+            .order_by("pk")
+            .values_list("total_learners", flat=True),
+        ),
+        EnrollmentMonthlyRollup.objects.using(using).count(),
+    )
+
+
+class BulkLoadTests(TestCase):
+    """Bulk loading multi-table inherited learners."""
+
+    def test_batches_respect_the_query_parameter_limit(self) -> None:
+        """Split the child rows into statements that stay under ``max_query_params``."""
+        learners = [
+            Learner(first_name=f"Learner {number}", social_link="https://example.com/")
+            for number in range(30)
+        ]
+        table = connection.ops.quote_name(Learner._meta.db_table)  # noqa: SLF001
+        with (
+            mock.patch.object(connection.features, "max_query_params", 20),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            self.assertEqual(bulk_load(Learner, learners), 30)
+        # Three learner columns, so six rows per statement
+        inserts = [query for query in queries if query["sql"].startswith(f"INSERT INTO {table}")]
+        self.assertEqual(len(inserts), 5)
+        self.assertEqual(Learner.objects.count(), 30)
+        self.assertEqual(
+            set(Learner.objects.values_list("first_name", flat=True)),
+            {learner.first_name for learner in learners},
+        )
+
+
+class ParallelLoaderTests(TestCase):
+    """Loading by key range yields the same tables as the serial loader."""
+
+    def test_key_ranges_cover_every_index_once(self) -> None:
+        """Split into contiguous ranges that differ in size by one at most."""
+        self.assertEqual(key_ranges(10, 3), [(0, 4), (4, 7), (7, 10)])
+        self.assertEqual(key_ranges(2, 8), [(0, 1), (1, 2)])
+
+    def test_ranges_load_the_same_rows(self) -> None:
+        """Load the learners, enrollments and derived counters of the serial loader."""
+        dataset = SyntheticDataset(enrollments=500)
+
+        load(dataset)
+        expected = loaded_rows()
+        self.assertEqual(load_parallel(dataset, workers=3), 500)
+        self.assertEqual(loaded_rows(), expected)
+
+    def test_worker_processes_load_a_file_database(self) -> None:
+        """Spawn workers that load a file-backed database, which they open by its settings."""
+        dataset = SyntheticDataset(enrollments=500)
+        load(dataset)
+        expected = loaded_rows()
+        with tempfile.TemporaryDirectory() as directory:
+            connections.settings["parallel"] = {
+                **connection.settings_dict,
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": str(Path(directory) / "parallel.sqlite3"),
+            }
+            try:
+                call_command("migrate", database="parallel", verbosity=0)
+                self.assertEqual(load_parallel(dataset, workers=2, using="parallel"), 500)
+                self.assertEqual(loaded_rows("parallel"), expected)
+            finally:
+                connections["parallel"].close()
+                del connections["parallel"]
+                del connections.settings["parallel"]
+
+
+class CopyLoadTests(TestCase):
+    """The COPY loader, through its executemany fallback on SQLite."""
+
+    def test_copy_loads_the_same_rows(self) -> None:
+        """Load the rows of the bulk_create loader and continue the id sequences after them."""
+        dataset = SyntheticDataset(enrollments=500)
+        load(dataset)
+        expected = loaded_rows()
+        load(dataset, use_copy=True)
+        self.assertEqual(loaded_rows(), expected)
+        learner = Learner.objects.create(first_name="New", social_link="https://example.com/")
+        self.assertEqual(learner.pk, dataset.learner_id(dataset.learners))
+
+    def test_inherited_models_need_keys(self) -> None:
+        """Refuse learners without a primary key, COPY cannot return generated ones."""
+        with self.assertRaises(ValueError):
+            copy_load(Learner, [Learner(first_name="David", social_link="https://example.com/")])
+
+    def test_mixed_keys_keep_the_explicit_ones(self) -> None:
+        """Copy the courses with and without a primary key of one chunk apart."""
+        keyed, unkeyed = Course(pk=40, name="Keyed"), Course(name="Unkeyed")
+        copy_load(Course, [keyed, unkeyed])
+        self.assertEqual(Course.objects.get(name="Keyed").pk, 40)
+        self.assertNotEqual(Course.objects.get(name="Unkeyed").pk, 40)
+        self.assertEqual((keyed._state.adding, unkeyed._state.adding), (False, True))  # noqa: SLF001
+
+    def test_copied_links_invalidate_the_staffing_cache(self) -> None:
+        """Drop the cached staffing entries of both sides of every copied link."""
+        yan = Instructor.objects.create(first_name="Yan")
+        course = Course.objects.create(name="Cloud", description="")
+        staffing_cache.clear()
+        self.addCleanup(staffing_cache.clear)
+        self.assertEqual(staffing_cache.instructor_ids_of(course.pk), ())
+        self.assertEqual(staffing_cache.course_ids_of(yan.pk), ())
+        through = Course.instructors.through
+        copy_load(through, [through(course_id=course.pk, instructor_id=yan.pk)])
+        self.assertEqual(staffing_cache.instructor_ids_of(course.pk), (yan.pk,))
+        self.assertEqual(staffing_cache.course_ids_of(yan.pk), (course.pk,))
+
+
+class KeysetPaginationTests(TestCase):
+    """Keyset pages cover every row once, in order, with one query per page."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create learners sharing birth dates and names, so the id breaks the ties."""
+        for number in range(7):
+            Learner.objects.create(
+                first_name=f"Learner {number % 2}",
+                last_name=f"Smith {number % 3}",
+                dob=date(2000, 1, 1 + number % 3),
+                social_link="https://www.example.com/",
+            )
+        Learner.objects.create(first_name="No dob", social_link="https://www.example.com/")
+
+    def walk(self, **kwargs: object) -> list[int]:
+        """Follow the cursors from the first to the last page and return the ids seen."""
+        seen: list[int] = []
+        cursor = None
+        while True:
+            with self.assertNumQueries(1):
+                page = Learner.objects.keyset_page(cursor, page_size=3, **kwargs)
+            seen += [learner.id for learner in page.items]
+            if not page.has_next:
+                return seen
+            cursor = page.next_cursor
+
+    def test_pages_follow_the_ordering(self) -> None:
+        """Match the OFFSET order, ascending and descending, leaving out NULL birth dates."""
+        for ordering in (BY_DOB, YOUNGEST_FIRST, BY_NAME):
+            with self.subTest(ordering=ordering):
+                learners = Learner.objects.order_by(*ordering)
+                if "dob" in ordering[0]:
+                    learners = learners.filter(dob__isnull=False)
+                expected = list(learners.values_list("id", flat=True))
+                self.assertEqual(self.walk(ordering=ordering), expected)
+
+    def test_invalid_cursors(self) -> None:
+        """Reject malformed tokens and tokens of another ordering."""
+        cursor = Learner.objects.keyset_page(page_size=1).next_cursor
+        for bad in ("not a cursor", cursor[:-2]):
+            with self.subTest(cursor=bad), self.assertRaises(InvalidCursorError):
+                Learner.objects.keyset_page(bad)
+        with self.assertRaises(InvalidCursorError):
+            Learner.objects.keyset_page(cursor, ordering=BY_NAME)
+
+
+class FullTextSearchTests(TestCase):
+    """Search ranks courses and lessons and follows saves, deletes and bulk loads."""
+
+    def setUp(self) -> None:
+        """Create courses and lessons that mention databases in their title or body."""
+        self.sql = Course.objects.create(name="Databases", description="Relational design")
+        self.cloud = Course.objects.create(name="Cloud", description="Deploying a database")
+        self.lesson = Lesson.objects.create(
+            title="Lesson 1",
+            course=self.cloud,
+            content="Connecting Django to the database server",
+        )
+
+    def titles(self, text: str) -> list[str]:
+        """Return the course names and lesson titles matching ``text``, best first."""
+        return [str(getattr(hit.item, "name", None) or hit.item.title) for hit in search(text)]
+
+    def test_matches_are_stemmed_and_ranked(self) -> None:
+        """Find every form of a word and rank title matches first."""
+        self.assertEqual(self.titles("databases")[0], "Databases")
+        self.assertCountEqual(self.titles("database"), ["Databases", "Cloud", "Lesson 1"])
+        self.assertEqual(self.titles("database django"), ["Lesson 1"])
+        self.assertEqual(search('database "OR'), [])
+        self.assertEqual(search("  "), [])
+
+    def test_index_follows_saves_and_deletes(self) -> None:
+        """Reindex renamed courses and forget deleted lessons."""
+        self.sql.name = "Data modelling"
+        self.sql.save()
+        self.assertEqual(self.titles("modelling"), ["Data modelling"])
+        self.lesson.delete()
+        self.assertEqual(self.titles("django"), [])
+
+    def test_rebuild_indexes_bulk_loads(self) -> None:
+        """Find bulk created lessons once the index is rebuilt."""
+        Lesson.objects.bulk_create([Lesson(title="Lesson 2", content="Kubernetes operators")])
+        self.assertEqual(self.titles("kubernetes"), [])
+        self.assertEqual(rebuild_search_index(), 4)
+        self.assertEqual(self.titles("kubernetes"), ["Lesson 2"])
+
+
+class NameAutocompleteTests(TestCase):
+    """Autocomplete finds names by prefix and follows committed changes."""
+
+    def setUp(self) -> None:
+        """Create instructors Yan Luo, Yang Li and Joy Doe and learner José Álvarez."""
+        self.yan, self.yang, self.joy = (
+            Instructor.objects.create(first_name=first, last_name=last, total_learners=0)
+            for first, last in (("Yan", "Luo"), ("Yang", "Li"), ("Joy", "Doe"))
+        )
+        self.jose = Learner.objects.create(
+            first_name="José",
+            last_name="Álvarez",
+            social_link="https://www.example.com/",
+        )
+        self.addCleanup(lambda: [index.clear() for index in name_indexes.values()])
+
+    def test_prefixes_ignore_case_and_accents(self) -> None:
+        """Match normalized "first last" prefixes, in name order, up to the limit."""
+        self.assertEqual(complete("y", Instructor), [self.yan.pk, self.yang.pk])
+        self.assertEqual(complete("YAN ", Instructor), [self.yan.pk])
+        self.assertEqual(complete("y", Instructor, limit=1), [self.yan.pk])
+        self.assertEqual(complete("jose alv", Learner), [self.jose.pk])
+        self.assertEqual(complete("jo", Instructor), [self.joy.pk])
+
+    def test_snapshot_follows_committed_changes(self) -> None:
+        """Reindex renamed users, also through their parent row, and drop deleted ones."""
+        self.assertEqual(complete("y", Instructor), [self.yan.pk, self.yang.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.yan.first_name = "Ian"
+            self.yan.save()
+            user = User.objects.get(pk=self.joy.pk)
+            user.first_name = "Yara"
+            user.save()
+            self.yang.delete()
+        self.assertEqual(complete("y", Instructor), [self.joy.pk])
+        self.assertEqual(complete("ian", Instructor), [self.yan.pk])
+
+    def test_reset_drops_the_snapshots(self) -> None:
+        """Forget the names of the rows a reset deleted, whose ids will be reused."""
+        self.assertEqual(complete("y", Instructor), [self.yan.pk, self.yang.pk])
+        reset_tables()
+        self.assertEqual(complete("y", Instructor), [])
+
+    @override_settings(NAME_AUTOCOMPLETE={"BACKEND": "database"})
+    def test_database_backend(self) -> None:
+        """Match the first name, then the last name after a space."""
+        self.assertEqual(complete("Ya", Instructor), [self.yan.pk, self.yang.pk])
+        self.assertEqual(complete("Yang L", Instructor), [self.yang.pk])
+
+
+class BulkUpdateTests(TestCase):
+    """Bulk updates write per-row values across the user and learner tables in chunks."""
+
+    def setUp(self) -> None:
+        """Create a course taught by Yan with three student enrollments."""
+        self.yan = Instructor.objects.create(first_name="Yan", total_learners=0)
+        self.course = Course.objects.create(name="Cloud", description="")
+        self.course.instructors.add(self.yan)
+        self.learners = [
+            Learner.objects.create(first_name=name, social_link="https://www.example.com/")
+            for name in ("James", "Mary", "Robert")
+        ]
+        for learner in self.learners:
+            Enrollment.objects.create(learner=learner, course=self.course)
+
+    def test_set_splits_fields_across_tables(self) -> None:
+        """Update parent and child columns with one statement per table and chunk."""
+        rows = [
+            (
+                learner.pk,
+                {"first_name": f"{learner.first_name}!", "occupation": Learner.DATABASE_ADMIN},
+            )
+            for learner in self.learners
+        ]
+        done = []
+        # Two chunks, each a savepoint, an UPDATE per table and the release.
+        with self.assertNumQueries(2 * 4):
+            updated = bulk_set(Learner, rows, chunk_size=2, progress=done.append)
+        self.assertEqual((updated, done), (3, [2, 3]))
+        self.assertEqual(
+            set(Learner.objects.values_list("first_name", "occupation")),
+            {("James!", "dba"), ("Mary!", "dba"), ("Robert!", "dba")},
+        )
+        with self.assertRaises(ValueError):
+            bulk_set(Learner, [(self.learners[0].pk, {"id": 1})])
+
+    def test_workflows_keep_derived_data(self) -> None:
+        """Rebuild the rollup after occupation and mode changes and add summed deltas."""
+        set_occupation(Learner.objects.filter(first_name="Mary"), Learner.DEVELOPER)
+        set_mode(Enrollment.objects.filter(learner__first_name="James"), Enrollment.HONOR)
+        rollup = EnrollmentMonthlyRollup.objects.values_list("mode", "occupation", "enrollments")
+        self.assertEqual(
+            set(rollup),
+            {("audit", "student", 1), ("audit", "developer", 1), ("honor", "student", 1)},
+        )
+        add_total_learners({self.yan.pk: 5})
+        self.assertEqual(add_total_learners({self.yan.pk: -2, 0: 0}), 1)
+        self.yan.refresh_from_db()
+        self.assertEqual(self.yan.total_learners, 3 + 5 - 2)
+
+    def test_workflows_page_the_rows_they_update(self) -> None:
+        """Update every matching row once, even when the update takes rows out of the filter."""
+        students = Learner.objects.filter(occupation=Learner.STUDENT)
+        self.assertEqual(set_occupation(students, Learner.DEVELOPER, chunk_size=2), 3)
+        self.assertFalse(students.exists())
+
+
+class SyncTests(TestCase):
+    """Sync upserts by natural key, leaves unchanged rows alone and deletes missing ones."""
+
+    def source(self, occupation: str = Learner.STUDENT) -> tuple[list, list, list]:
+        """Return fresh source courses, learners and enrollments of every learner in Cloud."""
+        courses = [Course(name=name, description=name) for name in ("Cloud", "Python")]
+        learners = [
+            Learner(
+                first_name=name,
+                last_name="Smith",
+                dob=date(1990, 1, 1),
+                occupation=occupation,
+                social_link="https://www.example.com/",
+            )
+            for name in ("James", "Mary")
+        ]
+        enrollments = [
+            Enrollment(learner=learner, course=courses[0], date_enrolled=date(2020, 8, 1))
+            for learner in learners
+        ]
+        return courses, learners, enrollments
+
+    def sync_all(self, courses: list, learners: list, enrollments: list) -> list[SyncCounts]:
+        """Sync the parents before the enrollments that reference them."""
+        return [
+            sync(Course, courses),
+            sync(Learner, learners),
+            sync(Enrollment, enrollments),
+        ]
+
+    def test_second_run_writes_nothing(self) -> None:
+        """Insert everything once, then find every row unchanged."""
+        self.assertEqual(
+            self.sync_all(*self.source()),
+            [SyncCounts(inserted=2), SyncCounts(inserted=2), SyncCounts(inserted=2)],
+        )
+        with self.assertNumQueries(3 * 3):
+            counts = self.sync_all(*self.source())
+        self.assertEqual(counts, [SyncCounts(unchanged=2)] * 3)
+
+    def test_changes_and_deletions(self) -> None:
+        """Update changed child columns and delete rows gone from the source."""
+        self.sync_all(*self.source())
+        courses, learners, enrollments = self.source(occupation=Learner.DEVELOPER)
+        courses[1].description = "Snakes"
+        counts = self.sync_all(courses, learners[:1], enrollments[:1])
+        self.assertEqual(
+            counts,
+            [
+                SyncCounts(updated=1, unchanged=1),
+                SyncCounts(updated=1, deleted=1),
+                SyncCounts(unchanged=1),
+            ],
+        )
+        self.assertEqual(
+            list(Learner.objects.values_list("first_name", "occupation")),
+            [("James", Learner.DEVELOPER)],
+        )
+        self.assertEqual(Course.objects.get(name="Python").description, "Snakes")
+
+    def test_duplicate_source_keys(self) -> None:
+        """Refuse a source with two objects of the same natural key."""
+        with self.assertRaises(ValueError):
+            sync(Course, [Course(name="Cloud"), Course(name="Cloud")])
+
+
+class NaturalKeyResolverTests(TestCase):
+    """Natural keys are resolved with one query per model and cached for the resolver's life."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create two courses, and two learners of which two share a first name."""
+        Course.objects.bulk_create(
+            [Course(name=name, description=name) for name in ("Cloud", "Python")],
+        )
+        for first_name, last_name in (("James", "Smith"), ("Mary", "Smith"), ("Mary", "Lee")):
+            Learner.objects.create(
+                first_name=first_name,
+                last_name=last_name,
+                dob=date(1990, 1, 1),
+                occupation=Learner.STUDENT,
+                social_link="https://www.example.com/",
+            )
+
+    def test_build_resolves_each_model_once(self) -> None:
+        """Build enrollments with a query per model, then reuse the cached keys."""
+        resolver = NaturalKeyResolver({Learner: ("first_name",)})
+        rows = [
+            {"learner": "James", "course": course, "date_enrolled": date(2020, 8, 1)}
+            for course in ("Cloud", "Python")
+        ]
+        with self.assertNumQueries(2):
+            enrollments = resolver.build(Enrollment, rows, learner=Learner, course=Course)
+        Enrollment.objects.bulk_create(enrollments)
+        self.assertEqual(
+            set(Enrollment.objects.values_list("learner__first_name", "course__name")),
+            {("James", "Cloud"), ("James", "Python")},
+        )
+        cloud = Course.objects.get(name="Cloud")
+        with self.assertNumQueries(0):
+            self.assertEqual(resolver.pk(Course, "Cloud"), cloud.pk)
+
+    def test_unresolved_keys_are_reported_together(self) -> None:
+        """List the missing and ambiguous keys of every model in one error."""
+        resolver = NaturalKeyResolver({Learner: ("first_name",)})
+        with self.assertRaises(UnresolvedKeysError) as raised:
+            resolver.resolve({Learner: ["James", "Mary", "Ann"], Course: ["Cloud", "Go"]})
+        self.assertEqual(
+            raised.exception.missing,
+            {"related_objects.Learner": [("Ann",)], "related_objects.Course": [("Go",)]},
+        )
+        self.assertEqual(raised.exception.ambiguous, {"related_objects.Learner": [("Mary",)]})
+        # The keys that did resolve were cached all the same
+        with self.assertNumQueries(0):
+            resolver.resolve({Learner: ["James"], Course: ["Cloud"]})
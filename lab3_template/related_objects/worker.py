@@ -0,0 +1,35 @@
+"""Entry points of the parallel loader's worker processes.
+
+Workers are spawned, so they import this module to find the initializer before Django is set
+up. It must not import any model at the top, the models are imported once ``setup`` has run.
+"""
+
+import django
+from django.conf import settings
+from django.db import connections
+
+
+def setup(using: str, settings_dict: dict) -> None:
+    """Set Django up in a worker process and give ``using`` the coordinator's settings.
+
+    The worker reads the settings module again, so database settings changed at runtime, such
+    as the test runner's database name, have to be passed on.
+
+    """
+    django.setup()
+    settings.DATABASES[using] = connections.settings[using] = settings_dict
+
+
+def load_range(*args: object, **kwargs: object) -> int:
+    """Run ``parallel.load_range`` in a worker process and close its connections afterwards.
+
+    Returns:
+        int: The number of enrollments inserted.
+
+    """
+    from .parallel import load_range  # noqa: PLC0415
+
+    try:
+        return load_range(*args, **kwargs)
+    finally:
+        connections.close_all()
@@ -2,9 +2,13 @@
 
 import os
 
-from dotenv import load_dotenv
+import bootstrap
+import querylog
 
-load_dotenv()
+# Imports python-dotenv only when there is a .env file to read
+bootstrap.load_env()
+# Set QUERYLOG=1 to record and report every SQL statement the script issues
+querylog.enable_from_env()
 
 DATABASES = {
     "default": {
@@ -14,9 +18,24 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_PORT"),
+        # Persistent connections, checked before reuse
+        "CONN_MAX_AGE": int(os.getenv("CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     },
 }
 
+# Set DB_POOL=1 to share connections between threads through the pooled backend in dbpool,
+# the pool takes over connection reuse from CONN_MAX_AGE
+if os.getenv("DB_POOL"):
+    DATABASES["default"] |= {
+        "ENGINE": "dbpool.postgresql",
+        "CONN_MAX_AGE": 0,
+        "POOL": {
+            "MIN_SIZE": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+            "MAX_SIZE": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        },
+    }
+
 INSTALLED_APPS = ("related_objects",)
 
 SECRET_KEY = os.environ["SECRET_KEY"]
@@ -1,10 +1,38 @@
 # Django specific settings
-import inspect
-import os
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-from django.db import connection
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
-application = get_wsgi_application()
+# ruff: noqa: E402, F403, F405, T201
+
+import bootstrap
+
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
+
+
+import querylog
+from related_objects.bulk_update import set_mode, set_occupation
+from related_objects.counters import reconcile_total_learners
+from related_objects.models import *
+
+
+def report(done: int) -> None:
+    print(f"   ... {done} rows updated")
+
 
 # Your code starts from here:
+# Every change below is a chunked, set-based UPDATE instead of a save() per object, and a
+# querylog phase, so QUERYLOG=1 reports its queries on their own
+with querylog.phase("students_to_developers"):
+    print("1. Change the students enrolled in `Introduction to Python` to developers")
+    students = Learner.objects.filter(
+        occupation=Learner.STUDENT,
+        course__name="Introduction to Python",
+    ).distinct()
+    print(set_occupation(students, Learner.DEVELOPER, progress=report))
+
+with querylog.phase("audits_to_honor"):
+    print("2. Move the Aug, 2020 audit enrollments to honor mode")
+    audits = Enrollment.objects.in_month(2020, 8).filter(mode=Enrollment.AUDIT)
+    print(set_mode(audits, Enrollment.HONOR, progress=report))
+
+with querylog.phase("total_learners"):
+    print("3. Bring every instructor's learner count in line with their enrollments")
+    print(reconcile_total_learners())
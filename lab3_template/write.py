@@ -2,53 +2,74 @@
 
 # ruff: noqa: E402, F403, F405, T201
 
-import os
+import sys
 from datetime import date
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
+import bootstrap
 
-application = get_wsgi_application()
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
 
 
+import querylog
+from django.db.models import Model
+from related_objects.counters import reconcile_total_learners
 from related_objects.models import *
+from related_objects.reset import reset_tables
+from related_objects.resolver import NaturalKeyResolver
+from related_objects.rollup import rebuild_enrollment_rollup
+from related_objects.search import rebuild_search_index
+from related_objects.seeding import bulk_load
+from related_objects.sync import sync
+
+# With --sync, rows are upserted by natural key instead of wiping and reloading every table
+SYNC = "--sync" in sys.argv[1:]
+
+
+def save_all(model: type[Model], objs: list, **sync_options: object) -> None:
+    if SYNC:
+        print(f"{model._meta.label}: {sync(model, objs, **sync_options)}")  # noqa: SLF001
+    else:
+        bulk_load(model, objs)
+
+
+CLOUD_APP = "Cloud Application Development with Database"
+PYTHON = "Introduction to Python"
+# Relationships name people by first name and courses by name, resolved with one query per
+# model and cached for the whole load
+resolver = NaturalKeyResolver({Instructor: ("first_name",), Learner: ("first_name",)})
 
 
 # Your code starts from here:
 def populate_instructors() -> None:
     # Add instructors
     user_john = User(first_name="John", last_name="Doe", dob=date(1962, 7, 16))
-    user_john.save()
-    instructor_john = Instructor(full_time=True, total_learners=30050)
+    # Only the users that are neither instructors nor learners are synced here
+    save_all(User, [user_john], queryset=User.objects.filter(instructor=None, learner=None))
+    # total_learners starts at 0, it is counted from the enrollments at the end
+    instructor_john = Instructor(full_time=True)
     instructor_john.user = user_john  # pyright: ignore[reportAttributeAccessIssue]
-    instructor_john.save()
 
     instructor_yan = Instructor(
         first_name="Yan",
         last_name="Luo",
         dob=date(1962, 7, 16),
         full_time=True,
-        total_learners=30050,
     )
-    instructor_yan.save()
 
     instructor_joy = Instructor(
         first_name="Joy",
         last_name="Li",
         dob=date(1992, 1, 2),
         full_time=False,
-        total_learners=10040,
     )
-    instructor_joy.save()
     instructor_peter = Instructor(
         first_name="Peter",
         last_name="Chen",
         dob=date(1982, 5, 2),
         full_time=True,
-        total_learners=2002,
     )
-    instructor_peter.save()
+    save_all(Instructor, [instructor_john, instructor_yan, instructor_joy, instructor_peter])
     print("Instructors objects saved... ")
 
 
@@ -61,7 +82,6 @@ def populate_learners() -> None:
         occupation="data_scientist",
         social_link="https://www.linkedin.com/james/",
     )
-    learner_james.save()
 
     learner_mary = Learner(
         first_name="Mary",
@@ -70,7 +90,6 @@ def populate_learners() -> None:
         occupation="dba",
         social_link="https://www.facebook.com/mary/",
     )
-    learner_mary.save()
     learner_robert = Learner(
         first_name="Robert",
         last_name="Lee",
@@ -78,7 +97,6 @@ def populate_learners() -> None:
         occupation="student",
         social_link="https://www.facebook.com/robert/",
     )
-    learner_robert.save()
     learner_david = Learner(
         first_name="David",
         last_name="Smith",
@@ -86,7 +104,6 @@ def populate_learners() -> None:
         occupation="developer",
         social_link="https://www.linkedin.com/david/",
     )
-    learner_david.save()
 
     learner_john = Learner(
         first_name="John",
@@ -95,21 +112,27 @@ def populate_learners() -> None:
         occupation="developer",
         social_link="https://www.linkedin.com/john/",
     )
-    learner_john.save()
+    save_all(
+        Learner,
+        [learner_james, learner_mary, learner_robert, learner_david, learner_john],
+    )
     print("Learners objects saved... ")
 
 
 def populate_lessons() -> None:
     # Add lessons
     lesson1 = Lesson(title="Lesson 1", content="Object-relational mapping project")
-    lesson1.save()
     lesson2 = Lesson(title="Lesson 2", content="Django full stack project")
-    lesson2.save()
+    save_all(Lesson, [lesson1, lesson2])
     print("Lessons objects saved... ")
 
 
-def clean_data() -> None:
+def clean_data(*, fast: bool = True) -> None:
     # Delete all data to start from fresh
+    if fast:
+        # Set-based TRUNCATE/DELETE, skips loading every row into the deletion collector
+        reset_tables()
+        return
     Enrollment.objects.all().delete()
     User.objects.all().delete()
     Learner.objects.all().delete()
@@ -121,94 +144,97 @@ def clean_data() -> None:
 def populate_courses() -> None:
     # Add Courses
     course_cloud_app = Course(
-        name="Cloud Application Development with Database",
+        name=CLOUD_APP,
         description="Develop and deploy application on cloud",
     )
-    course_cloud_app.save()
     course_python = Course(
-        name="Introduction to Python",
+        name=PYTHON,
         description="Learn core concepts of Python and obtain hands-on "
         "experience via a capstone project",
     )
-    course_python.save()
+    save_all(Course, [course_cloud_app, course_python])
     print("Course objects saved... ")
 
 
 def populate_course_instructor_relationships() -> None:
-    # Get related instructors
-    instructor_yan = Instructor.objects.get(first_name="Yan")
-    instructor_joy = Instructor.objects.get(first_name="Joy")
-    instructor_peter = Instructor.objects.get(first_name="Peter")
-
-    # Get related courses
-    course_cloud_app = Course.objects.get(name__contains="Cloud")
-    course_python = Course.objects.get(name__contains="Python")
-
-    # Add instructors to courses
-    course_cloud_app.instructors.add(instructor_yan)
-    course_cloud_app.instructors.add(instructor_joy)
-    course_python.instructors.add(instructor_peter)
+    # Add instructors to courses, every referenced course and instructor is looked up at once
+    through = Course.instructors.through
+    links = resolver.build(
+        through,
+        [
+            {"course": CLOUD_APP, "instructor": "Yan"},
+            {"course": CLOUD_APP, "instructor": "Joy"},
+            {"course": PYTHON, "instructor": "Peter"},
+        ],
+        course=Course,
+        instructor=Instructor,
+    )
+    save_all(through, links)
 
     print("Course-instructor relationships saved... ")
 
 
 def populate_course_enrollment_relationships() -> None:
-    # Get related courses
-    course_cloud_app = Course.objects.get(name__contains="Cloud")
-    course_python = Course.objects.get(name__contains="Python")
-
-    # Get related learners
-    learner_james = Learner.objects.get(first_name="James")
-    learner_mary = Learner.objects.get(first_name="Mary")
-    learner_david = Learner.objects.get(first_name="David")
-    learner_john = Learner.objects.get(first_name="John")
-    learner_robert = Learner.objects.get(first_name="Robert")
-
-    # Add enrollments
-    james_cloud = Enrollment.objects.create(
-        learner=learner_james,
-        date_enrolled=date(2020, 8, 1),
-        course=course_cloud_app,
-        mode="audit",
-    )
-    james_cloud.save()
-    mary_cloud = Enrollment.objects.create(
-        learner=learner_mary,
-        date_enrolled=date(2020, 8, 2),
-        course=course_cloud_app,
-        mode="honor",
-    )
-    mary_cloud.save()
-    david_cloud = Enrollment.objects.create(
-        learner=learner_david,
-        date_enrolled=date(2020, 8, 5),
-        course=course_cloud_app,
-        mode="honor",
-    )
-    david_cloud.save()
-    david_cloud = Enrollment.objects.create(
-        learner=learner_john,
-        date_enrolled=date(2020, 8, 5),
-        course=course_cloud_app,
-        mode="audit",
-    )
-    david_cloud.save()
-    robert_python = Enrollment.objects.create(
-        learner=learner_robert,
-        date_enrolled=date(2020, 9, 2),
-        course=course_python,
-        mode="honor",
+    # Add enrollments, the courses are already cached by the resolver
+    enrollments = resolver.build(
+        Enrollment,
+        [
+            {
+                "learner": "James",
+                "date_enrolled": date(2020, 8, 1),
+                "course": CLOUD_APP,
+                "mode": "audit",
+            },
+            {
+                "learner": "Mary",
+                "date_enrolled": date(2020, 8, 2),
+                "course": CLOUD_APP,
+                "mode": "honor",
+            },
+            {
+                "learner": "David",
+                "date_enrolled": date(2020, 8, 5),
+                "course": CLOUD_APP,
+                "mode": "honor",
+            },
+            {
+                "learner": "John",
+                "date_enrolled": date(2020, 8, 5),
+                "course": CLOUD_APP,
+                "mode": "audit",
+            },
+            {
+                "learner": "Robert",
+                "date_enrolled": date(2020, 9, 2),
+                "course": PYTHON,
+                "mode": "honor",
+            },
+        ],
+        learner=Learner,
+        course=Course,
     )
-    robert_python.save()
+    save_all(Enrollment, enrollments)
     print("Course-learner relationships saved... ")
 
 
-clean_data()
-populate_courses()
-populate_instructors()
-populate_learners()
-populate_lessons()
+# Every step is a querylog phase, so QUERYLOG=1 reports its queries on their own
+if not SYNC:
+    with querylog.phase("clean_data"):
+        clean_data()
+with querylog.phase("populate"):
+    populate_courses()
+    populate_instructors()
+    populate_learners()
+    populate_lessons()
 
 # Populate relationships
-populate_course_instructor_relationships()
-populate_course_enrollment_relationships()
+with querylog.phase("relationships"):
+    populate_course_instructor_relationships()
+    populate_course_enrollment_relationships()
+
+# Bulk loads and syncs skip the signals that maintain total_learners, the enrollment rollup
+# and the search index, recompute them with set-based queries
+with querylog.phase("derived_data"):
+    reconcile_total_learners()
+    rebuild_enrollment_rollup()
+    rebuild_search_index()
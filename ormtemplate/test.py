@@ -2,14 +2,12 @@
 
 # ruff: noqa: S101, T201
 import inspect
-import os
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
-# Ensure settings are read
-from django.core.wsgi import get_wsgi_application
+import bootstrap
 from django.db import connection
 
-application = get_wsgi_application()
+# Ensure settings are read and the apps loaded, without building a WSGI handler
+bootstrap.setup()
 # Your application specific imports
 from standalone.models import Test  # noqa: E402
 